@@ -71,7 +71,7 @@ def create_tables_directly():
         
         # Import SQLAlchemy models
         from shared.database.database import engine, Base
-        from shared.database.models import TrainedModel, PredictionLog, TrainingData
+        from shared.database.models import TrainedModel, PredictionLog, TrainingData, TrainingDataChunk, ModelVersionCounter, PredictionRollup, LatencySketchRecord
         
         # Drop all existing tables first (clean slate)
         logger.info("🗑️  Dropping existing tables...")
@@ -99,7 +99,7 @@ def verify_tables():
         inspector = inspect(engine)
         actual_tables = inspector.get_table_names()
         
-        expected_tables = ['trained_models', 'prediction_logs', 'training_data']
+        expected_tables = ['trained_models', 'prediction_logs', 'training_data', 'training_data_chunks', 'model_version_counters', 'prediction_rollups', 'latency_sketches']
         
         logger.info(f"🔍 Tables found in database: {actual_tables}")
         
@@ -1,100 +1,748 @@
 """
-Inference Service - Responsible for real-time predictions (simplified without Prometheus)
+Inference Service - Responsible for real-time predictions
 """
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import time
 from shared.models.anomaly import (
     AnomalyPredictRequest,
     AnomalyPredictResponse,
+    AnomalyBatchPredictRequest,
+    AnomalyBatchPredictResponse,
+    AnomalyBulkPredictRequest,
+    AnomalyBulkPredictResult,
+    AnomalyBulkPredictResponse,
     AnomalyDetectionModel
 )
-from shared.database.database import get_db
+from shared.database.database import get_db, get_db_session, get_async_db, close_async_database
+from shared.database.write_behind import WriteBehindBuffer
+from shared.database.rollups import upsert_prediction_rollups, count_predictions_since
+from shared.database.latency_sketches import LATENCY_SKETCH_PERSIST_ENABLED, persist_latency_sketches_periodically
+from shared.metrics import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, RequestMetricsMiddleware, WindowedLatencySketch
+from shared.cache import LRUCache, AsyncRedisCache, SingleFlight, BloomFilter, create_async_redis
 from shared.database.models import TrainedModel, PredictionLog
+import asyncio
+import logging
+import numpy as np
 import redis
 import json
 import os
 import time
+from collections import defaultdict
+from typing import Dict, Hashable, List, Optional
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-# FastAPI app
-app = FastAPI(title="Inference Service")
+logger = logging.getLogger(__name__)
+
+# Model parameters cache TTL (seconds)
+MODEL_CACHE_TTL_SECONDS = 3600
+
+# In-process model cache (first tier, in front of Redis)
+MODEL_LRU_MAX_SIZE = int(os.getenv("MODEL_LRU_MAX_SIZE", 10000))
+MODEL_LRU_TTL_SECONDS = float(os.getenv("MODEL_LRU_TTL_SECONDS", 60))
+MODEL_INVALIDATION_POLL_SECONDS = float(os.getenv("MODEL_INVALIDATION_POLL_SECONDS", 5))
+
+local_model_cache = LRUCache(max_size=MODEL_LRU_MAX_SIZE, ttl_seconds=MODEL_LRU_TTL_SECONDS)
+
+# Coalesces concurrent cache misses per model key so only one request loads and fills the cache
+model_loads = SingleFlight()
+
+# Negative cache for series/versions without a model, so unknown series skip Postgres
+NEGATIVE_CACHE_TTL_SECONDS = int(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", 30))
+missing_model_cache = LRUCache(max_size=MODEL_LRU_MAX_SIZE, ttl_seconds=NEGATIVE_CACHE_TTL_SECONDS)
+
+# Bloom filter of every trained series_id - series it has never seen are rejected
+# without touching Redis or Postgres. Only consulted once fully loaded.
+known_series = BloomFilter(
+    capacity=int(os.getenv("KNOWN_SERIES_BLOOM_CAPACITY", 1_000_000)),
+    error_rate=float(os.getenv("KNOWN_SERIES_BLOOM_ERROR_RATE", 0.01))
+)
+known_series_ready = False
+KNOWN_SERIES_PAGE_SIZE = 10000
+
+# Startup warm-up of the model cache tiers with every active model
+MODEL_WARMUP_ENABLED = os.getenv("MODEL_WARMUP_ENABLED", "true").lower() == "true"
+MODEL_WARMUP_PAGE_SIZE = int(os.getenv("MODEL_WARMUP_PAGE_SIZE", 1000))
+MODEL_WARMUP_TIME_BUDGET_SECONDS = float(os.getenv("MODEL_WARMUP_TIME_BUDGET_SECONDS", 30))
+
+warmup_status = {
+    "state": "pending",  # pending -> running -> completed | budget_exceeded | failed
+    "models_loaded": 0,
+    "duration_ms": None
+}
+service_ready = False
+
+# Serializes cache warm-up pages with watermark invalidation, so a page read
+# before a retrain can't overwrite the invalidation that follows it
+model_refresh_lock = asyncio.Lock()
+
+# Write-behind buffer for prediction logs (flushed on size or time, bounded for backpressure);
+# each flush also updates the per-minute/per-hour prediction rollups in the same transaction
+prediction_log_buffer = WriteBehindBuffer(
+    PredictionLog,
+    max_batch_size=int(os.getenv("PREDICTION_LOG_BATCH_SIZE", 500)),
+    flush_interval_seconds=float(os.getenv("PREDICTION_LOG_FLUSH_INTERVAL_SECONDS", 0.5)),
+    max_pending=int(os.getenv("PREDICTION_LOG_MAX_PENDING", 20000)),
+    on_flush=upsert_prediction_rollups,
+    max_retries=int(os.getenv("PREDICTION_LOG_FLUSH_MAX_RETRIES", 3)),
+    retry_backoff_seconds=float(os.getenv("PREDICTION_LOG_FLUSH_RETRY_BACKOFF_SECONDS", 0.5))
+)
+
+# Per-minute latency sketches of the last hour (percentiles without reading prediction logs),
+# periodically persisted so monitoring can merge them across instances
+latency_sketches = {
+    "inference_latency_ms": WindowedLatencySketch(bucket_seconds=60, retention_buckets=60),
+    "total_latency_ms": WindowedLatencySketch(bucket_seconds=60, retention_buckets=60)
+}
+
+def record_latencies(inference_latency_ms: float, total_latency_ms: float, count: int = 1) -> None:
+    """Add `count` predictions with the given per-prediction latencies to the sketches"""
+    latency_sketches["inference_latency_ms"].add(inference_latency_ms, count)
+    latency_sketches["total_latency_ms"].add(total_latency_ms, count)
 
-# Redis Configuration
-redis_client = redis.Redis(
-    host=os.getenv("REDIS_HOST", "localhost"),
-    port=int(os.getenv("REDIS_PORT", 6379)),
-    db=int(os.getenv("REDIS_DB", 0))
+# Prometheus metrics (GET /metrics), collected in-process per request stage
+INFERENCE_STAGE_DURATION = Histogram(
+    "inference_stage_duration_seconds",
+    "Time spent in each stage of prediction requests",
+    ("stage",)
+)
+stage_durations = {
+    stage: INFERENCE_STAGE_DURATION.labels(stage)
+    for stage in ("cache_lookup", "db_fetch", "inference", "log_write")
+}
+CACHE_LOOKUPS = Counter(
+    "model_cache_lookups_total",
+    "Cache lookups by tier (local, negative, redis, prediction) and result",
+    ("tier", "result")
+)
+CACHE_HIT_RATIO = Gauge(
+    "model_cache_hit_ratio",
+    "Fraction of lookups served by each cache tier",
+    ("tier",)
+)
+PREDICTION_LOG_PENDING = Gauge(
+    "prediction_log_buffer_pending",
+    "Prediction logs queued for the write-behind flusher"
 )
+PREDICTION_LOG_ROWS = Counter(
+    "prediction_log_rows_total",
+    "Prediction log rows by outcome",
+    ("result",)
+)
+
+def record_cache_lookup(tier: str, hit: bool) -> None:
+    """Count a lookup in one of the Redis cache tiers"""
+    CACHE_LOOKUPS.labels(tier, "hit" if hit else "miss").inc()
+
+def cache_hit_ratio(tier: str) -> Optional[float]:
+    """Hit ratio of a cache tier, or None before its first lookup"""
+    hits = CACHE_LOOKUPS.labels(tier, "hit").get()
+    lookups = hits + CACHE_LOOKUPS.labels(tier, "miss").get()
+    return hits / lookups if lookups else None
+
+# In-process caches keep their own counters; they are read at scrape time.
+# CacheStats and the write-behind buffer only ever increment theirs (clear() keeps them),
+# so they are valid Prometheus counters.
+for _tier, _cache in (("local", local_model_cache), ("negative", missing_model_cache)):
+    CACHE_LOOKUPS.labels(_tier, "hit").set_function(lambda cache=_cache: cache.stats.hits)
+    CACHE_LOOKUPS.labels(_tier, "miss").set_function(lambda cache=_cache: cache.stats.misses)
+for _tier in ("local", "negative", "redis", "prediction"):
+    CACHE_HIT_RATIO.labels(_tier).set_function(lambda tier=_tier: cache_hit_ratio(tier))
+PREDICTION_LOG_PENDING.set_function(lambda: prediction_log_buffer.pending)
+PREDICTION_LOG_ROWS.labels("flushed").set_function(lambda: prediction_log_buffer.rows_flushed)
+PREDICTION_LOG_ROWS.labels("failed").set_function(lambda: prediction_log_buffer.rows_failed)
+
+# Highest TrainedModel.updated_at seen by this worker - every training run inserts
+# (or re-activates) a row, so rows updated after the watermark identify series whose
+# active version changed. Each poll re-reads an overlap window before the watermark,
+# because a transaction may commit after rows of later transactions were seen; rows
+# already handled in that window are skipped by (id, updated_at).
+MODEL_INVALIDATION_OVERLAP_SECONDS = int(os.getenv("MODEL_INVALIDATION_OVERLAP_SECONDS", 300))
+model_watermark = 0
+invalidated_model_rows: Dict[tuple, int] = {}
+# Bumped whenever the poller invalidates models. A lookup that started before a bump
+# may have read Redis or the database before the new model committed, so it must not
+# fill any cache tier with its result (the poll that would clear that entry has already run).
+model_invalidation_generation = 0
+
+def read_model_watermark() -> int:
+    """Get the latest TrainedModel.updated_at"""
+    with get_db_session() as db:
+        return db.query(func.max(TrainedModel.updated_at)).scalar() or 0
+
+def read_models_updated_since(since: int) -> list:
+    """Get (id, series_id, model_version, updated_at) of every TrainedModel row updated since a timestamp"""
+    with get_db_session() as db:
+        return db.query(
+            TrainedModel.id,
+            TrainedModel.series_id,
+            TrainedModel.model_version,
+            TrainedModel.updated_at
+        ).filter(
+            TrainedModel.updated_at >= since
+        ).all()
+
+def read_series_page(after_series_id: str, limit: int) -> List[str]:
+    """Get the next page of distinct trained series ids (keyset pagination)"""
+    with get_db_session() as db:
+        rows = db.query(TrainedModel.series_id).filter(
+            TrainedModel.series_id > after_series_id
+        ).distinct().order_by(TrainedModel.series_id).limit(limit).all()
+        return [series_id for (series_id,) in rows]
+
+async def load_known_series() -> None:
+    """Populate the known-series Bloom filter from the database"""
+    global known_series_ready
+    
+    last_series_id = ""
+    while True:
+        page = await asyncio.to_thread(read_series_page, last_series_id, KNOWN_SERIES_PAGE_SIZE)
+        # Added on the event loop thread, like the watermark poller, so adds never race
+        known_series.add_many(page)
+        if len(page) < KNOWN_SERIES_PAGE_SIZE:
+            break
+        last_series_id = page[-1]
+    
+    known_series_ready = True
+    logger.info(f"Known-series filter loaded with {known_series.count} series")
+
+def read_active_models_page(after_id: int, limit: int) -> List[TrainedModel]:
+    """Get the next page of active models ordered by id (keyset pagination)"""
+    with get_db_session() as db:
+        models = db.query(TrainedModel).filter(
+            TrainedModel.is_active == True,
+            TrainedModel.id > after_id
+        ).order_by(TrainedModel.id).limit(limit).all()
+        db.expunge_all()
+        return models
+
+async def warm_model_cache() -> None:
+    """Stream all active models into the in-process cache and Redis.
+    
+    The service reports ready once warm-up completes or exceeds its time budget;
+    in the latter case warm-up keeps going in the background.
+    """
+    global service_ready
+    
+    start_time = time.time()
+    warmup_status["state"] = "running"
+    last_id = 0
+    
+    try:
+        while True:
+            async with model_refresh_lock:
+                page = await asyncio.to_thread(read_active_models_page, last_id, MODEL_WARMUP_PAGE_SIZE)
+                
+                cache_entries = {}
+                for db_model in page:
+                    model_params = model_params_from_db(db_model)
+                    # The local tier only keeps what fits; Redis takes every model
+                    if warmup_status["models_loaded"] < local_model_cache.max_size:
+                        local_model_cache.set(db_model.series_id, model_params)
+                    cache_entries[f"model:{db_model.series_id}"] = (json.dumps(model_params), MODEL_CACHE_TTL_SECONDS)
+                    warmup_status["models_loaded"] += 1
+                await redis_cache.set_many_ex(cache_entries)
+            
+            if len(page) < MODEL_WARMUP_PAGE_SIZE:
+                break
+            last_id = page[-1].id
+            
+            if not service_ready and time.time() - start_time > MODEL_WARMUP_TIME_BUDGET_SECONDS:
+                warmup_status["state"] = "budget_exceeded"
+                service_ready = True
+                logger.warning(f"Model warm-up exceeded {MODEL_WARMUP_TIME_BUDGET_SECONDS}s budget - continuing in background")
+        
+        if warmup_status["state"] == "running":
+            warmup_status["state"] = "completed"
+        logger.info(f"Model warm-up loaded {warmup_status['models_loaded']} models")
+    except Exception as e:
+        warmup_status["state"] = "failed"
+        logger.warning(f"Model warm-up failed: {e}")
+    finally:
+        warmup_status["duration_ms"] = round((time.time() - start_time) * 1000, 2)
+        service_ready = True
+
+async def invalidate_updated_models() -> int:
+    """Drop cached parameters of series trained or re-activated since the last watermark.
+    
+    Returns the number of series invalidated.
+    """
+    async with model_refresh_lock:
+        return await _invalidate_updated_models()
+
+async def _invalidate_updated_models() -> int:
+    """Invalidate models updated since the watermark - caller holds model_refresh_lock"""
+    global model_watermark, model_invalidation_generation
+    
+    since = model_watermark - MODEL_INVALIDATION_OVERLAP_SECONDS
+    rows = await asyncio.to_thread(read_models_updated_since, since)
+    
+    updated = []
+    for model_id, series_id, version, updated_at in rows:
+        if (model_id, updated_at) not in invalidated_model_rows:
+            invalidated_model_rows[(model_id, updated_at)] = updated_at
+            updated.append((model_id, series_id, version))
+    if rows:
+        model_watermark = max(model_watermark, max(updated_at for *_, updated_at in rows))
+    
+    # Rows that left the overlap window can't be read again
+    for key in [key for key, updated_at in invalidated_model_rows.items() if updated_at < since]:
+        del invalidated_model_rows[key]
+    
+    if not updated:
+        return 0
+    
+    series_ids = {series_id for _, series_id, _ in updated}
+    model_invalidation_generation += 1
+    known_series.add_many(series_ids)
+    local_model_cache.invalidate_many(series_ids)
+    
+    # New series/versions must no longer be reported as missing
+    missing_keys = [(series_id, None) for series_id in series_ids]
+    missing_keys += [(series_id, version) for _, series_id, version in updated]
+    missing_model_cache.invalidate_many(local_cache_key(*key) for key in missing_keys)
+    
+    # Redis entries still expire on their own TTL if this fails
+    await redis_cache.delete_many(
+        [f"model:{series_id}" for series_id in series_ids]
+        + [missing_cache_key(model_cache_key(*key)) for key in missing_keys]
+    )
+    
+    return len(series_ids)
+
+async def watch_model_updates() -> None:
+    """Periodically invalidate cached models of series that got a new version"""
+    while True:
+        await asyncio.sleep(MODEL_INVALIDATION_POLL_SECONDS)
+        try:
+            await invalidate_updated_models()
+        except Exception as e:
+            logger.warning(f"Model invalidation poll failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run cache warm-up, background cache maintenance and prediction log flushing for the lifetime of the service"""
+    global model_watermark, service_ready
+    
+    try:
+        model_watermark = await asyncio.to_thread(read_model_watermark)
+    except Exception as e:
+        logger.warning(f"Could not read model watermark at startup: {e}")
+    
+    watcher = asyncio.create_task(watch_model_updates())
+    series_loader = asyncio.create_task(load_known_series())
+    if MODEL_WARMUP_ENABLED:
+        warmer = asyncio.create_task(warm_model_cache())
+    else:
+        warmer = None
+        warmup_status["state"] = "disabled"
+        service_ready = True
+    if LATENCY_SKETCH_PERSIST_ENABLED:
+        sketch_persister = asyncio.create_task(persist_latency_sketches_periodically("inference", latency_sketches))
+    else:
+        sketch_persister = None
+    await prediction_log_buffer.start()
+    try:
+        yield
+    finally:
+        watcher.cancel()
+        series_loader.cancel()
+        if warmer is not None:
+            warmer.cancel()
+        if sketch_persister is not None:
+            sketch_persister.cancel()
+        # Graceful shutdown: persist every queued prediction log
+        await prediction_log_buffer.stop()
+        await close_async_database()
+        await redis_cache.close()
+
+# FastAPI app
+app = FastAPI(title="Inference Service", lifespan=lifespan)
+app.add_middleware(RequestMetricsMiddleware)
+
+# Redis Configuration (asyncio client, sized pool and per-call timeouts from REDIS_* env vars)
+redis_client = create_async_redis()
+redis_cache = AsyncRedisCache(redis_client)
+
+def model_cache_key(series_id: str, version: Optional[str] = None) -> str:
+    """Redis key of the active model of a series, or of a pinned version"""
+    return f"model:{series_id}:{version}" if version else f"model:{series_id}"
+
+def local_cache_key(series_id: str, version: Optional[str] = None) -> Hashable:
+    """In-process cache key - active models are keyed by series so invalidation can find them"""
+    return (series_id, version) if version else series_id
+
+def model_cache_ttl(version: Optional[str] = None) -> Optional[int]:
+    """Pinned versions never change once written, so they are cached without expiry"""
+    return None if version else MODEL_CACHE_TTL_SECONDS
+
+def missing_cache_key(model_key: str) -> str:
+    """Redis key marking a model key as known not to exist"""
+    return f"missing:{model_key}"
+
+def model_not_found(series_id: str, version: Optional[str] = None) -> HTTPException:
+    """Build the 404 returned for unknown series or versions"""
+    if version:
+        return HTTPException(
+            status_code=404,
+            detail=f"Model version {version} for series {series_id} not found."
+        )
+    return HTTPException(
+        status_code=404,
+        detail=f"Model for series {series_id} not found. Train model first."
+    )
+
+def is_known_missing(series_id: str, version: Optional[str] = None) -> bool:
+    """In-process check for series/versions known to have no model"""
+    if known_series_ready and series_id not in known_series:
+        return True
+    return missing_model_cache.get(local_cache_key(series_id, version)) is not None
+
+def lookup_is_current(generation: int) -> bool:
+    """Whether no models were invalidated since a lookup read model_invalidation_generation"""
+    return generation == model_invalidation_generation
+
+def remember_missing_locally(local_key: str, generation: int) -> None:
+    """Record a key reported missing by Redis unless models were invalidated since the lookup began"""
+    if lookup_is_current(generation):
+        missing_model_cache.set(local_key, True)
+
+async def remember_missing(series_ids: List[str], generation: int, version: Optional[str] = None) -> None:
+    """Record series/versions without a model in the negative cache tiers.
+    
+    `generation` is model_invalidation_generation read before the lookup; if
+    models were invalidated since, the result may predate a new model and is dropped.
+    """
+    if not lookup_is_current(generation) or not series_ids:
+        return
+    for series_id in series_ids:
+        missing_model_cache.set(local_cache_key(series_id, version), True)
+    await redis_cache.set_many_ex({
+        missing_cache_key(model_cache_key(series_id, version)): ("1", NEGATIVE_CACHE_TTL_SECONDS)
+        for series_id in series_ids
+    })
+
+async def load_model_params(series_id: str, db: AsyncSession, version: Optional[str] = None) -> dict:
+    """Get model parameters from the local cache, then Redis, then the database.
+    
+    Without a version the active model is used; with one, that exact version.
+    """
+    model_params = local_model_cache.get(local_cache_key(series_id, version))
+    if model_params is not None:
+        return model_params
+    
+    if is_known_missing(series_id, version):
+        raise model_not_found(series_id, version)
+    
+    return await model_loads.do(
+        model_cache_key(series_id, version),
+        lambda: load_model_params_remote(series_id, db, version)
+    )
+
+async def load_model_params_remote(
+    series_id: str,
+    db: AsyncSession,
+    version: Optional[str] = None,
+    check_redis: bool = True
+) -> dict:
+    """Load model parameters from Redis or the database and fill both cache tiers.
+    
+    Callers coalesce this per model key (see `model_loads`), so a burst of misses
+    for one series results in a single Redis read, database query and cache fill.
+    The fill is skipped if models were invalidated while loading, since every
+    waiter would otherwise re-populate the stale entry.
+    """
+    local_key = local_cache_key(series_id, version)
+    model_key = model_cache_key(series_id, version)
+    generation = model_invalidation_generation
+    
+    if check_redis:
+        with stage_durations["cache_lookup"].time():
+            cached_model, cached_missing = await redis_cache.get_many([model_key, missing_cache_key(model_key)])
+        record_cache_lookup("redis", bool(cached_model))
+        if cached_model:
+            model_params = json.loads(cached_model)
+            if lookup_is_current(generation):
+                local_model_cache.set(local_key, model_params, ttl_seconds=model_cache_ttl(version))
+            return model_params
+        if cached_missing:
+            remember_missing_locally(local_key, generation)
+            raise model_not_found(series_id, version)
+    
+    # Fallback to database if not in cache
+    try:
+        with stage_durations["db_fetch"].time():
+            model_params = await fetch_model_params_from_db(series_id, db, version)
+    except HTTPException as e:
+        if e.status_code == 404:
+            await remember_missing([series_id], generation, version)
+        raise
+    
+    # Cache model parameters for future use
+    if lookup_is_current(generation):
+        await redis_cache.set_many_ex({model_key: (json.dumps(model_params), model_cache_ttl(version))})
+        local_model_cache.set(local_key, model_params, ttl_seconds=model_cache_ttl(version))
+    
+    return model_params
+
+async def fetch_model_params_from_db(series_id: str, db: AsyncSession, version: Optional[str] = None) -> dict:
+    """Load parameters of the active model (or of a given version) of a series from the database"""
+    query = select(TrainedModel).where(TrainedModel.series_id == series_id)
+    if version:
+        query = query.where(TrainedModel.model_version == version)
+    else:
+        query = query.where(TrainedModel.is_active == True)
+    
+    result = await db.execute(query.limit(1))
+    db_model = result.scalars().first()
+    
+    if not db_model:
+        raise model_not_found(series_id, version)
+    
+    return model_params_from_db(db_model)
+
+async def load_many_model_params(series_ids: List[str], db: AsyncSession) -> Dict[str, dict]:
+    """Resolve model parameters for many series with one MGET and one batched DB query.
+    
+    Series without an active model are left out of the returned mapping.
+    """
+    params_by_series = {}
+    remote_ids = []
+    for series_id in dict.fromkeys(series_ids):
+        model_params = local_model_cache.get(series_id)
+        if model_params is not None:
+            params_by_series[series_id] = model_params
+        elif not is_known_missing(series_id):
+            remote_ids.append(series_id)
+    
+    if not remote_ids:
+        return params_by_series
+    
+    generation = model_invalidation_generation
+    with stage_durations["cache_lookup"].time():
+        cached_models = await redis_cache.get_many([f"model:{series_id}" for series_id in remote_ids])
+    
+    missing_ids = []
+    for series_id, cached_model in zip(remote_ids, cached_models):
+        record_cache_lookup("redis", bool(cached_model))
+        if cached_model:
+            model_params = json.loads(cached_model)
+            params_by_series[series_id] = model_params
+            if lookup_is_current(generation):
+                local_model_cache.set(series_id, model_params)
+        else:
+            missing_ids.append(series_id)
+    
+    if missing_ids:
+        with stage_durations["db_fetch"].time():
+            result = await db.execute(
+                select(TrainedModel).where(
+                    TrainedModel.series_id.in_(missing_ids),
+                    TrainedModel.is_active == True
+                )
+            )
+            db_models = result.scalars().all()
+        
+        for db_model in db_models:
+            params_by_series[db_model.series_id] = model_params_from_db(db_model)
+        
+        # Fill the cache for all misses in a single round trip, unless an invalidation
+        # since the lookup began means the rows may already be stale
+        if lookup_is_current(generation):
+            cache_entries = {}
+            for db_model in db_models:
+                model_params = params_by_series[db_model.series_id]
+                local_model_cache.set(db_model.series_id, model_params)
+                cache_entries[f"model:{db_model.series_id}"] = (json.dumps(model_params), MODEL_CACHE_TTL_SECONDS)
+            await redis_cache.set_many_ex(cache_entries)
+        
+        await remember_missing([series_id for series_id in missing_ids if series_id not in params_by_series], generation)
+    
+    return params_by_series
+
+def model_params_from_db(db_model: TrainedModel) -> dict:
+    """Extract cacheable model parameters from a database row"""
+    return {
+        "mean": db_model.mean,
+        "std": db_model.std,
+        "threshold": db_model.threshold,
+        "model_version": db_model.model_version
+    }
+
+def build_model(model_params: dict) -> AnomalyDetectionModel:
+    """Create a trained model from cached parameters"""
+    model = AnomalyDetectionModel(threshold=model_params["threshold"])
+    model.mean = model_params["mean"]
+    model.std = model_params["std"]
+    model._mark_as_trained()
+    return model
+
+@app.post("/predict/bulk")
+async def predict_bulk(
+    request: AnomalyBulkPredictRequest,
+    db: AsyncSession = Depends(get_async_db)
+) -> AnomalyBulkPredictResponse:
+    """Score data points from many series with pipelined model lookup.
+    
+    Results keep the request order; items that cannot be scored carry an error
+    instead of failing the whole batch.
+    """
+    
+    start_time = time.time()
+    
+    try:
+        request.validate_common_constraints()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    try:
+        items = request.items
+        params_by_series = await load_many_model_params([item.series_id for item in items], db)
+        
+        results: List[AnomalyBulkPredictResult] = [None] * len(items)
+        
+        # Group item positions by series so each model scores its points in one pass
+        positions_by_series = defaultdict(list)
+        for position, item in enumerate(items):
+            if item.series_id not in params_by_series:
+                results[position] = AnomalyBulkPredictResult(
+                    series_id=item.series_id,
+                    error=f"Model for series {item.series_id} not found. Train model first."
+                )
+                continue
+            try:
+                int(item.timestamp)
+            except ValueError:
+                results[position] = AnomalyBulkPredictResult(
+                    series_id=item.series_id,
+                    error="Invalid timestamp format - must be unix timestamp"
+                )
+                continue
+            positions_by_series[item.series_id].append(position)
+        
+        inference_start = time.time()
+        for series_id, positions in positions_by_series.items():
+            model_params = params_by_series[series_id]
+            model = build_model(model_params)
+            anomalies = model.predict_batch(
+                np.fromiter((items[position].value for position in positions), dtype=np.float64, count=len(positions))
+            )
+            for position, is_anomaly in zip(positions, anomalies.tolist()):
+                results[position] = AnomalyBulkPredictResult(
+                    series_id=series_id,
+                    anomaly=is_anomaly,
+                    model_version=model_params["model_version"]
+                )
+        inference_latency_ms = (time.time() - inference_start) * 1000
+        stage_durations["inference"].observe(inference_latency_ms / 1000)
+        
+        # Queue logs of all scored items for bulk persistence (latencies amortized per point)
+        scored = [(item, result) for item, result in zip(items, results) if result.error is None]
+        if scored:
+            created_at = int(time.time())
+            total_latency_ms = (time.time() - start_time) * 1000
+            record_latencies(inference_latency_ms / len(scored), total_latency_ms / len(scored), len(scored))
+            with stage_durations["log_write"].time():
+                await prediction_log_buffer.put_many(
+                    {
+                        "series_id": item.series_id,
+                        "timestamp": int(item.timestamp),
+                        "value": item.value,
+                        "prediction": result.anomaly,
+                        "model_version": result.model_version,
+                        "inference_latency_ms": inference_latency_ms / len(scored),
+                        "database_latency_ms": None,
+                        "model_lookup_latency_ms": None,
+                        "total_latency_ms": total_latency_ms / len(scored),
+                        "created_at": created_at
+                    }
+                    for item, result in scored
+                )
+        
+        return AnomalyBulkPredictResponse(
+            results=results,
+            error_count=len(items) - len(scored)
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/predict/{series_id}")
 async def predict(
     series_id: str, 
     request: AnomalyPredictRequest,
     version: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> AnomalyPredictResponse:
-    """Make prediction using cached model with database fallback"""
+    """Make prediction using cached model with database fallback.
+    
+    If `version` is given the prediction is pinned to that model version,
+    otherwise the active model of the series is used.
+    """
     
     # Start timing for total latency
     import time
     start_time = time.time()
     
     try:
-        # Check prediction cache first
-        cache_key = f"prediction:{series_id}:{request.timestamp}"
-        cached_prediction = redis_client.get(cache_key)
+        if version:
+            cache_key = f"prediction:{series_id}:{version}:{request.timestamp}"
+        else:
+            cache_key = f"prediction:{series_id}:{request.timestamp}"
+        model_key = model_cache_key(series_id, version)
+        local_key = local_cache_key(series_id, version)
         
+        # Check prediction cache first - fetched together with the model
+        # parameters in one MGET unless the model is cached in-process
+        lookup_start = time.time()
+        generation = model_invalidation_generation
+        model_params = local_model_cache.get(local_key)
+        if model_params is None:
+            # Unknown series are rejected before any network round trip
+            if is_known_missing(series_id, version):
+                raise model_not_found(series_id, version)
+            with stage_durations["cache_lookup"].time():
+                cached_prediction, cached_model, cached_missing = await redis_cache.get_many(
+                    [cache_key, model_key, missing_cache_key(model_key)]
+                )
+        else:
+            with stage_durations["cache_lookup"].time():
+                cached_prediction, cached_model, cached_missing = await redis_cache.get(cache_key), None, None
+        
+        record_cache_lookup("prediction", bool(cached_prediction))
         if cached_prediction:
             prediction_data = json.loads(cached_prediction)
             return AnomalyPredictResponse(**prediction_data)
         
-        # Get model parameters from cache
-        model_key = f"model:{series_id}"
-        cached_model = redis_client.get(model_key)
-        
-        model_params = None
-        if cached_model:
-            model_params = json.loads(cached_model)
-        else:
-            # Fallback to database if not in cache
-            db_model = db.query(TrainedModel).filter(
-                TrainedModel.series_id == series_id,
-                TrainedModel.is_active == True
-            ).first()
-            
-            if not db_model:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Model for series {series_id} not found. Train model first."
+        # Get model parameters (cache tiers with coalesced database fallback)
+        if model_params is None:
+            if cached_missing:
+                remember_missing_locally(local_key, generation)
+                raise model_not_found(series_id, version)
+            record_cache_lookup("redis", bool(cached_model))
+            if cached_model:
+                model_params = json.loads(cached_model)
+                if lookup_is_current(generation):
+                    local_model_cache.set(local_key, model_params, ttl_seconds=model_cache_ttl(version))
+            else:
+                model_params = await model_loads.do(
+                    model_key,
+                    lambda: load_model_params_remote(series_id, db, version, check_redis=False)
                 )
-            
-            # Load model parameters from database
-            model_params = {
-                "mean": db_model.mean,
-                "std": db_model.std,
-                "threshold": db_model.threshold,
-                "model_version": db_model.model_version
-            }
-            
-            # Cache model parameters for future use
-            redis_client.setex(
-                model_key,
-                3600,  # 1 hour TTL
-                json.dumps(model_params)
-            )
-        
-        # Create model from parameters
-        model = AnomalyDetectionModel(threshold=model_params["threshold"])
-        model.mean = model_params["mean"]
-        model.std = model_params["std"]
-        model._mark_as_trained()
+        model = build_model(model_params)
+        model_lookup_latency_ms = (time.time() - lookup_start) * 1000
         
         # Make prediction (measure inference latency)
         inference_start = time.time()
         data_point = request.to_data_point()
         prediction_details = model.predict_with_details(data_point)
         inference_latency_ms = (time.time() - inference_start) * 1000
+        stage_durations["inference"].observe(inference_latency_ms / 1000)
         
         # Create response
         response = AnomalyPredictResponse(
@@ -102,43 +750,116 @@ async def predict(
             model_version=model_params["model_version"]
         )
         
-        # Log prediction to database (measure database latency)
-        db_start = time.time()
-        prediction_log = PredictionLog(
-            series_id=series_id,
-            timestamp=int(request.timestamp),
-            value=request.value,
-            prediction=prediction_details["anomaly"],
-            model_version=model_params["model_version"],
-            inference_latency_ms=inference_latency_ms,
-            database_latency_ms=None,  # Will be updated after commit
-            total_latency_ms=None,     # Will be updated after commit
-            created_at=int(time.time())
-        )
-        db.add(prediction_log)
-        db.commit()
-        db_latency_ms = (time.time() - db_start) * 1000
-        
-        # Calculate total latency and update record
+        # Queue prediction log - persisted by the write-behind buffer in bulk
         total_latency_ms = (time.time() - start_time) * 1000
-        prediction_log.database_latency_ms = db_latency_ms
-        prediction_log.total_latency_ms = total_latency_ms
-        db.commit()
+        record_latencies(inference_latency_ms, total_latency_ms)
+        with stage_durations["log_write"].time():
+            await prediction_log_buffer.put({
+                "series_id": series_id,
+                "timestamp": int(request.timestamp),
+                "value": request.value,
+                "prediction": prediction_details["anomaly"],
+                "model_version": model_params["model_version"],
+                "inference_latency_ms": inference_latency_ms,
+                "database_latency_ms": None,  # Written behind, outside the request
+                "model_lookup_latency_ms": model_lookup_latency_ms,
+                "total_latency_ms": total_latency_ms,
+                "created_at": int(time.time())
+            })
         
         # Cache prediction
-        redis_client.setex(
-            cache_key,
-            300,  # 5 minutes TTL
-            json.dumps(response.model_dump())
-        )
+        await redis_cache.set_many_ex({
+            cache_key: (json.dumps(response.model_dump()), 300)  # 5 minutes TTL
+        })
         
         return response
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/predict/{series_id}/batch")
+async def predict_batch(
+    series_id: str,
+    request: AnomalyBatchPredictRequest,
+    version: str = None,
+    db: AsyncSession = Depends(get_async_db)
+) -> AnomalyBatchPredictResponse:
+    """Score many data points of one series with a single model lookup and one vectorized pass.
+    
+    If `version` is given the batch is scored against that model version.
+    """
+    
+    start_time = time.time()
+    
+    try:
+        request.validate_common_constraints()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    try:
+        model_params = await load_model_params(series_id, db, version)
+        model = build_model(model_params)
+        
+        # Vectorized prediction over the whole batch
+        inference_start = time.time()
+        anomalies = model.predict_batch(np.asarray(request.values, dtype=np.float64))
+        inference_latency_ms = (time.time() - inference_start) * 1000
+        stage_durations["inference"].observe(inference_latency_ms / 1000)
         
+        batch_size = len(request.values)
+        anomaly_flags = anomalies.tolist()
+        
+        # Queue all prediction logs for bulk persistence.
+        # Latencies are amortized per point so the latency metrics stay comparable
+        # with single predictions.
+        created_at = int(time.time())
+        total_latency_ms = (time.time() - start_time) * 1000
+        record_latencies(inference_latency_ms / batch_size, total_latency_ms / batch_size, batch_size)
+        with stage_durations["log_write"].time():
+            await prediction_log_buffer.put_many(
+                {
+                    "series_id": series_id,
+                    "timestamp": int(timestamp),
+                    "value": value,
+                    "prediction": is_anomaly,
+                    "model_version": model_params["model_version"],
+                    "inference_latency_ms": inference_latency_ms / batch_size,
+                    "database_latency_ms": None,
+                    "model_lookup_latency_ms": None,
+                    "total_latency_ms": total_latency_ms / batch_size,
+                    "created_at": created_at
+                }
+                for timestamp, value, is_anomaly in zip(request.timestamps, request.values, anomaly_flags)
+            )
+        
+        return AnomalyBatchPredictResponse(
+            anomalies=anomaly_flags,
+            anomaly_count=int(anomalies.sum()),
+            model_version=model_params["model_version"]
+        )
+    
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/ready")
+async def readiness():
+    """Readiness probe - succeeds once model cache warm-up finished or ran out of time budget"""
+    if not service_ready:
+        raise HTTPException(
+            status_code=503,
+            detail={"service": "inference", "ready": False, "warmup": warmup_status}
+        )
+    return {"service": "inference", "ready": True, "warmup": warmup_status}
+
+@app.get("/metrics", response_class=Response)
+async def metrics():
+    """Prometheus metrics of this instance (text exposition format)"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/healthcheck")
 async def healthcheck(db: Session = Depends(get_db)):
     import time
@@ -148,47 +869,24 @@ async def healthcheck(db: Session = Depends(get_db)):
     
     try:
         # Check Redis connection
-        redis_client.ping()
+        await redis_client.ping()
         redis_status = "connected"
         
-        # Get basic cache stats
-        cache_keys = len(redis_client.keys("model:*"))
+        # Get basic cache stats - SCAN walks the keyspace incrementally instead of blocking Redis like KEYS
+        cache_keys = 0
+        async for _ in redis_client.scan_iter(match="model:*", count=1000):
+            cache_keys += 1
         
         # Check Database connection
         active_models = db.query(TrainedModel).filter(TrainedModel.is_active == True).count()
         database_status = "connected"
         
-        # Recent predictions (last hour)
-        import time
-        hour_ago = int(time.time()) - 3600
-        recent_predictions_query = db.query(PredictionLog).filter(PredictionLog.created_at >= hour_ago)
-        recent_predictions = recent_predictions_query.count()
+        # Recent predictions (last hour), counted from the rollups
+        recent_predictions = count_predictions_since(db, int(time.time()) - 3600)
         
-        # Calculate latency metrics from recent predictions
-        recent_predictions_with_latency = recent_predictions_query.filter(
-            PredictionLog.total_latency_ms.isnot(None)
-        ).all()
-        
-        avg_inference_latency = 0
-        avg_total_latency = 0
-        p95_inference_latency = 0
-        p95_total_latency = 0
-        
-        if recent_predictions_with_latency:
-            inference_latencies = [p.inference_latency_ms for p in recent_predictions_with_latency if p.inference_latency_ms]
-            total_latencies = [p.total_latency_ms for p in recent_predictions_with_latency if p.total_latency_ms]
-            
-            if inference_latencies:
-                avg_inference_latency = sum(inference_latencies) / len(inference_latencies)
-                inference_latencies.sort()
-                p95_index = int(len(inference_latencies) * 0.95)
-                p95_inference_latency = inference_latencies[p95_index] if p95_index < len(inference_latencies) else inference_latencies[-1]
-            
-            if total_latencies:
-                avg_total_latency = sum(total_latencies) / len(total_latencies)
-                total_latencies.sort()
-                p95_index = int(len(total_latencies) * 0.95)
-                p95_total_latency = total_latencies[p95_index] if p95_index < len(total_latencies) else total_latencies[-1]
+        # Latency percentiles of this instance from the in-memory sketches
+        inference_latency = latency_sketches["inference_latency_ms"].merged(3600).summary()
+        total_latency = latency_sketches["total_latency_ms"].merged(3600).summary()
         
         return {
             "service": "inference",
@@ -199,11 +897,21 @@ async def healthcheck(db: Session = Depends(get_db)):
             "metrics": {
                 "active_models": active_models,
                 "cached_models": cache_keys,
+                "local_model_cache": {"size": len(local_model_cache), **local_model_cache.stats.to_dict()},
+                "prediction_log_buffer": prediction_log_buffer.get_stats(),
+                "model_load_coalescing": model_loads.get_stats(),
+                "negative_cache": {"size": len(missing_model_cache), **missing_model_cache.stats.to_dict()},
+                "known_series_filter": {"ready": known_series_ready, **known_series.get_stats()},
+                "model_warmup": {"ready": service_ready, **warmup_status},
                 "predictions_1h": recent_predictions,
-                "avg_inference_latency_ms": round(avg_inference_latency, 2),
-                "p95_inference_latency_ms": round(p95_inference_latency, 2),
-                "avg_total_latency_ms": round(avg_total_latency, 2),
-                "p95_total_latency_ms": round(p95_total_latency, 2)
+                "avg_inference_latency_ms": inference_latency["avg"] or 0,
+                "p50_inference_latency_ms": inference_latency["p50"] or 0,
+                "p95_inference_latency_ms": inference_latency["p95"] or 0,
+                "p99_inference_latency_ms": inference_latency["p99"] or 0,
+                "avg_total_latency_ms": total_latency["avg"] or 0,
+                "p50_total_latency_ms": total_latency["p50"] or 0,
+                "p95_total_latency_ms": total_latency["p95"] or 0,
+                "p99_total_latency_ms": total_latency["p99"] or 0
             }
         }
     except redis.RedisError as e:
@@ -1,19 +1,88 @@
 """
 Monitoring Service - Responsável por dashboards e plot de dados
 """
-from fastapi import FastAPI, HTTPException, Depends, Response
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
 from sqlalchemy.orm import Session
-from shared.database.database import get_db
-from shared.database.models import TrainedModel, PredictionLog, TrainingData
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.database.database import get_db, get_async_db, get_db_session
+from shared.database.models import TrainedModel, PredictionLog, PredictionRollup, TrainingData
+from shared.database.series_codec import training_data_arrays
+from shared.database.latency_sketches import load_latency_sketches
+from shared.database.rollups import MINUTE_SECONDS, HOUR_SECONDS, bucket_start, rollup_window, count_predictions_since
+from sqlalchemy import func
 from shared.models.anomaly.plot_models import AnomalyPlotResponse, PlotDataPoint
+from shared.streaming import Broadcaster, format_sse
+from shared.metrics import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, RequestMetricsMiddleware
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any
 import json
+import logging
 import os
+import time
 import httpx
 import asyncio
 
-app = FastAPI(title="Monitoring Service")
+logger = logging.getLogger(__name__)
+
+# Dashboard snapshot: rebuilt in the background, served from memory
+DASHBOARD_REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", 15))
+# Background refreshes stop once nobody requested the dashboard for this long
+DASHBOARD_IDLE_SECONDS = float(os.getenv("DASHBOARD_IDLE_SECONDS", 300))
+dashboard_snapshot: Optional[Dict[str, Any]] = None
+last_dashboard_request_at = 0.0
+dashboard_refresh_lock = asyncio.Lock()
+
+# Live metrics stream (GET /metrics/stream): one aggregation loop feeds every client
+METRICS_STREAM_INTERVAL_SECONDS = float(os.getenv("METRICS_STREAM_INTERVAL_SECONDS", 2))
+METRICS_STREAM_WINDOW_MINUTES = int(os.getenv("METRICS_STREAM_WINDOW_MINUTES", 5))
+METRICS_STREAM_HEARTBEAT_SECONDS = 15
+metrics_broadcaster = Broadcaster()
+
+# Prometheus metrics (GET /metrics), collected in-process per background stage
+MONITORING_STAGE_DURATION = Histogram(
+    "monitoring_stage_duration_seconds",
+    "Time spent in each stage of the background aggregations",
+    ("stage",)
+)
+stage_durations = {
+    stage: MONITORING_STAGE_DURATION.labels(stage)
+    for stage in ("dashboard_refresh", "dashboard_render", "live_metrics_query")
+}
+DASHBOARD_SNAPSHOT_AGE = Gauge(
+    "dashboard_snapshot_age_seconds",
+    "Age of the dashboard snapshot served by GET /dashboard"
+)
+METRICS_STREAM_SUBSCRIBERS = Gauge(
+    "metrics_stream_subscribers",
+    "Clients connected to GET /metrics/stream"
+)
+METRICS_STREAM_EVENTS = Counter(
+    "metrics_stream_events_total",
+    "Live metrics events published, and dropped from slow subscriber queues",
+    ("result",)
+)
+DASHBOARD_SNAPSHOT_AGE.set_function(
+    lambda: time.time() - dashboard_snapshot["generated_at"] if dashboard_snapshot is not None else None
+)
+METRICS_STREAM_SUBSCRIBERS.set_function(lambda: metrics_broadcaster.subscriber_count)
+METRICS_STREAM_EVENTS.labels("published").set_function(lambda: metrics_broadcaster.events_published)
+METRICS_STREAM_EVENTS.labels("dropped").set_function(lambda: metrics_broadcaster.events_dropped)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Refresh the dashboard snapshot and live metrics for the lifetime of the service"""
+    refresher = asyncio.create_task(refresh_dashboard_periodically())
+    aggregator = asyncio.create_task(aggregate_live_metrics())
+    try:
+        yield
+    finally:
+        refresher.cancel()
+        aggregator.cancel()
+
+app = FastAPI(title="Monitoring Service", lifespan=lifespan)
+app.add_middleware(RequestMetricsMiddleware)
 
 # Service URLs from environment (for system health check)
 TRAINING_SERVICE_URL = os.getenv("TRAINING_SERVICE_URL", "http://training-service:8000")
@@ -33,12 +102,12 @@ async def get_service_health(client: httpx.AsyncClient, service_name: str, url:
         return {"service": service_name, "status": "Unhealthy", "details": f"Unexpected error: {e}"}
 
 @app.get("/healthcheck")
-async def healthcheck(db: Session = Depends(get_db)):
+async def healthcheck(db: AsyncSession = Depends(get_async_db)):
     """Monitoring service health check endpoint."""
     try:
         # Check database connection
         from sqlalchemy import text
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {
             "status": "ok", 
             "service": "monitoring",
@@ -59,7 +128,7 @@ async def get_plot(
     If version is not provided, the most recent version is returned.
     """
     query = db.query(TrainingData).filter(TrainingData.series_id == series_id)
-
+    
     if version:
         query = query.filter(TrainingData.model_version == version)
     else:
@@ -76,38 +145,40 @@ async def get_plot(
             print(f"   Model {i+1}: version={model.model_version}, id={model.id}, created_at={model.created_at}")
         
         latest_model = all_models[0] if all_models else None
-
+        
         if not latest_model:
             raise HTTPException(status_code=404, detail=f"No trained model found for series_id: {series_id}")
-
+        
         version = latest_model.model_version
         print(f"🔍 DEBUG: Selected version {version} from model id={latest_model.id}")
         query = query.filter(TrainingData.model_version == version)
-
+    
     training_data_records = query.order_by(TrainingData.created_at.desc()).all()
-
+    
     if not training_data_records:
         raise HTTPException(status_code=404, detail=f"No training data found for series_id: {series_id} and version: {version}")
-
+    
     # Get the first (most recent) record
     training_record = training_data_records[0]
     
-    # Extract timestamps and values from JSON arrays
-    timestamps = training_record.timestamps if isinstance(training_record.timestamps, list) else []
-    values = training_record.values if isinstance(training_record.values, list) else []
+    # Decode timestamps and values (binary format or legacy JSON arrays)
+    try:
+        timestamps, values = training_data_arrays(training_record)
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=f"Data corruption: {e}")
     
     if len(timestamps) != len(values):
         raise HTTPException(status_code=500, detail="Data corruption: timestamps and values arrays have different lengths")
-
+    
     plot_data_points = [
         PlotDataPoint(
             timestamp=timestamp,
             value=value,
             is_anomaly=False  # Training data itself is not marked as anomaly
         )
-        for timestamp, value in zip(timestamps, values)
+        for timestamp, value in zip(timestamps.tolist(), values.tolist())
     ]
-
+    
     return AnomalyPlotResponse(
         series_id=series_id,
         model_version=version,
@@ -119,6 +190,11 @@ async def get_plot(
         }
     )
 
+@app.get("/metrics", response_class=Response)
+async def metrics():
+    """Prometheus metrics of this instance (text exposition format)"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/metrics/throughput")
 async def get_throughput_metrics(
     hours: int = 24,
@@ -127,33 +203,38 @@ async def get_throughput_metrics(
     """
     Returns throughput metrics for inference and training services.
     
+    Inference counts come from the hourly prediction rollups in one grouped
+    query; hours are clock hours, "0h ago" being the current (partial) hour.
+    
     Args:
         hours: Number of hours to look back (default: 24)
     """
     try:
         import time
-        cutoff_time = int(time.time()) - (hours * 3600)
+        now = int(time.time())
+        cutoff_time = now - (hours * 3600)
         
         # Inference throughput (predictions per hour)
-        predictions_query = db.query(PredictionLog).filter(
-            PredictionLog.created_at >= cutoff_time
-        )
-        total_predictions = predictions_query.count()
+        current_hour_start = bucket_start(now, HOUR_SECONDS)
+        hourly_counts = dict(db.query(
+            PredictionRollup.bucket_start,
+            func.sum(PredictionRollup.prediction_count)
+        ).filter(
+            PredictionRollup.bucket_seconds == HOUR_SECONDS,
+            PredictionRollup.bucket_start > current_hour_start - hours * HOUR_SECONDS
+        ).group_by(
+            PredictionRollup.bucket_start
+        ).all())
         
-        # Calculate predictions per hour for each hour
         hourly_predictions = []
         for h in range(hours):
-            hour_start = int(time.time()) - ((h + 1) * 3600)
-            hour_end = int(time.time()) - (h * 3600)
-            hour_count = predictions_query.filter(
-                PredictionLog.created_at >= hour_start,
-                PredictionLog.created_at < hour_end
-            ).count()
+            hour_start = current_hour_start - h * HOUR_SECONDS
             hourly_predictions.append({
                 "hour": f"{h}h ago",
-                "predictions": hour_count,
+                "predictions": int(hourly_counts.get(hour_start, 0)),
                 "timestamp": hour_start
             })
+        total_predictions = sum(h["predictions"] for h in hourly_predictions)
         
         # Training throughput (models trained)
         models_query = db.query(TrainedModel).filter(
@@ -167,7 +248,7 @@ async def get_throughput_metrics(
         
         return {
             "period_hours": hours,
-            "timestamp": int(time.time()),
+            "timestamp": now,
             "inference_throughput": {
                 "total_predictions": total_predictions,
                 "avg_predictions_per_hour": round(avg_predictions_per_hour, 2),
@@ -180,10 +261,135 @@ async def get_throughput_metrics(
                 "avg_models_per_hour": round(avg_models_per_hour, 2)
             }
         }
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to calculate throughput: {str(e)}")
 
+@app.get("/metrics/latency")
+async def get_latency_metrics(
+    hours: int = 1,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Returns latency percentiles (p50/p95/p99) per service and stage.
+    
+    Merged from the latency sketches every service instance persists per
+    time bucket, so no prediction or model rows are read.
+    
+    Args:
+        hours: Number of hours to look back (default: 1)
+    """
+    try:
+        now = int(time.time())
+        sketches = load_latency_sketches(db, now - hours * 3600)
+        
+        latency: Dict[str, Dict[str, Any]] = {}
+        for (service, metric), sketch in sorted(sketches.items()):
+            latency.setdefault(service, {})[metric] = sketch.summary()
+        
+        return {
+            "period_hours": hours,
+            "timestamp": now,
+            "latency": latency
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to calculate latency percentiles: {str(e)}")
+
+def read_live_metrics() -> Dict[str, Any]:
+    """Aggregate the recent minute rollups into a live metrics event (runs in a worker thread)"""
+    current_minute = bucket_start(int(time.time()), MINUTE_SECONDS)
+    window_start = current_minute - (METRICS_STREAM_WINDOW_MINUTES - 1) * MINUTE_SECONDS
+    
+    with get_db_session() as db:
+        minutes = db.query(
+            PredictionRollup.bucket_start,
+            func.sum(PredictionRollup.prediction_count),
+            func.sum(PredictionRollup.anomaly_count),
+            func.sum(PredictionRollup.total_latency_ms_sum)
+        ).filter(
+            PredictionRollup.bucket_seconds == MINUTE_SECONDS,
+            PredictionRollup.bucket_start >= window_start
+        ).group_by(
+            PredictionRollup.bucket_start
+        ).order_by(
+            PredictionRollup.bucket_start
+        ).all()
+        total_latency = load_latency_sketches(db, window_start, service="inference").get(("inference", "total_latency_ms"))
+    
+    per_minute = {int(start): (int(count), int(anomalies), float(latency_sum)) for start, count, anomalies, latency_sum in minutes}
+    predictions = sum(count for count, _, _ in per_minute.values())
+    anomalies = sum(anomaly_count for _, anomaly_count, _ in per_minute.values())
+    latency_sum = sum(latency for _, _, latency in per_minute.values())
+    last_minute = per_minute.get(current_minute - MINUTE_SECONDS, (0, 0, 0.0))[0]
+    
+    return {
+        "window_minutes": METRICS_STREAM_WINDOW_MINUTES,
+        "throughput": {
+            "current_minute": per_minute.get(current_minute, (0, 0, 0.0))[0],
+            "last_minute": last_minute,
+            "rps_last_minute": round(last_minute / MINUTE_SECONDS, 3),
+            "window_predictions": predictions
+        },
+        "anomaly_rate": round(anomalies / predictions, 4) if predictions else 0.0,
+        "avg_latency_ms": round(latency_sum / predictions, 2) if predictions else None,
+        # From the persisted sketches, so they trail the counts by up to one persist interval
+        "p95_latency_ms": total_latency.summary()["p95"] if total_latency is not None else None,
+        "p99_latency_ms": total_latency.summary()["p99"] if total_latency is not None else None,
+        "per_minute": [
+            {"timestamp": start, "predictions": count, "anomalies": anomaly_count}
+            for start, (count, anomaly_count, _) in per_minute.items()
+        ]
+    }
+
+async def aggregate_live_metrics() -> None:
+    """Publish live metrics to stream subscribers whenever they change.
+    
+    Runs once per interval however many clients are connected, and skips the
+    query entirely while nobody is listening.
+    """
+    previous = None
+    while True:
+        if metrics_broadcaster.subscriber_count > 0:
+            try:
+                with stage_durations["live_metrics_query"].time():
+                    metrics = await asyncio.to_thread(read_live_metrics)
+                if metrics != previous:
+                    metrics_broadcaster.publish({"timestamp": int(time.time()), **metrics})
+                    previous = metrics
+            except Exception as e:
+                logger.warning(f"Live metrics aggregation failed: {e}")
+        await asyncio.sleep(METRICS_STREAM_INTERVAL_SECONDS)
+
+@app.get("/metrics/stream")
+async def stream_metrics(request: Request) -> StreamingResponse:
+    """
+    Server-Sent Events stream of live throughput, anomaly-rate and latency metrics.
+    
+    A `metrics` event is pushed whenever the aggregates change (the latest one
+    right after connecting); comment lines keep idle connections alive.
+    """
+    async def events():
+        queue = metrics_broadcaster.subscribe()
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    metrics = await asyncio.wait_for(queue.get(), METRICS_STREAM_HEARTBEAT_SECONDS)
+                    yield format_sse(metrics, event="metrics")
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+        finally:
+            metrics_broadcaster.unsubscribe(queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/metrics/model-usage")
 async def get_model_usage_metrics(
     hours: int = 24,
@@ -199,30 +405,28 @@ async def get_model_usage_metrics(
     """
     try:
         import time
-        from sqlalchemy import func
         
         cutoff_time = int(time.time()) - (hours * 3600)
         
-        # Query most used models by prediction count
+        # Query most used models by prediction count (from the rollups)
+        prediction_count = func.sum(PredictionRollup.prediction_count)
         most_used_models = db.query(
-            PredictionLog.series_id,
-            PredictionLog.model_version,
-            func.count(PredictionLog.id).label('prediction_count'),
-            func.avg(PredictionLog.total_latency_ms).label('avg_latency_ms'),
-            func.max(PredictionLog.created_at).label('last_used_at')
+            PredictionRollup.series_id,
+            PredictionRollup.model_version,
+            prediction_count.label('prediction_count'),
+            (func.sum(PredictionRollup.total_latency_ms_sum) / func.nullif(prediction_count, 0)).label('avg_latency_ms'),
+            func.max(PredictionRollup.last_prediction_at).label('last_used_at')
         ).filter(
-            PredictionLog.created_at >= cutoff_time
+            rollup_window(cutoff_time)
         ).group_by(
-            PredictionLog.series_id,
-            PredictionLog.model_version
+            PredictionRollup.series_id,
+            PredictionRollup.model_version
         ).order_by(
-            func.count(PredictionLog.id).desc()
+            prediction_count.desc()
         ).limit(limit).all()
         
         # Calculate usage statistics
-        total_predictions_period = db.query(PredictionLog).filter(
-            PredictionLog.created_at >= cutoff_time
-        ).count()
+        total_predictions_period = count_predictions_since(db, cutoff_time)
         
         model_stats = []
         for model in most_used_models:
@@ -232,7 +436,7 @@ async def get_model_usage_metrics(
             model_stats.append({
                 "series_id": model.series_id,
                 "model_version": model.model_version,
-                "prediction_count": model.prediction_count,
+                "prediction_count": int(model.prediction_count),
                 "usage_percentage": round(usage_percentage, 2),
                 "avg_latency_ms": round(model.avg_latency_ms or 0, 2),
                 "last_used_at": model.last_used_at,
@@ -241,15 +445,15 @@ async def get_model_usage_metrics(
         
         # Series usage summary
         series_usage = db.query(
-            PredictionLog.series_id,
-            func.count(PredictionLog.id).label('total_predictions'),
-            func.count(func.distinct(PredictionLog.model_version)).label('version_count')
+            PredictionRollup.series_id,
+            prediction_count.label('total_predictions'),
+            func.count(func.distinct(PredictionRollup.model_version)).label('version_count')
         ).filter(
-            PredictionLog.created_at >= cutoff_time
+            rollup_window(cutoff_time)
         ).group_by(
-            PredictionLog.series_id
+            PredictionRollup.series_id
         ).order_by(
-            func.count(PredictionLog.id).desc()
+            prediction_count.desc()
         ).limit(limit).all()
         
         series_stats = []
@@ -257,7 +461,7 @@ async def get_model_usage_metrics(
             usage_percentage = (series.total_predictions / total_predictions_period * 100) if total_predictions_period > 0 else 0
             series_stats.append({
                 "series_id": series.series_id,
-                "total_predictions": series.total_predictions,
+                "total_predictions": int(series.total_predictions),
                 "version_count": series.version_count,
                 "usage_percentage": round(usage_percentage, 2)
             })
@@ -274,7 +478,7 @@ async def get_model_usage_metrics(
                 "avg_predictions_per_model": round(total_predictions_period / len(model_stats), 2) if model_stats else 0
             }
         }
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to calculate model usage: {str(e)}")
 
@@ -320,7 +524,7 @@ async def get_models(db: Session = Depends(get_db)) -> Dict[str, Any]:
             "total_series": len(models_list),
             "total_models": sum(len(m["versions"]) for m in models_list)
         }
-        
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch models: {str(e)}")
 
@@ -461,100 +665,8 @@ paths:
 """
         return Response(content=minimal_spec, media_type="text/yaml")
 
-@app.get("/dashboard", response_class=Response)
-async def dashboard(db: Session = Depends(get_db)):
-    """
-    Generates a simple HTML dashboard displaying key monitoring metrics
-    from the database.
-    """
-    # --- Fetch Data ---
-    now = datetime.now(timezone.utc)
-    one_hour_ago = now - timedelta(hours=1)
-    one_day_ago = now - timedelta(days=1)
-    
-    # Convert to unix timestamps
-    one_hour_ago_ts = int(one_hour_ago.timestamp())
-    one_day_ago_ts = int(one_day_ago.timestamp())
-    
-    # Basic metrics
-    total_models = db.query(TrainedModel).filter(TrainedModel.is_active == True).count()
-    total_predictions_today = db.query(PredictionLog).filter(
-        PredictionLog.created_at >= one_day_ago_ts
-    ).count()
-    total_predictions_hour = db.query(PredictionLog).filter(
-        PredictionLog.created_at >= one_hour_ago_ts
-    ).count()
-    
-    # Recent models
-    recent_models = db.query(TrainedModel).filter(
-        TrainedModel.is_active == True
-    ).order_by(TrainedModel.created_at.desc()).limit(5).all()
-    
-    # Recent predictions
-    recent_predictions = db.query(PredictionLog).order_by(
-        PredictionLog.created_at.desc()
-    ).limit(10).all()
-
-    # System health
-    try:
-        async with httpx.AsyncClient() as client:
-            system_health = await asyncio.gather(
-                get_service_health(client, "Training", TRAINING_SERVICE_URL),
-                get_service_health(client, "Inference", INFERENCE_SERVICE_URL),
-                return_exceptions=True
-            )
-    except Exception:
-        system_health = [
-            {"service": "Training", "status": "Unknown", "details": "Health check failed"},
-            {"service": "Inference", "status": "Unknown", "details": "Health check failed"}
-        ]
-    
-    # Throughput metrics (last 24h)
-    try:
-        cutoff_time = int(one_day_ago.timestamp())
-        
-        # Calculate hourly throughput for last 24h
-        total_predictions_24h = db.query(PredictionLog).filter(
-            PredictionLog.created_at >= cutoff_time
-        ).count()
-        
-        # Calculate current hour predictions
-        current_hour_start = int(now.replace(minute=0, second=0, microsecond=0).timestamp())
-        predictions_current_hour = db.query(PredictionLog).filter(
-            PredictionLog.created_at >= current_hour_start
-        ).count()
-        
-        avg_predictions_per_hour = total_predictions_24h / 24 if total_predictions_24h > 0 else 0
-        current_rps_estimate = avg_predictions_per_hour / 3600 if avg_predictions_per_hour > 0 else 0
-        
-    except Exception:
-        total_predictions_24h = 0
-        predictions_current_hour = 0
-        avg_predictions_per_hour = 0
-        current_rps_estimate = 0
-    
-    # Most used models (last 24h)
-    try:
-        from sqlalchemy import func
-        
-        most_used_models = db.query(
-            PredictionLog.series_id,
-            PredictionLog.model_version,
-            func.count(PredictionLog.id).label('usage_count')
-        ).filter(
-            PredictionLog.created_at >= cutoff_time
-        ).group_by(
-            PredictionLog.series_id,
-            PredictionLog.model_version
-        ).order_by(
-            func.count(PredictionLog.id).desc()
-        ).limit(5).all()
-        
-    except Exception:
-        most_used_models = []
-
-    # Generate HTML
-    html_content = f"""
+# Static part of the dashboard page (styles and scripts), built once at import
+DASHBOARD_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -562,15 +674,15 @@ async def dashboard(db: Session = Depends(get_db)):
         <title>Anomaly Detection System - Dashboard</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <style>
-            body {{
+            body {
                 font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
                 margin: 0;
                 padding: 20px;
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                 min-height: 100vh;
                 color: #333;
-            }}
-            .container {{
+            }
+            .container {
                 max-width: 1200px;
                 margin: 0 auto;
                 background: rgba(255,255,255,0.95);
@@ -578,31 +690,31 @@ async def dashboard(db: Session = Depends(get_db)):
                 padding: 30px;
                 box-shadow: 0 20px 40px rgba(0,0,0,0.1);
                 backdrop-filter: blur(10px);
-            }}
-            .header {{
+            }
+            .header {
                 text-align: center;
                 margin-bottom: 40px;
                 border-bottom: 2px solid #eee;
                 padding-bottom: 20px;
-            }}
-            .header h1 {{
+            }
+            .header h1 {
                 color: #2c3e50;
                 margin: 0 0 10px 0;
                 font-size: 2.5em;
                 font-weight: 300;
-            }}
-            .header p {{
+            }
+            .header p {
                 color: #7f8c8d;
                 margin: 0;
                 font-size: 1.1em;
-            }}
-            .metrics-grid {{
+            }
+            .metrics-grid {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
                 gap: 20px;
                 margin-bottom: 40px;
-            }}
-            .metric-card {{
+            }
+            .metric-card {
                 background: white;
                 padding: 25px;
                 border-radius: 15px;
@@ -610,45 +722,45 @@ async def dashboard(db: Session = Depends(get_db)):
                 text-align: center;
                 border-left: 4px solid #3498db;
                 transition: transform 0.2s, box-shadow 0.2s;
-            }}
-            .metric-card:hover {{
+            }
+            .metric-card:hover {
                 transform: translateY(-5px);
                 box-shadow: 0 10px 25px rgba(0,0,0,0.15);
-            }}
-            .metric-value {{
+            }
+            .metric-value {
                 font-size: 2.5em;
                 font-weight: bold;
                 color: #2c3e50;
                 margin-bottom: 10px;
-            }}
-            .metric-label {{
+            }
+            .metric-label {
                 color: #7f8c8d;
                 font-size: 1.1em;
                 text-transform: uppercase;
                 letter-spacing: 1px;
-            }}
-            .section {{
+            }
+            .section {
                 margin-bottom: 40px;
-            }}
-            .section h2 {{
+            }
+            .section h2 {
                 color: #2c3e50;
                 border-bottom: 2px solid #ecf0f1;
                 padding-bottom: 10px;
                 margin-bottom: 20px;
                 font-weight: 300;
-            }}
-            .service-grid {{
+            }
+            .service-grid {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
                 gap: 20px;
-            }}
-            .service-card {{
+            }
+            .service-card {
                 background: white;
                 padding: 20px;
                 border-radius: 10px;
                 box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            }}
-            .service-status {{
+            }
+            .service-status {
                 display: inline-block;
                 padding: 5px 15px;
                 border-radius: 20px;
@@ -656,66 +768,66 @@ async def dashboard(db: Session = Depends(get_db)):
                 font-weight: bold;
                 text-transform: uppercase;
                 letter-spacing: 1px;
-            }}
-            .status-healthy {{
+            }
+            .status-healthy {
                 background: #2ecc71;
                 color: white;
-            }}
-            .status-unhealthy {{
+            }
+            .status-unhealthy {
                 background: #e74c3c;
                 color: white;
-            }}
-            .status-unknown {{
+            }
+            .status-unknown {
                 background: #f39c12;
                 color: white;
-            }}
-            .table {{
+            }
+            .table {
                 width: 100%;
                 border-collapse: collapse;
                 background: white;
                 border-radius: 10px;
                 overflow: hidden;
                 box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            }}
-            .table th, .table td {{
+            }
+            .table th, .table td {
                 padding: 15px;
                 text-align: left;
                 border-bottom: 1px solid #ecf0f1;
-            }}
-            .table th {{
+            }
+            .table th {
                 background: #f8f9fa;
                 font-weight: 600;
                 color: #2c3e50;
                 text-transform: uppercase;
                 letter-spacing: 1px;
                 font-size: 0.9em;
-            }}
-            .table tr:hover {{
+            }
+            .table tr:hover {
                 background: #f8f9fa;
-            }}
-            .timestamp {{
+            }
+            .timestamp {
                 color: #7f8c8d;
                 font-size: 0.9em;
-            }}
-            .prediction-true {{
+            }
+            .prediction-true {
                 color: #e74c3c;
                 font-weight: bold;
-            }}
-            .prediction-false {{
+            }
+            .prediction-false {
                 color: #27ae60;
                 font-weight: bold;
-            }}
-            .refresh-info {{
+            }
+            .refresh-info {
                 text-align: center;
                 margin-top: 30px;
                 color: #7f8c8d;
                 font-style: italic;
-            }}
-            .api-links {{
+            }
+            .api-links {
                 margin-top: 30px;
                 text-align: center;
-            }}
-            .api-links a {{
+            }
+            .api-links a {
                 display: inline-block;
                 margin: 5px 10px;
                 padding: 10px 20px;
@@ -724,22 +836,22 @@ async def dashboard(db: Session = Depends(get_db)):
                 text-decoration: none;
                 border-radius: 5px;
                 transition: background 0.2s;
-            }}
-            .api-links a:hover {{
+            }
+            .api-links a:hover {
                 background: #2980b9;
-            }}
-            .metrics-grid {{
+            }
+            .metrics-grid {
                 display: grid;
                 grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
                 gap: 20px;
                 margin-bottom: 30px;
-            }}
-            .no-data {{
+            }
+            .no-data {
                 text-align: center;
                 font-style: italic;
                 color: #7f8c8d;
                 padding: 20px;
-            }}
+            }
         </style>
         <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
         <script src="https://cdn.jsdelivr.net/npm/chartjs-adapter-date-fns"></script>
@@ -747,7 +859,7 @@ async def dashboard(db: Session = Depends(get_db)):
             let chart = null;
             
             // Wait for DOM to be fully loaded
-            document.addEventListener('DOMContentLoaded', function() {{
+            document.addEventListener('DOMContentLoaded', function() {
                 console.log('DOM loaded, initializing dashboard...');
                 
                 // Load models on page load
@@ -755,61 +867,83 @@ async def dashboard(db: Session = Depends(get_db)):
                 
                 // Setup event listeners
                 setupEventListeners();
-            }});
+                
+                // Subscribe to live metrics
+                connectLiveMetrics();
+            });
+            
+            // Live metrics pushed by the server over Server-Sent Events
+            function connectLiveMetrics() {
+                const liveMetrics = document.getElementById('liveMetrics');
+                if (!liveMetrics || !window.EventSource) {
+                    return;
+                }
+                
+                const source = new EventSource('/metrics/stream');
+                source.addEventListener('metrics', function(event) {
+                    const data = JSON.parse(event.data);
+                    const latency = data.avg_latency_ms === null ? '-' : `${data.avg_latency_ms} ms`;
+                    const p95 = data.p95_latency_ms === null ? '-' : `${data.p95_latency_ms} ms`;
+                    liveMetrics.textContent =
+                        `Live: ${data.throughput.rps_last_minute} req/s, ` +
+                        `${(data.anomaly_rate * 100).toFixed(1)}% anomalies, ` +
+                        `avg latency ${latency}, p95 ${p95} (last ${data.window_minutes} min)`;
+                });
+            }
             
             // Load available models
-            async function loadModels() {{
-                try {{
+            async function loadModels() {
+                try {
                     console.log('Loading models...');
                     const response = await fetch('/models');
                     const data = await response.json();
                     
                     const seriesSelect = document.getElementById('seriesSelect');
-                    if (!seriesSelect) {{
+                    if (!seriesSelect) {
                         console.error('seriesSelect element not found!');
                         return;
-                    }}
+                    }
                     
                     seriesSelect.innerHTML = '<option value="">Select a series...</option>';
                     
                     console.log('Found', data.models.length, 'models');
-                    data.models.forEach(model => {{
+                    data.models.forEach(model => {
                         const option = document.createElement('option');
                         option.value = model.series_id;
                         option.textContent = model.series_id;
                         option.dataset.versions = JSON.stringify(model.versions);
                         seriesSelect.appendChild(option);
-                    }});
+                    });
                     
                     console.log('Models loaded successfully');
-                }} catch (error) {{
+                } catch (error) {
                     console.error('Error loading models:', error);
-                }}
-            }}
+                }
+            }
             
             // Setup all event listeners
-            function setupEventListeners() {{
+            function setupEventListeners() {
                 console.log('Setting up event listeners...');
                 
                 const seriesSelect = document.getElementById('seriesSelect');
                 const versionSelect = document.getElementById('versionSelect');
                 const plotButton = document.getElementById('plotButton');
                 
-                if (!seriesSelect || !versionSelect || !plotButton) {{
-                    console.error('Required elements not found:', {{
+                if (!seriesSelect || !versionSelect || !plotButton) {
+                    console.error('Required elements not found:', {
                         seriesSelect: !!seriesSelect,
                         versionSelect: !!versionSelect,
                         plotButton: !!plotButton
-                    }});
+                    });
                     return;
-                }}
+                }
                 
                 // Handle series selection
-                seriesSelect.addEventListener('change', function() {{
+                seriesSelect.addEventListener('change', function() {
                     console.log('Series changed, value:', this.value);
                     console.log('Selected index:', this.selectedIndex);
                     
-                    if (this.value && this.selectedIndex > 0) {{
+                    if (this.value && this.selectedIndex > 0) {
                         // Get selected option using options array and selectedIndex
                         const selectedOption = this.options[this.selectedIndex];
                         console.log('Selected option:', selectedOption);
@@ -823,81 +957,81 @@ async def dashboard(db: Session = Depends(get_db)):
                         // Clear and populate version dropdown
                         versionSelect.innerHTML = '<option value="">Latest version</option>';
                         
-                        versions.forEach(version => {{
+                        versions.forEach(version => {
                             const option = document.createElement('option');
                             option.value = version;
                             option.textContent = version;
                             versionSelect.appendChild(option);
                             console.log('Added version option:', version);
-                        }});
+                        });
                         
                         // Enable controls
                         versionSelect.disabled = false;
                         plotButton.disabled = false;
                         
                         console.log('Version select enabled, options count:', versionSelect.options.length);
-                    }} else {{
+                    } else {
                         console.log('No series selected, disabling version select');
                         versionSelect.innerHTML = '<option value="">Select version...</option>';
                         versionSelect.disabled = true;
                         plotButton.disabled = true;
-                    }}
-                }});
+                    }
+                });
                 
                 // Handle plot button click
                 plotButton.addEventListener('click', handlePlotButtonClick);
                 
                 console.log('Event listeners setup complete');
-            }}
+            }
             
             // Handle plot button click function
-            async function handlePlotButtonClick() {{
+            async function handlePlotButtonClick() {
                 const seriesId = document.getElementById('seriesSelect').value;
                 const version = document.getElementById('versionSelect').value;
                 
-                if (!seriesId) {{
+                if (!seriesId) {
                     alert('Please select a series ID');
                     return;
-                }}
+                }
                 
-                try {{
+                try {
                     this.disabled = true;
                     this.textContent = 'Loading...';
                     
                     // Build API URL
-                    let url = `/plot?series_id=${{seriesId}}`;
-                    if (version) {{
-                        url += `&version=${{version}}`;
-                    }}
+                    let url = `/plot?series_id=${seriesId}`;
+                    if (version) {
+                        url += `&version=${version}`;
+                    }
                     
                     const response = await fetch(url);
                     const data = await response.json();
                     
-                    if (data.data_points && data.data_points.length > 0) {{
+                    if (data.data_points && data.data_points.length > 0) {
                         createChart(data);
-                    }} else {{
+                    } else {
                         document.getElementById('plotContainer').innerHTML = 
                             '<div style="color: #e74c3c;">No data points found for this series</div>';
-                    }}
-                    
-                }} catch (error) {{
+                    }
+                
+                } catch (error) {
                     console.error('Error loading plot data:', error);
                     document.getElementById('plotContainer').innerHTML = 
                         '<div style="color: #e74c3c;">Error loading plot data: ' + error.message + '</div>';
-                }} finally {{
+                } finally {
                     this.disabled = false;
                     this.textContent = 'Plot Data';
-                }}
-            }}
+                }
+            }
             
             // Create chart
-            function createChart(data) {{
+            function createChart(data) {
                 const container = document.getElementById('plotContainer');
                 
                 // Clear previous chart
-                if (chart) {{
+                if (chart) {
                     chart.destroy();
-                }}
+                }
                 
                 // Create canvas
                 container.innerHTML = '<canvas id="timeSeriesChart"></canvas>';
@@ -907,99 +1041,174 @@ async def dashboard(db: Session = Depends(get_db)):
                 const timestamps = data.data_points.map(point => new Date(point.timestamp * 1000));
                 const values = data.data_points.map(point => point.value);
                 
-                chart = new Chart(ctx, {{
+                chart = new Chart(ctx, {
                     type: 'line',
-                    data: {{
+                    data: {
                         labels: timestamps,
-                        datasets: [{{
-                            label: `${{data.series_id}} (${{data.model_version}})`,
+                        datasets: [{
+                            label: `${data.series_id} (${data.model_version})`,
                             data: values,
                             borderColor: '#3498db',
                             backgroundColor: 'rgba(52, 152, 219, 0.1)',
                             borderWidth: 2,
                             fill: true,
                             tension: 0.4
-                        }}]
-                    }},
-                    options: {{
+                        }]
+                    },
+                    options: {
                         responsive: true,
                         maintainAspectRatio: false,
-                        plugins: {{
-                            title: {{
+                        plugins: {
+                            title: {
                                 display: true,
-                                text: `Time Series: ${{data.series_id}} (Version: ${{data.model_version}})`,
-                                font: {{ size: 16, weight: 'bold' }}
-                            }},
-                            legend: {{
+                                text: `Time Series: ${data.series_id} (Version: ${data.model_version})`,
+                                font: { size: 16, weight: 'bold' }
+                            },
+                            legend: {
                                 display: true,
                                 position: 'top'
-                            }}
-                        }},
-                        scales: {{
-                            x: {{
+                            }
+                        },
+                        scales: {
+                            x: {
                                 type: 'time',
-                                time: {{
-                                    displayFormats: {{
+                                time: {
+                                    displayFormats: {
                                         minute: 'HH:mm',
                                         hour: 'MM/DD HH:mm'
-                                    }}
-                                }},
-                                title: {{
+                                    }
+                                },
+                                title: {
                                     display: true,
                                     text: 'Timestamp'
-                                }}
-                            }},
-                            y: {{
-                                title: {{
+                                }
+                            },
+                            y: {
+                                title: {
                                     display: true,
                                     text: 'Value'
-                                }}
-                            }}
-                        }},
-                        interaction: {{
+                                }
+                            }
+                        },
+                        interaction: {
                             intersect: false,
                             mode: 'index'
-                        }}
-                    }}
-                }});
-            }}
+                        }
+                    }
+                });
+            }
             
             // Auto-refresh every 30 seconds (but skip if user is interacting with plots)
-            let refreshTimer = setTimeout(function() {{
-                if (!document.getElementById('seriesSelect').value) {{
+            let refreshTimer = setTimeout(function() {
+                if (!document.getElementById('seriesSelect').value) {
                     location.reload();
-                }}
-            }}, 30000);
+                }
+            }, 30000);
         </script>
     </head>
+"""
+
+def read_dashboard_data() -> Dict[str, Any]:
+    """Query the dashboard metrics into plain values (runs in a worker thread)"""
+    now = datetime.now(timezone.utc)
+    one_day_ago_ts = int((now - timedelta(days=1)).timestamp())
+    current_hour_start = int(now.replace(minute=0, second=0, microsecond=0).timestamp())
+    
+    with get_db_session() as db:
+        # Basic metrics
+        total_models = db.query(TrainedModel).filter(TrainedModel.is_active == True).count()
+        total_predictions_today = count_predictions_since(db, one_day_ago_ts)
+        predictions_current_hour = count_predictions_since(db, current_hour_start)
+        
+        # Recent models
+        recent_models = db.query(
+            TrainedModel.series_id, TrainedModel.model_version, TrainedModel.threshold, TrainedModel.created_at
+        ).filter(
+            TrainedModel.is_active == True
+        ).order_by(TrainedModel.created_at.desc()).limit(5).all()
+        
+        # Recent predictions (ids follow insertion order and are indexed, unlike created_at)
+        recent_predictions = db.query(
+            PredictionLog.series_id, PredictionLog.value, PredictionLog.prediction,
+            PredictionLog.model_version, PredictionLog.created_at
+        ).order_by(PredictionLog.id.desc()).limit(10).all()
+        
+        # Most used models (last 24h)
+        usage_count = func.sum(PredictionRollup.prediction_count)
+        most_used_models = db.query(
+            PredictionRollup.series_id,
+            PredictionRollup.model_version,
+            usage_count.label('usage_count')
+        ).filter(
+            rollup_window(one_day_ago_ts)
+        ).group_by(
+            PredictionRollup.series_id,
+            PredictionRollup.model_version
+        ).order_by(
+            usage_count.desc()
+        ).limit(5).all()
+    
+    # Throughput metrics (last 24h)
+    avg_predictions_per_hour = total_predictions_today / 24
+    
+    return {
+        "total_models": total_models,
+        "total_predictions_today": total_predictions_today,
+        "predictions_current_hour": predictions_current_hour,
+        "avg_predictions_per_hour": avg_predictions_per_hour,
+        "current_rps_estimate": avg_predictions_per_hour / 3600,
+        "recent_models": [row._asdict() for row in recent_models],
+        "recent_predictions": [row._asdict() for row in recent_predictions],
+        "most_used_models": [{**row._asdict(), "usage_count": int(row.usage_count)} for row in most_used_models]
+    }
+
+async def read_system_health() -> List[Dict[str, Any]]:
+    """Health of the other services, checked concurrently"""
+    try:
+        async with httpx.AsyncClient() as client:
+            return await asyncio.gather(
+                get_service_health(client, "Training", TRAINING_SERVICE_URL),
+                get_service_health(client, "Inference", INFERENCE_SERVICE_URL),
+                return_exceptions=True
+            )
+    except Exception:
+        return [
+            {"service": "Training", "status": "Unknown", "details": "Health check failed"},
+            {"service": "Inference", "status": "Unknown", "details": "Health check failed"}
+        ]
+
+def render_dashboard(data: Dict[str, Any], system_health: List[Any], generated_at: datetime) -> str:
+    """Render the dashboard page of a snapshot"""
+    html_content = f"""
     <body>
         <div class="container">
             <div class="header">
                 <h1>🤖 Anomaly Detection System</h1>
                 <p>Real-time Monitoring Dashboard</p>
-                <p class="timestamp">Last updated: {now.strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+                <p class="timestamp">Last updated: {generated_at.strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
+                <p class="timestamp" id="liveMetrics">Live: connecting...</p>
             </div>
             
             <!-- Key Metrics -->
             <div class="metrics-grid">
                 <div class="metric-card">
-                    <div class="metric-value">{total_models}</div>
+                    <div class="metric-value">{data['total_models']}</div>
                     <div class="metric-label">Active Models</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{predictions_current_hour}</div>
+                    <div class="metric-value">{data['predictions_current_hour']}</div>
                     <div class="metric-label">Current Hour</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{total_predictions_today}</div>
+                    <div class="metric-value">{data['total_predictions_today']}</div>
                     <div class="metric-label">Predictions (24h)</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{avg_predictions_per_hour:.1f}</div>
+                    <div class="metric-value">{data['avg_predictions_per_hour']:.1f}</div>
                     <div class="metric-label">Avg/Hour</div>
                 </div>
                 <div class="metric-card">
-                    <div class="metric-value">{current_rps_estimate:.3f}</div>
+                    <div class="metric-value">{data['current_rps_estimate']:.3f}</div>
                     <div class="metric-label">RPS Estimate</div>
                 </div>
             </div>
@@ -1041,13 +1250,13 @@ async def dashboard(db: Session = Depends(get_db)):
                     <tbody>
     """
     
-    for model in recent_models:
-        created_dt = datetime.fromtimestamp(model.created_at, tz=timezone.utc)
+    for model in data['recent_models']:
+        created_dt = datetime.fromtimestamp(model['created_at'], tz=timezone.utc)
         html_content += f"""
                         <tr>
-                            <td><strong>{model.series_id}</strong></td>
-                            <td>{model.model_version}</td>
-                            <td>{model.threshold}</td>
+                            <td><strong>{model['series_id']}</strong></td>
+                            <td>{model['model_version']}</td>
+                            <td>{model['threshold']}</td>
                             <td class="timestamp">{created_dt.strftime('%Y-%m-%d %H:%M')}</td>
                             <td><span class="status-healthy service-status">Active</span></td>
                         </tr>
@@ -1074,16 +1283,16 @@ async def dashboard(db: Session = Depends(get_db)):
                     <tbody>
     """
     
-    for pred in recent_predictions:
-        prediction_class = "prediction-true" if pred.prediction else "prediction-false"
-        prediction_text = "ANOMALY" if pred.prediction else "NORMAL"
-        created_dt = datetime.fromtimestamp(pred.created_at, tz=timezone.utc)
+    for pred in data['recent_predictions']:
+        prediction_class = "prediction-true" if pred['prediction'] else "prediction-false"
+        prediction_text = "ANOMALY" if pred['prediction'] else "NORMAL"
+        created_dt = datetime.fromtimestamp(pred['created_at'], tz=timezone.utc)
         html_content += f"""
                         <tr>
-                            <td><strong>{pred.series_id}</strong></td>
-                            <td>{pred.value:.2f}</td>
+                            <td><strong>{pred['series_id']}</strong></td>
+                            <td>{pred['value']:.2f}</td>
                             <td class="{prediction_class}">{prediction_text}</td>
-                            <td>{pred.model_version}</td>
+                            <td>{pred['model_version']}</td>
                             <td class="timestamp">{created_dt.strftime('%Y-%m-%d %H:%M:%S')}</td>
                         </tr>
         """
@@ -1109,18 +1318,18 @@ async def dashboard(db: Session = Depends(get_db)):
                     <tbody>"""
     
     # Add most used models to HTML
-    for idx, model in enumerate(most_used_models[:5], 1):
-        usage_percentage = (model.usage_count / total_predictions_today * 100) if total_predictions_today > 0 else 0
+    for idx, model in enumerate(data['most_used_models'][:5], 1):
+        usage_percentage = (model['usage_count'] / data['total_predictions_today'] * 100) if data['total_predictions_today'] > 0 else 0
         html_content += f"""
                         <tr>
                             <td>{idx}</td>
-                            <td>{model.series_id}</td>
-                            <td>{model.model_version}</td>
-                            <td>{model.usage_count}</td>
+                            <td>{model['series_id']}</td>
+                            <td>{model['model_version']}</td>
+                            <td>{model['usage_count']}</td>
                             <td>{usage_percentage:.1f}%</td>
                         </tr>"""
     
-    if not most_used_models:
+    if not data['most_used_models']:
         html_content += """
                         <tr>
                             <td colspan="5" class="no-data">No prediction data available for the last 24h</td>
@@ -1173,7 +1382,71 @@ async def dashboard(db: Session = Depends(get_db)):
     </html>
     """
     
-    return Response(content=html_content, media_type="text/html")
+    return DASHBOARD_HEAD + html_content
+
+async def refresh_dashboard_snapshot() -> Dict[str, Any]:
+    """Recompute the dashboard and replace the served snapshot"""
+    global dashboard_snapshot
+    
+    with stage_durations["dashboard_refresh"].time():
+        data, system_health = await asyncio.gather(
+            asyncio.to_thread(read_dashboard_data),
+            read_system_health()
+        )
+        generated_at = datetime.now(timezone.utc)
+        with stage_durations["dashboard_render"].time():
+            html = render_dashboard(data, system_health, generated_at).encode()
+        dashboard_snapshot = {
+            "html": html,
+            "generated_at": generated_at.timestamp()
+        }
+    return dashboard_snapshot
+
+def dashboard_snapshot_is_stale(snapshot: Optional[Dict[str, Any]]) -> bool:
+    """Whether a snapshot is missing or missed background refreshes (e.g. while the dashboard was idle)"""
+    return snapshot is None or time.time() - snapshot["generated_at"] > 2 * DASHBOARD_REFRESH_SECONDS
+
+async def refresh_dashboard_periodically() -> None:
+    """Keep the dashboard snapshot fresh while the dashboard is being viewed"""
+    while True:
+        if time.time() - last_dashboard_request_at < DASHBOARD_IDLE_SECONDS:
+            try:
+                async with dashboard_refresh_lock:
+                    await refresh_dashboard_snapshot()
+            except Exception as e:
+                logger.warning(f"Dashboard refresh failed: {e}")
+        await asyncio.sleep(DASHBOARD_REFRESH_SECONDS)
+
+@app.get("/dashboard", response_class=Response)
+async def dashboard():
+    """
+    Serves the HTML monitoring dashboard from the in-memory snapshot.
+    
+    The snapshot is rebuilt every DASHBOARD_REFRESH_SECONDS by a background
+    task while the dashboard was requested within DASHBOARD_IDLE_SECONDS, so
+    renders don't touch the database; the first request after an idle period
+    rebuilds it inline. Its age is reported in the X-Dashboard-Generated-At
+    and X-Dashboard-Age-Seconds headers.
+    """
+    global last_dashboard_request_at
+    last_dashboard_request_at = time.time()
+    
+    snapshot = dashboard_snapshot
+    if dashboard_snapshot_is_stale(snapshot):
+        async with dashboard_refresh_lock:
+            snapshot = dashboard_snapshot
+            if dashboard_snapshot_is_stale(snapshot):
+                snapshot = await refresh_dashboard_snapshot()
+    
+    age_seconds = max(0.0, datetime.now(timezone.utc).timestamp() - snapshot["generated_at"])
+    return Response(
+        content=snapshot["html"],
+        media_type="text/html",
+        headers={
+            "X-Dashboard-Generated-At": str(int(snapshot["generated_at"])),
+            "X-Dashboard-Age-Seconds": f"{age_seconds:.1f}"
+        }
+    )
 
 if __name__ == "__main__":
     import uvicorn
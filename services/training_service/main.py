@@ -1,21 +1,506 @@
 """
 Training Service - Responsible for model training and persistence
 """
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 from shared.models.anomaly import (
     AnomalyTrainRequest, 
     AnomalyTrainResponse,
+    AnomalyRetrainRequest,
+    AnomalyRetrainResponse,
+    AnomalyBatchTrainRequest,
+    AnomalyBatchTrainResult,
+    AnomalyBatchTrainResponse,
+    AnomalyTrainJobResponse,
+    AnomalyTrainJobStatus,
     AnomalyDetectionModel
 )
-from shared.database.database import get_db
-from shared.database.models import TrainedModel, TrainingData
+from shared.core import TimeSeries, PreflightError, StreamingPreflight, run_preflight
+from shared.database.database import get_db, get_db_session
+from shared.jobs import JobQueue, JobQueueFullError
+from shared.ingest import SeriesChunkParser
+from shared.database.models import TrainedModel, TrainingData, TrainingDataChunk, ModelVersionCounter
+from shared.database.series_codec import encode_series, series_digest, SeriesDigest
+from shared.database.latency_sketches import LATENCY_SKETCH_PERSIST_ENABLED, persist_latency_sketches_periodically
+from shared.metrics import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, RequestMetricsMiddleware, WindowedLatencySketch
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+import asyncio
 import json
 import os
+import time
+import numpy as np
 
-app = FastAPI(title="Training Service")
+# Batch training limits and worker pool (NumPy releases the GIL for the heavy array work)
+TRAINING_BATCH_MAX_SERIES = int(os.getenv("TRAINING_BATCH_MAX_SERIES", 1000))
+TRAINING_WORKERS = int(os.getenv("TRAINING_WORKERS", os.cpu_count() or 4))
 
+# Asynchronous training jobs (POST /fit/{series_id}/async)
+TRAINING_JOB_WORKERS = int(os.getenv("TRAINING_JOB_WORKERS", 2))
+TRAINING_JOB_MAX_PENDING = int(os.getenv("TRAINING_JOB_MAX_PENDING", 100))
+TRAINING_JOB_RETENTION = int(os.getenv("TRAINING_JOB_RETENTION", 1000))
+
+# Streaming uploads (POST /fit/{series_id}/stream): points parsed and stored per chunk
+TRAINING_STREAM_CHUNK_POINTS = int(os.getenv("TRAINING_STREAM_CHUNK_POINTS", 100000))
+STREAM_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv"
+}
+
+# Re-submitting the data and threshold of any stored version of a series returns that version
+# without training again, re-activating it if another version is active (also for /retrain thresholds)
+TRAINING_DEDUP_ENABLED = os.getenv("TRAINING_DEDUP_ENABLED", "true").lower() == "true"
+
+# Hourly training latency sketches of the last day (percentiles without reading trained_models),
+# periodically persisted so monitoring can merge them across instances
+latency_sketches = {
+    "training_latency_ms": WindowedLatencySketch(bucket_seconds=3600, retention_buckets=24)
+}
+
+training_executor = ThreadPoolExecutor(max_workers=TRAINING_WORKERS, thread_name_prefix="training")
+training_jobs = JobQueue(
+    workers=TRAINING_JOB_WORKERS,
+    max_pending=TRAINING_JOB_MAX_PENDING,
+    retention=TRAINING_JOB_RETENTION,
+    executor=training_executor
+)
+
+# Prometheus metrics (GET /metrics), collected in-process per request stage
+TRAINING_STAGE_DURATION = Histogram(
+    "training_stage_duration_seconds",
+    "Time spent in each stage of training requests",
+    ("stage",)
+)
+stage_durations = {
+    stage: TRAINING_STAGE_DURATION.labels(stage)
+    for stage in ("parse", "fit", "db_write")
+}
+TRAINING_JOBS_ACTIVE = Gauge(
+    "training_jobs_active",
+    "Asynchronous training jobs waiting or running",
+    ("state",)
+)
+TRAINING_JOBS = Counter(
+    "training_jobs_total",
+    "Asynchronous training jobs by outcome (submitted, rejected, succeeded, failed)",
+    ("result",)
+)
+TRAINING_JOBS_ACTIVE.labels("pending").set_function(lambda: training_jobs.pending)
+TRAINING_JOBS_ACTIVE.labels("in_progress").set_function(lambda: training_jobs.get_stats()["in_progress"])
+# JobQueue outcome counts only grow, as counters require
+for _result in ("submitted", "rejected", "succeeded", "failed"):
+    TRAINING_JOBS.labels(_result).set_function(lambda result=_result: getattr(training_jobs, result))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the training job workers and latency sketch persistence, and release the worker pool on shutdown"""
+    if LATENCY_SKETCH_PERSIST_ENABLED:
+        sketch_persister = asyncio.create_task(persist_latency_sketches_periodically("training", latency_sketches))
+    else:
+        sketch_persister = None
+    await training_jobs.start()
+    try:
+        yield
+    finally:
+        if sketch_persister is not None:
+            sketch_persister.cancel()
+        await training_jobs.stop()
+        training_executor.shutdown(wait=False, cancel_futures=True)
+
+app = FastAPI(title="Training Service", lifespan=lifespan)
+app.add_middleware(RequestMetricsMiddleware)
+
+def train_series(timestamps: List[int], values: List[float], threshold: float) -> Tuple[AnomalyDetectionModel, dict, float]:
+    """Validate and fit one series.
+    
+    Returns the trained model, its training statistics and the training latency in ms.
+    """
+    training_start = time.time()
+    
+    # Preflight validation of the raw arrays in one vectorized stage
+    timestamps_array = np.asarray(timestamps, dtype=np.int64)
+    values_array = np.asarray(values, dtype=np.float64)
+    preflight = run_preflight(timestamps_array, values_array)
+    preflight.raise_for_errors()
+    
+    # Convert to TimeSeries (reusing the preflight report)
+    time_series = TimeSeries.from_arrays(timestamps_array, values_array, preflight=preflight)
+    
+    model = AnomalyDetectionModel(threshold=threshold)
+    model.fit(time_series)
+    training_latency_ms = (time.time() - training_start) * 1000
+    stage_durations["fit"].observe(training_latency_ms / 1000)
+    
+    # Statistics are computed on the series' columnar arrays
+    training_stats = time_series.get_statistics()
+    training_stats["preflight"] = preflight.to_dict()
+    
+    return model, training_stats, training_latency_ms
+
+def allocate_versions(db: Session, series_ids: List[str]) -> Dict[str, int]:
+    """Allocate the next version number of each series.
+    
+    A single upsert increments each series' counter row and returns the new
+    values. The row locks it takes are held until the transaction ends, so
+    concurrent trainings of the same series get distinct versions.
+    """
+    # Lock counter rows in a consistent order to avoid deadlocks between batches
+    ordered_ids = sorted(set(series_ids))
+    now = int(time.time())
+    
+    statement = pg_insert(ModelVersionCounter).values(
+        [{"series_id": series_id, "last_version": 1, "updated_at": now} for series_id in ordered_ids]
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[ModelVersionCounter.series_id],
+        set_={
+            "last_version": ModelVersionCounter.last_version + 1,
+            "updated_at": now
+        }
+    ).returning(ModelVersionCounter.series_id, ModelVersionCounter.last_version)
+    
+    return {series_id: last_version for series_id, last_version in db.execute(statement)}
+
+def lock_series_versions(db: Session, series_ids: List[str]) -> None:
+    """Lock the version counter rows of the series until the transaction ends.
+    
+    Trainings hold the same row locks from allocate_versions until they commit,
+    so changes of a series' active version are serialized.
+    """
+    db.query(ModelVersionCounter.series_id).filter(
+        ModelVersionCounter.series_id.in_(sorted(set(series_ids)))
+    ).order_by(ModelVersionCounter.series_id).with_for_update().all()
+
+def find_duplicate_versions(db: Session, training_hashes: Dict[str, str]) -> Dict[str, Tuple[int, str, bool]]:
+    """Existing versions whose training hash matches, by series.
+    
+    training_hashes maps series_id -> hash of the data and threshold being submitted.
+    Returns series_id -> (id, model_version, is_active), preferring the active
+    version and then the newest one.
+    """
+    models = db.query(
+        TrainedModel.id, TrainedModel.series_id, TrainedModel.model_version,
+        TrainedModel.training_hash, TrainedModel.is_active
+    ).filter(
+        TrainedModel.series_id.in_(list(training_hashes)),
+        TrainedModel.training_hash.in_(set(training_hashes.values()))
+    ).order_by(TrainedModel.is_active, TrainedModel.id).all()
+    
+    # Later rows win: the active version, else the highest id
+    return {
+        series_id: (model_id, model_version, bool(is_active))
+        for model_id, series_id, model_version, training_hash, is_active in models
+        if training_hash == training_hashes[series_id]
+    }
+
+def activate_versions(db: Session, model_ids: Dict[str, int]) -> None:
+    """Make existing versions (series_id -> TrainedModel.id) the active ones of their series"""
+    lock_series_versions(db, list(model_ids))
+    deactivate_models(db, list(model_ids))
+    # updated_at lets the inference service's watermark poller notice the switch
+    db.query(TrainedModel).filter(
+        TrainedModel.id.in_(list(model_ids.values()))
+    ).update({"is_active": True, "updated_at": int(time.time())}, synchronize_session=False)
+
+def reuse_duplicates(db: Session, training_hashes: Dict[str, str]) -> Dict[str, str]:
+    """Versions already trained on the same data and threshold, by series.
+    
+    Matching versions that are no longer active are re-activated in the
+    session; the caller commits. Returns nothing when deduplication is disabled.
+    """
+    if not TRAINING_DEDUP_ENABLED or not training_hashes:
+        return {}
+    
+    duplicates = find_duplicate_versions(db, training_hashes)
+    inactive = {
+        series_id: model_id
+        for series_id, (model_id, _, is_active) in duplicates.items()
+        if not is_active
+    }
+    if inactive:
+        activate_versions(db, inactive)
+    return {series_id: model_version for series_id, (_, model_version, _) in duplicates.items()}
+
+def trained_model_row(
+    series_id: str,
+    model_version: str,
+    model: AnomalyDetectionModel,
+    training_stats: dict,
+    training_latency_ms: float,
+    training_hash: Optional[str] = None
+) -> dict:
+    """Column values of a TrainedModel row.
+    
+    Every trained version goes through here, so this also records its training latency.
+    """
+    latency_sketches["training_latency_ms"].add(training_latency_ms)
+    return {
+        "series_id": series_id,
+        "model_type": "anomaly_detection",
+        "mean": model.mean,
+        "std": model.std,
+        "threshold": model.threshold,
+        "model_version": model_version,
+        "training_points": training_stats["count"],
+        "training_data_stats": training_stats,
+        "training_latency_ms": training_latency_ms,
+        "training_hash": training_hash
+    }
+
+def training_data_row(series_id: str, model_version: str, model: AnomalyDetectionModel) -> dict:
+    """Column values of a TrainingData row, encoded from the model's training series"""
+    time_series = model.get_training_data_copy()
+    return {
+        "series_id": series_id,
+        "model_version": model_version,
+        "encoded_data": encode_series(time_series.get_timestamps_array(), time_series.get_values_array()),
+        "data_points_count": time_series.length
+    }
+
+def deactivate_models(db: Session, series_ids: List[str]) -> None:
+    """Mark previous models as inactive for inference (but keep for history)"""
+    db.query(TrainedModel).filter(
+        TrainedModel.series_id.in_(series_ids),
+        TrainedModel.is_active == True
+    ).update({"is_active": False}, synchronize_session=False)
+
+def save_trained_model(
+    db: Session,
+    series_id: str,
+    model: AnomalyDetectionModel,
+    training_stats: dict,
+    training_latency_ms: float,
+    training_hash: Optional[str] = None
+) -> str:
+    """Add a new model version and its training data to the session, returning the version"""
+    model_version = f"v{allocate_versions(db, [series_id])[series_id]}"
+    
+    # 1. Save model parameters to database
+    db_model = TrainedModel(
+        **trained_model_row(series_id, model_version, model, training_stats, training_latency_ms, training_hash)
+    )
+    deactivate_models(db, [series_id])
+    db.add(db_model)
+    
+    # 2. Save training data to database
+    training_data = TrainingData(
+        **training_data_row(series_id, model_version, model)
+    )
+    db.add(training_data)
+    
+    return model_version
+
+def run_training_job(series_id: str, request: AnomalyTrainRequest) -> dict:
+    """Train and persist one series - runs on a job worker"""
+    training_hash = series_digest(request.timestamps, request.values, request.threshold)
+    
+    with get_db_session() as db:
+        duplicate_version = reuse_duplicates(db, {series_id: training_hash}).get(series_id)
+        if duplicate_version is not None:
+            return AnomalyTrainResponse(
+                series_id=series_id,
+                model_version=duplicate_version,
+                points_used=len(request.timestamps),
+                deduplicated=True
+            ).model_dump()
+        
+        model, training_stats, training_latency_ms = train_series(
+            request.timestamps, request.values, request.threshold
+        )
+        model_version = save_trained_model(
+            db, series_id, model, training_stats, training_latency_ms, training_hash
+        )
+    
+    return AnomalyTrainResponse(
+        series_id=series_id,
+        model_version=model_version,
+        points_used=len(request.timestamps)
+    ).model_dump()
+
+def allocate_stream_version(series_id: str) -> str:
+    """Allocate the version of a streamed upload up front so its chunks can be stored as they arrive"""
+    with get_db_session() as db:
+        return f"v{allocate_versions(db, [series_id])[series_id]}"
+
+def store_training_chunk(series_id: str, model_version: str, chunk_index: int, timestamps: np.ndarray, values: np.ndarray) -> None:
+    """Persist one chunk of a streamed upload"""
+    with get_db_session() as db:
+        db.add(TrainingDataChunk(
+            series_id=series_id,
+            model_version=model_version,
+            chunk_index=chunk_index,
+            encoded_data=encode_series(timestamps, values),
+            data_points_count=len(timestamps)
+        ))
+
+def delete_training_chunks(series_id: str, model_version: str) -> None:
+    """Drop the chunks of a failed streamed upload"""
+    with get_db_session() as db:
+        db.query(TrainingDataChunk).filter(
+            TrainingDataChunk.series_id == series_id,
+            TrainingDataChunk.model_version == model_version
+        ).delete(synchronize_session=False)
+
+def reuse_duplicate_version(series_id: str, training_hash: str) -> Optional[str]:
+    """Version of the series trained on the same data and threshold, re-activated if needed"""
+    with get_db_session() as db:
+        return reuse_duplicates(db, {series_id: training_hash}).get(series_id)
+
+def save_streamed_model(
+    series_id: str,
+    model_version: str,
+    model: AnomalyDetectionModel,
+    training_stats: dict,
+    training_latency_ms: float,
+    training_hash: Optional[str] = None
+) -> None:
+    """Register the model of a streamed upload once all chunks are stored.
+    
+    The version was allocated (and its counter lock released) when the upload
+    started, so the counter row is locked again before switching the active model.
+    """
+    with get_db_session() as db:
+        lock_series_versions(db, [series_id])
+        deactivate_models(db, [series_id])
+        db.add(TrainedModel(
+            **trained_model_row(series_id, model_version, model, training_stats, training_latency_ms, training_hash)
+        ))
+        # Points live in training_data_chunks
+        db.add(TrainingData(
+            series_id=series_id,
+            model_version=model_version,
+            data_points_count=training_stats["count"]
+        ))
+
+@app.post("/fit/batch")
+async def fit_batch(
+    request: AnomalyBatchTrainRequest,
+    db: Session = Depends(get_db)
+) -> AnomalyBatchTrainResponse:
+    """Train many series at once.
+    
+    Series are fitted in parallel on the worker pool, then all versions are
+    allocated and all rows persisted with a few bulk statements in one commit.
+    Invalid series are reported per item without failing the batch.
+    """
+    try:
+        request.validate_common_constraints()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    if len(request.items) > TRAINING_BATCH_MAX_SERIES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch contains {len(request.items)} series (maximum {TRAINING_BATCH_MAX_SERIES})"
+        )
+    
+    results: List[AnomalyBatchTrainResult] = [None] * len(request.items)
+    
+    # Each series can only be trained once per batch
+    fit_indexes = []
+    seen_series = set()
+    for index, item in enumerate(request.items):
+        if item.series_id in seen_series:
+            results[index] = AnomalyBatchTrainResult(series_id=item.series_id, error="Duplicate series_id in batch")
+        else:
+            seen_series.add(item.series_id)
+            fit_indexes.append(index)
+    
+    def hash_item(index: int) -> str:
+        item = request.items[index]
+        return series_digest(item.timestamps, item.values, item.threshold)
+    
+    def fit_item(index: int):
+        item = request.items[index]
+        item.validate_common_constraints()
+        return train_series(item.timestamps, item.values, item.threshold)
+    
+    # Hash on the worker pool and reuse versions trained on the same data and threshold
+    loop = asyncio.get_running_loop()
+    hashes = await asyncio.gather(
+        *(loop.run_in_executor(training_executor, hash_item, index) for index in fit_indexes),
+        return_exceptions=True
+    )
+    # Series that can't be hashed fail validation during the fit below
+    training_hashes = {
+        index: training_hash
+        for index, training_hash in zip(fit_indexes, hashes)
+        if isinstance(training_hash, str)
+    }
+    try:
+        duplicates = reuse_duplicates(
+            db, {request.items[index].series_id: training_hash for index, training_hash in training_hashes.items()}
+        )
+        # Release the counter locks of re-activated series before allocating versions
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    for index in fit_indexes:
+        item = request.items[index]
+        if item.series_id in duplicates:
+            results[index] = AnomalyBatchTrainResult(
+                series_id=item.series_id,
+                model_version=duplicates[item.series_id],
+                points_used=len(item.timestamps),
+                deduplicated=True
+            )
+    fit_indexes = [index for index in fit_indexes if results[index] is None]
+    
+    # Fit on the worker pool
+    outcomes = await asyncio.gather(
+        *(loop.run_in_executor(training_executor, fit_item, index) for index in fit_indexes),
+        return_exceptions=True
+    )
+    
+    fitted = []
+    for index, outcome in zip(fit_indexes, outcomes):
+        if isinstance(outcome, Exception):
+            results[index] = AnomalyBatchTrainResult(series_id=request.items[index].series_id, error=str(outcome))
+        else:
+            fitted.append((index, outcome))
+    
+    if fitted:
+        try:
+            series_ids = [request.items[index].series_id for index, _ in fitted]
+            next_versions = allocate_versions(db, series_ids)
+            
+            model_rows = []
+            data_rows = []
+            for index, (model, training_stats, training_latency_ms) in fitted:
+                item = request.items[index]
+                model_version = f"v{next_versions[item.series_id]}"
+                model_rows.append(trained_model_row(
+                    item.series_id, model_version, model, training_stats, training_latency_ms, training_hashes.get(index)
+                ))
+                data_rows.append(training_data_row(item.series_id, model_version, model))
+                results[index] = AnomalyBatchTrainResult(
+                    series_id=item.series_id,
+                    model_version=model_version,
+                    points_used=len(item.timestamps)
+                )
+            
+            with stage_durations["db_write"].time():
+                deactivate_models(db, series_ids)
+                db.execute(insert(TrainedModel), model_rows)
+                db.execute(insert(TrainingData), data_rows)
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    error_count = sum(1 for result in results if result.error is not None)
+    return AnomalyBatchTrainResponse(
+        results=results,
+        trained_count=len(results) - error_count,
+        error_count=error_count
+    )
 
 @app.post("/fit/{series_id}")
 async def fit_model(
@@ -24,104 +509,348 @@ async def fit_model(
     db: Session = Depends(get_db)
 ) -> AnomalyTrainResponse:
     """Train a new model or update existing one"""
+    try:
+        # Identical data and threshold as an existing version: (re-)activate and return it
+        training_hash = series_digest(request.timestamps, request.values, request.threshold)
+        duplicate_version = reuse_duplicates(db, {series_id: training_hash}).get(series_id)
+        if duplicate_version is not None:
+            db.commit()
+            return AnomalyTrainResponse(
+                series_id=series_id,
+                model_version=duplicate_version,
+                points_used=len(request.timestamps),
+                deduplicated=True
+            )
+        
+        # Create and train model (measure actual training time)
+        model, training_stats, training_latency_ms = train_series(
+            request.timestamps, request.values, request.threshold
+        )
+        
+        # Allocate the next version and save model parameters and training data
+        model_version = save_trained_model(
+            db, series_id, model, training_stats, training_latency_ms, training_hash
+        )
+        with stage_durations["db_write"].time():
+            db.commit()
+        
+        # Model parameters saved to database only
+        # Inference service will cache them when needed
+        
+        return AnomalyTrainResponse(
+            series_id=series_id,
+            model_version=model_version,
+            points_used=len(request.timestamps)
+        )
+    
+    except PreflightError as e:
+        db.rollback()
+        # Return the structured report so callers see every issue at once
+        raise HTTPException(status_code=422, detail={"message": str(e), "preflight": e.report.to_dict()})
+    except ValueError as e:
+        db.rollback()
+        # Validation errors should return 422
+        raise HTTPException(status_code=422, detail=str(e))
+    except HTTPException:
+        db.rollback()
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/fit/{series_id}/stream")
+async def fit_model_stream(
+    series_id: str,
+    request: Request,
+    threshold: float = 3.0,
+    format: Optional[str] = None
+) -> AnomalyTrainResponse:
+    """Train from a streamed NDJSON or CSV upload with bounded memory.
+    
+    The body is parsed chunk by chunk as it arrives; each chunk updates the
+    running mean/std and preflight counters and is stored in binary form
+    right away. The format comes from `format` or the Content-Type header.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = format or STREAM_CONTENT_TYPES.get(content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported content type '{content_type}' (use {', '.join(STREAM_CONTENT_TYPES)} or the format parameter)"
+        )
+    if threshold <= 0:
+        raise HTTPException(status_code=422, detail="Threshold must be positive")
+    try:
+        parser = SeriesChunkParser(fmt, chunk_points=TRAINING_STREAM_CHUNK_POINTS)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     
-    # Start timing for training latency
-    import time
     training_start = time.time()
+    model_version = await asyncio.to_thread(allocate_stream_version, series_id)
+    stats = StreamingPreflight()
+    digest = SeriesDigest()
+    chunk_index = 0
+    
+    async def consume(chunks) -> None:
+        nonlocal chunk_index
+        for timestamps, values in chunks:
+            stats.update(timestamps, values)
+            digest.update(timestamps, values)
+            await asyncio.to_thread(store_training_chunk, series_id, model_version, chunk_index, timestamps, values)
+            chunk_index += 1
     
     try:
-        # Convert request to TimeSeries
-        time_series = request.to_time_series()
+        async for data in request.stream():
+            await consume(parser.feed(data))
+        await consume(parser.close())
         
-        # Create and train model (measure actual training time)
-        model = AnomalyDetectionModel(threshold=request.threshold)
-        model_training_start = time.time()
-        model.fit(time_series)
+        report = stats.report()
+        report.raise_for_errors()
+        
+        # The upload repeats an existing version's data: drop the stored chunks and reuse it
+        training_hash = digest.hexdigest(threshold)
+        duplicate_version = await asyncio.to_thread(reuse_duplicate_version, series_id, training_hash)
+        if duplicate_version is not None:
+            await asyncio.to_thread(delete_training_chunks, series_id, model_version)
+            return AnomalyTrainResponse(
+                series_id=series_id,
+                model_version=duplicate_version,
+                points_used=stats.count,
+                deduplicated=True
+            )
+        
+        model = AnomalyDetectionModel.from_statistics(stats.mean, stats.std, threshold)
         training_latency_ms = (time.time() - training_start) * 1000
+        training_stats = stats.get_statistics()
+        training_stats["preflight"] = report.to_dict()
         
-        # Determine next version number for this series by finding the highest version
-        all_versions = db.query(TrainedModel).filter(
-            TrainedModel.series_id == series_id
-        ).all()
-        
-        max_version_num = 0
-        for model in all_versions:
-            if model.model_version.startswith('v'):
-                try:
-                    version_num = int(model.model_version[1:])
-                    max_version_num = max(max_version_num, version_num)
-                except ValueError:
-                    continue
-        
-        next_version_num = max_version_num + 1
-        model_version = f"v{next_version_num}"
-        
-        # 1. Save model parameters to database
-        # Create statistics dictionary manually
-        training_stats = {
-            "count": len(request.timestamps),
-            "mean": model.mean,
-            "std": model.std,
-            "min": min(request.values),
-            "max": max(request.values),
-            "start_time": min(request.timestamps),
-            "end_time": max(request.timestamps)
-        }
+        await asyncio.to_thread(
+            save_streamed_model, series_id, model_version, model, training_stats, training_latency_ms, training_hash
+        )
         
-        db_model = TrainedModel(
+        return AnomalyTrainResponse(
             series_id=series_id,
-            model_type="anomaly_detection",
-            mean=model.mean,
-            std=model.std,
-            threshold=model.threshold,
             model_version=model_version,
-            training_points=len(request.timestamps),
-            training_data_stats=training_stats,
-            training_latency_ms=training_latency_ms
+            points_used=stats.count
         )
+    
+    except PreflightError as e:
+        await asyncio.to_thread(delete_training_chunks, series_id, model_version)
+        raise HTTPException(status_code=422, detail={"message": str(e), "preflight": e.report.to_dict()})
+    except ValueError as e:
+        await asyncio.to_thread(delete_training_chunks, series_id, model_version)
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        await asyncio.to_thread(delete_training_chunks, series_id, model_version)
+        raise HTTPException(status_code=500, detail=str(e))
+
+def parse_csv_upload(body: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a whole `timestamp,value` CSV body into timestamp and value arrays"""
+    parser = SeriesChunkParser("csv", chunk_points=TRAINING_STREAM_CHUNK_POINTS)
+    with stage_durations["parse"].time():
+        chunks = parser.feed(body) + parser.close()
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    return (
+        np.concatenate([timestamps for timestamps, _ in chunks]),
+        np.concatenate([values for _, values in chunks])
+    )
+
+@app.post("/fit/{series_id}/csv")
+async def fit_model_csv(
+    series_id: str,
+    request: Request,
+    threshold: float = 3.0,
+    db: Session = Depends(get_db)
+) -> AnomalyTrainResponse:
+    """Train from a `timestamp,value` CSV upload.
+    
+    Timestamps may be Unix seconds or datetimes such as `2011-07-01 00:00:01`
+    (UTC); whole columns are converted at once, with no per-row parsing.
+    """
+    if threshold <= 0:
+        raise HTTPException(status_code=422, detail="Threshold must be positive")
+    
+    try:
+        body = await request.body()
+        timestamps, values = await asyncio.to_thread(parse_csv_upload, body)
         
-        # Mark previous models as inactive for inference (but keep for history)
-        if all_versions:
-            db.query(TrainedModel).filter(
-                TrainedModel.series_id == series_id,
-                TrainedModel.is_active == True
-            ).update({"is_active": False})
+        training_hash = await asyncio.to_thread(series_digest, timestamps, values, threshold)
+        duplicate_version = reuse_duplicates(db, {series_id: training_hash}).get(series_id)
+        if duplicate_version is not None:
+            db.commit()
+            return AnomalyTrainResponse(
+                series_id=series_id,
+                model_version=duplicate_version,
+                points_used=len(timestamps),
+                deduplicated=True
+            )
         
-        db.add(db_model)
+        model, training_stats, training_latency_ms = await asyncio.to_thread(
+            train_series, timestamps, values, threshold
+        )
+        
+        model_version = save_trained_model(
+            db, series_id, model, training_stats, training_latency_ms, training_hash
+        )
+        with stage_durations["db_write"].time():
+            db.commit()
         
-        # 2. Save training data to database
-        training_data = TrainingData(
+        return AnomalyTrainResponse(
             series_id=series_id,
             model_version=model_version,
-            timestamps=request.timestamps,
-            values=request.values,
-            data_points_count=len(request.timestamps)
+            points_used=len(timestamps)
         )
+    
+    except PreflightError as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail={"message": str(e), "preflight": e.report.to_dict()})
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/fit/{series_id}/async", status_code=202)
+async def fit_model_async(series_id: str, request: AnomalyTrainRequest) -> AnomalyTrainJobResponse:
+    """Queue training of a series and return a job to poll with GET /jobs/{job_id}"""
+    try:
+        job = training_jobs.submit(run_training_job, series_id, request, metadata={"series_id": series_id})
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return AnomalyTrainJobResponse(job_id=job.job_id, series_id=series_id, status=job.status)
+
+def find_threshold_version(
+    db: Session,
+    source: TrainedModel,
+    source_data: Optional[TrainingData],
+    threshold: float
+) -> Optional[TrainedModel]:
+    """Version with the given threshold that shares the source version's training data.
+    
+    Retrained versions reuse the statistics of the version holding the points,
+    so any of them with the same threshold is the model a retrain would create.
+    Prefers the active version, then the newest one.
+    """
+    if not TRAINING_DEDUP_ENABLED:
+        return None
+    if source_data is None:
+        return source if source.threshold == threshold else None
+    
+    # The version that actually holds the points, and every version retrained from it
+    data_version = source_data.source_model_version or source.model_version
+    return db.query(TrainedModel).join(
+        TrainingData,
+        (TrainingData.series_id == TrainedModel.series_id)
+        & (TrainingData.model_version == TrainedModel.model_version)
+    ).filter(
+        TrainedModel.series_id == source.series_id,
+        TrainedModel.threshold == threshold,
+        (TrainingData.model_version == data_version) | (TrainingData.source_model_version == data_version)
+    ).order_by(TrainedModel.is_active.desc(), TrainedModel.id.desc()).first()
+
+@app.post("/retrain/{series_id}")
+async def retrain_model(
+    series_id: str,
+    request: AnomalyRetrainRequest,
+    db: Session = Depends(get_db)
+) -> AnomalyRetrainResponse:
+    """Register a new version with another threshold from a stored version's statistics.
+    
+    The source version's mean and std are reused, so no training data is sent,
+    loaded or copied; the new version's training data row points at the
+    points already stored for the source.
+    """
+    try:
+        request.validate_common_constraints()
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    query = db.query(TrainedModel).filter(TrainedModel.series_id == series_id)
+    if request.model_version is not None:
+        query = query.filter(TrainedModel.model_version == request.model_version)
+    else:
+        query = query.filter(TrainedModel.is_active == True)
+    source = query.order_by(TrainedModel.id.desc()).first()
+    if source is None:
+        version_label = request.model_version or "active"
+        raise HTTPException(status_code=404, detail=f"No {version_label} model found for series {series_id}")
+    
+    try:
+        source_data = db.query(TrainingData).filter(
+            TrainingData.series_id == series_id,
+            TrainingData.model_version == source.model_version
+        ).first()
         
-        db.add(training_data)
-        db.commit()
+        # A version with this threshold on the same training data already exists: (re-)activate it
+        duplicate = find_threshold_version(db, source, source_data, request.threshold)
+        if duplicate is not None:
+            if not duplicate.is_active:
+                activate_versions(db, {series_id: duplicate.id})
+                with stage_durations["db_write"].time():
+                    db.commit()
+            return AnomalyRetrainResponse(
+                series_id=series_id,
+                model_version=duplicate.model_version,
+                points_used=duplicate.training_points,
+                deduplicated=True,
+                source_model_version=source.model_version
+            )
         
-        # Model parameters saved to database only
-        # Inference service will cache them when needed
+        retrain_start = time.time()
+        model = AnomalyDetectionModel.from_statistics(source.mean, source.std, request.threshold)
         
-        return AnomalyTrainResponse(
+        training_stats = dict(source.training_data_stats or {})
+        training_stats.setdefault("count", source.training_points)
+        training_stats["retrained_from"] = source.model_version
+        
+        model_version = f"v{allocate_versions(db, [series_id])[series_id]}"
+        deactivate_models(db, [series_id])
+        db.add(TrainedModel(
+            **trained_model_row(series_id, model_version, model, training_stats, (time.time() - retrain_start) * 1000)
+        ))
+        if source_data is not None:
+            db.add(TrainingData(
+                series_id=series_id,
+                model_version=model_version,
+                data_points_count=source_data.data_points_count,
+                # Point at the version that actually holds the data, not at another retrained one
+                source_model_version=source_data.source_model_version or source.model_version
+            ))
+        with stage_durations["db_write"].time():
+            db.commit()
+        
+        return AnomalyRetrainResponse(
             series_id=series_id,
             model_version=model_version,
-            points_used=len(request.timestamps)
+            points_used=source.training_points,
+            source_model_version=source.model_version
         )
-        
+    
     except ValueError as e:
         db.rollback()
-        # Validation errors should return 422
         raise HTTPException(status_code=422, detail=str(e))
-    except HTTPException:
-        db.rollback()
-        # Re-raise HTTP exceptions
-        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> AnomalyTrainJobStatus:
+    """Get the status and result of a training job"""
+    job = training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    
+    return AnomalyTrainJobStatus(**job.to_dict())
+
+@app.get("/metrics", response_class=Response)
+async def metrics():
+    """Prometheus metrics of this instance (text exposition format)"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/healthcheck")
 async def healthcheck(db: Session = Depends(get_db)):
     import time
@@ -134,25 +863,10 @@ async def healthcheck(db: Session = Depends(get_db)):
         # Recent training activity (last 24h)
         import time
         yesterday = int(time.time()) - 86400
-        recent_models_query = db.query(TrainedModel).filter(TrainedModel.created_at >= yesterday)
-        recent_models = recent_models_query.count()
-        
-        # Calculate training latency metrics from recent models
-        recent_models_with_latency = recent_models_query.filter(
-            TrainedModel.training_latency_ms.isnot(None)
-        ).all()
+        recent_models = db.query(TrainedModel).filter(TrainedModel.created_at >= yesterday).count()
         
-        avg_training_latency = 0
-        p95_training_latency = 0
-        
-        if recent_models_with_latency:
-            training_latencies = [m.training_latency_ms for m in recent_models_with_latency if m.training_latency_ms]
-            
-            if training_latencies:
-                avg_training_latency = sum(training_latencies) / len(training_latencies)
-                training_latencies.sort()
-                p95_index = int(len(training_latencies) * 0.95)
-                p95_training_latency = training_latencies[p95_index] if p95_index < len(training_latencies) else training_latencies[-1]
+        # Latency percentiles of this instance from the in-memory sketches
+        training_latency = latency_sketches["training_latency_ms"].merged(86400).summary()
         
         return {
             "service": "training",
@@ -163,8 +877,11 @@ async def healthcheck(db: Session = Depends(get_db)):
                 "total_models": total_models,
                 "active_models": active_models,
                 "models_trained_24h": recent_models,
-                "avg_training_latency_ms": round(avg_training_latency, 2),
-                "p95_training_latency_ms": round(p95_training_latency, 2)
+                "avg_training_latency_ms": training_latency["avg"] or 0,
+                "p50_training_latency_ms": training_latency["p50"] or 0,
+                "p95_training_latency_ms": training_latency["p95"] or 0,
+                "p99_training_latency_ms": training_latency["p99"] or 0,
+                "training_jobs": training_jobs.get_stats()
             }
         }
     except Exception as e:
@@ -0,0 +1,17 @@
+"""
+In-process caching utilities shared by the services.
+"""
+
+from .lru_cache import LRUCache, CacheStats
+from .redis_cache import AsyncRedisCache, create_async_redis
+from .single_flight import SingleFlight
+from .bloom_filter import BloomFilter
+
+__all__ = [
+    "LRUCache",
+    "CacheStats",
+    "AsyncRedisCache",
+    "create_async_redis",
+    "SingleFlight",
+    "BloomFilter"
+]
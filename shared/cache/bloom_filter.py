@@ -0,0 +1,55 @@
+"""
+Compact Bloom filter for set-membership checks on string keys
+"""
+import hashlib
+import math
+from typing import Iterable
+
+class BloomFilter:
+    """Probabilistic set: `in` may return false positives but never false negatives"""
+    
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        
+        self.capacity = capacity
+        self.error_rate = error_rate
+        
+        # Optimal sizing for the expected number of items and false positive rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        
+        self._bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, item: str) -> Iterable[int]:
+        """Bit positions of an item (double hashing over one 128-bit digest)"""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+    
+    def add(self, item: str) -> None:
+        """Add an item to the filter"""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def add_many(self, items: Iterable[str]) -> None:
+        """Add several items to the filter"""
+        for item in items:
+            self.add(item)
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    def get_stats(self) -> dict:
+        """Get filter sizing information"""
+        return {
+            "items_added": self.count,
+            "capacity": self.capacity,
+            "size_bytes": len(self._bits),
+            "num_hashes": self.num_hashes
+        }
@@ -0,0 +1,100 @@
+"""
+Bounded in-process LRU cache with per-entry TTL and hit/miss/eviction counters
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Hashable, Iterable, Optional
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness (never reset, not even by clear())"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def to_dict(self) -> dict:
+        """Convert counters to a JSON-serializable dict"""
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count, with optional TTL per entry"""
+    
+    _MISSING = object()
+    
+    def __init__(self, max_size: int = 10000, ttl_seconds: Optional[float] = 60.0):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        
+        # key -> (value, expires_at or None)
+        self._entries: "OrderedDict[Hashable, tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.stats.misses += 1
+                return default
+            
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = _MISSING) -> None:
+        """Store value under key, evicting the least recently used entry if full.
+        
+        ttl_seconds overrides the cache default; None means the entry never expires.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is self._MISSING else ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (value, expires_at)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+    
+    def invalidate(self, key: Hashable) -> bool:
+        """Remove a single entry, returning whether it was present"""
+        with self._lock:
+            if self._entries.pop(key, self._MISSING) is self._MISSING:
+                return False
+            self.stats.invalidations += 1
+            return True
+    
+    def invalidate_many(self, keys: Iterable[Hashable]) -> int:
+        """Remove several entries, returning how many were present"""
+        return sum(1 for key in keys if self.invalidate(key))
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,95 @@
+"""
+Asyncio Redis client with a sized connection pool, per-call timeouts and pipeline helpers
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+def create_async_redis(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    db: Optional[int] = None,
+    max_connections: Optional[int] = None,
+    socket_timeout: Optional[float] = None,
+    connect_timeout: Optional[float] = None
+) -> aioredis.Redis:
+    """Create an asyncio Redis client backed by an explicitly sized blocking pool.
+    
+    Unset arguments are read from the REDIS_* environment variables.
+    """
+    socket_timeout = socket_timeout if socket_timeout is not None else float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", 0.25))
+    pool = aioredis.BlockingConnectionPool(
+        host=host or os.getenv("REDIS_HOST", "localhost"),
+        port=port if port is not None else int(os.getenv("REDIS_PORT", 6379)),
+        db=db if db is not None else int(os.getenv("REDIS_DB", 0)),
+        max_connections=max_connections or int(os.getenv("REDIS_MAX_CONNECTIONS", 50)),
+        # Time to wait for a free pooled connection before failing
+        timeout=socket_timeout,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=connect_timeout if connect_timeout is not None else float(os.getenv("REDIS_CONNECT_TIMEOUT_SECONDS", 0.5))
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+class AsyncRedisCache:
+    """Cache-oriented wrapper around an asyncio Redis client.
+    
+    Every call is bounded by `op_timeout` seconds. Reads degrade to a cache miss
+    and writes are skipped when Redis is slow or unavailable, so a struggling
+    Redis adds at most `op_timeout` to a request instead of stalling it.
+    """
+    
+    def __init__(self, client: aioredis.Redis, op_timeout: Optional[float] = None):
+        self.client = client
+        self.op_timeout = op_timeout if op_timeout is not None else float(os.getenv("REDIS_OP_TIMEOUT_SECONDS", 0.25))
+        self.errors = 0
+    
+    async def _call(self, awaitable, operation: str):
+        """Run a Redis call with the per-call timeout"""
+        try:
+            return await asyncio.wait_for(awaitable, self.op_timeout)
+        except (redis.RedisError, asyncio.TimeoutError, OSError) as e:
+            self.errors += 1
+            logger.warning(f"Redis {operation} failed: {e!r}")
+            return None
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """GET a key, returning None on miss or error"""
+        return await self._call(self.client.get(key), "GET")
+    
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """MGET several keys in one round trip, returning None for misses"""
+        if not keys:
+            return []
+        values = await self._call(self.client.mget(list(keys)), "MGET")
+        return values if values is not None else [None] * len(keys)
+    
+    async def set_many_ex(self, entries: Dict[str, Tuple[str, Optional[int]]]) -> bool:
+        """Write several keys in one pipelined round trip.
+        
+        entries maps key -> (value, ttl_seconds); a None TTL stores the key without expiry.
+        """
+        if not entries:
+            return True
+        pipeline = self.client.pipeline(transaction=False)
+        for key, (value, ttl_seconds) in entries.items():
+            if ttl_seconds is None:
+                pipeline.set(key, value)
+            else:
+                pipeline.setex(key, ttl_seconds, value)
+        return await self._call(pipeline.execute(), "pipeline SET") is not None
+    
+    async def delete_many(self, keys: Sequence[str]) -> int:
+        """Delete several keys, returning how many existed"""
+        if not keys:
+            return 0
+        deleted = await self._call(self.client.delete(*keys), "DEL")
+        return deleted or 0
+    
+    async def close(self) -> None:
+        """Release pooled connections"""
+        await self.client.aclose()
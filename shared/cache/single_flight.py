@@ -0,0 +1,65 @@
+"""
+Per-key request coalescing ("single flight") for asyncio code
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its outcome with concurrent callers.
+    
+    The first caller for a key (the leader) executes the loader; callers arriving
+    while it runs await the same result or exception instead of repeating the work.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    @property
+    def inflight(self) -> int:
+        """Number of keys currently being loaded"""
+        return len(self._inflight)
+    
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        """Return loader() for key, joining an in-flight call for the same key if any"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled (e.g. client disconnected) - load ourselves
+                return await self.do(key, loader)
+        
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" warnings when nobody joined
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        self.executions += 1
+        
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+    
+    def get_stats(self) -> dict:
+        """Get coalescing counters"""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inflight": self.inflight
+        }
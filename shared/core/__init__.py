@@ -19,6 +19,7 @@ from .timeseries_ml_base import TimeSeriesMLModel
 
 # Basic data models
 from .data_models import DataPoint, TimeSeries
+from .preflight import PreflightIssue, PreflightReport, PreflightError, StreamingPreflight, run_preflight
 
 # API utilities
 from .api_base import APIEndpointBase
@@ -43,6 +44,13 @@ __all__ = [
     "DataPoint",
     "TimeSeries",
     
+    # Preflight validation
+    "PreflightIssue",
+    "PreflightReport",
+    "PreflightError",
+    "StreamingPreflight",
+    "run_preflight",
+    
     # API utilities
     "APIEndpointBase",
     
@@ -1,6 +1,8 @@
-from typing import Sequence, List
-from pydantic import BaseModel, Field, field_validator
+from collections.abc import Sequence as SequenceABC
+from typing import Any, Iterator, Mapping, Optional, Sequence, List, Union
+from pydantic import BaseModel, Field
 import numpy as np
+from .preflight import PreflightReport, run_preflight
 
 class DataPoint(BaseModel):
     timestamp: int = Field(..., description="Unix timestamp of the time the data point was collected")
@@ -16,74 +18,172 @@ class DataPoint(BaseModel):
         """Enable DataPoint to be used in sets"""
         return hash((self.timestamp, self.value))
 
-class TimeSeries(BaseModel):
-    data: Sequence[DataPoint] = Field(..., description="List of datapoints, ordered in time, of subsequent measurements of some quantity")
+class DataPointView(SequenceABC):
+    """Read-only sequence of DataPoints materialized on access from TimeSeries arrays"""
     
-    @field_validator('data')
-    @classmethod
-    def validate_data_points(cls, v):
-        """Validate TimeSeries data"""
-        if not v:
+    __slots__ = ("_timestamps", "_values")
+    
+    def __init__(self, timestamps: np.ndarray, values: np.ndarray):
+        self._timestamps = timestamps
+        self._values = values
+    
+    def __len__(self) -> int:
+        return len(self._timestamps)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return DataPoint.model_construct(
+            timestamp=int(self._timestamps[index]),
+            value=float(self._values[index])
+        )
+    
+    def __iter__(self) -> Iterator[DataPoint]:
+        for timestamp, value in zip(self._timestamps.tolist(), self._values.tolist()):
+            yield DataPoint.model_construct(timestamp=timestamp, value=value)
+    
+    def __eq__(self, other):
+        if not isinstance(other, SequenceABC) or len(other) != len(self):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+class TimeSeries:
+    """Time series stored column-wise as contiguous int64 timestamps and float64 values.
+    
+    Construct with `from_lists`/`from_arrays` to avoid per-point objects; the
+    `data=` constructor accepts DataPoints or dicts for compatibility. `data`
+    exposes the points as a lazy DataPoint sequence.
+    """
+    
+    __slots__ = ("_timestamps", "_values", "_preflight")
+    
+    def __init__(
+        self,
+        data: Optional[Sequence[Union[DataPoint, Mapping[str, Any]]]] = None,
+        *,
+        timestamps: Optional[Any] = None,
+        values: Optional[Any] = None,
+        preflight: Optional[PreflightReport] = None
+    ):
+        if data is not None:
+            if timestamps is not None or values is not None:
+                raise ValueError("Pass either data or timestamps/values, not both")
+            points = [dp if isinstance(dp, DataPoint) else DataPoint.model_validate(dp) for dp in data]
+            timestamps = [dp.timestamp for dp in points]
+            values = [dp.value for dp in points]
+        elif timestamps is None or values is None:
+            raise ValueError("TimeSeries requires data or timestamps and values")
+        
+        self._timestamps = self._to_timestamp_array(timestamps)
+        self._values = self._to_value_array(values)
+        
+        if len(self._timestamps) != len(self._values):
+            raise ValueError("Timestamps and values must have the same length")
+        if len(self._timestamps) == 0:
             raise ValueError("TimeSeries cannot be empty")
         
-        # Check if timestamps are sorted
-        timestamps = [dp.timestamp for dp in v]
-        if timestamps != sorted(timestamps):
+        # A preflight report already computed for these arrays covers the ordering check
+        self._preflight = preflight
+        is_sorted = preflight.is_sorted if preflight is not None else bool(np.all(self._timestamps[1:] >= self._timestamps[:-1]))
+        if not is_sorted:
             raise ValueError("DataPoints must be sorted by timestamp")
-        
-        return v
+    
+    @staticmethod
+    def _to_timestamp_array(timestamps: Any) -> np.ndarray:
+        """Convert timestamps to a read-only contiguous int64 array"""
+        array = np.asarray(timestamps)
+        if array.ndim != 1:
+            raise ValueError("Timestamps must be one-dimensional")
+        if array.dtype.kind == "f":
+            if not np.all(np.isfinite(array)) or not np.all(array == np.floor(array)):
+                raise ValueError("Timestamps must be integers")
+        elif array.size and array.dtype.kind not in "iu":
+            raise ValueError("Timestamps must be integers")
+        # View so that freezing it never affects the caller's array
+        array = np.ascontiguousarray(array, dtype=np.int64).view()
+        array.flags.writeable = False
+        return array
+    
+    @staticmethod
+    def _to_value_array(values: Any) -> np.ndarray:
+        """Convert values to a read-only contiguous float64 array"""
+        try:
+            array = np.ascontiguousarray(values, dtype=np.float64).view()
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Values must be numeric: {e}")
+        if array.ndim != 1:
+            raise ValueError("Values must be one-dimensional")
+        array.flags.writeable = False
+        return array
     
     @classmethod
     def from_lists(cls, timestamps: List[int], values: List[float]) -> "TimeSeries":
         """Create TimeSeries from separate timestamp and value lists"""
-        if len(timestamps) != len(values):
-            raise ValueError("Timestamps and values must have the same length")
+        return cls(timestamps=timestamps, values=values)
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        preflight: Optional[PreflightReport] = None
+    ) -> "TimeSeries":
+        """Create TimeSeries from timestamp and value arrays (no copy when dtypes already match).
         
-        data_points = [DataPoint(timestamp=ts, value=val) for ts, val in zip(timestamps, values)]
-        return cls(data=data_points)
+        Pass the preflight report of these arrays, if already computed, to reuse it.
+        """
+        return cls(timestamps=timestamps, values=values, preflight=preflight)
+    
+    @property
+    def data(self) -> DataPointView:
+        """Lazy DataPoint view over the series"""
+        return DataPointView(self._timestamps, self._values)
     
     @property
     def values(self) -> List[float]:
         """Extract just the values from the time series"""
-        return [dp.value for dp in self.data]
+        return self._values.tolist()
     
     @property
     def timestamps(self) -> List[int]:
         """Extract just the timestamps from the time series"""
-        return [dp.timestamp for dp in self.data]
+        return self._timestamps.tolist()
     
     @property
     def length(self) -> int:
         """Get the length of the time series"""
-        return len(self.data)
+        return len(self._timestamps)
+    
+    def __len__(self) -> int:
+        return self.length
     
     def get_values_array(self) -> np.ndarray:
-        """Get values as numpy array for ML operations"""
-        return np.array(self.values)
+        """Get values as numpy array for ML operations (read-only, not copied)"""
+        return self._values
     
     def get_timestamps_array(self) -> np.ndarray:
-        """Get timestamps as numpy array"""
-        return np.array(self.timestamps)
+        """Get timestamps as numpy array (read-only, not copied)"""
+        return self._timestamps
+    
+    def preflight(self, min_points: int = 2) -> PreflightReport:
+        """Run (or reuse) vectorized preflight validation of the series"""
+        if self._preflight is None or self._preflight.min_points != min_points:
+            self._preflight = run_preflight(self._timestamps, self._values, min_points=min_points)
+        return self._preflight
     
     def validate_for_training(self, min_points: int = 2) -> None:
         """Validate if time series is suitable for training"""
-        if self.length < min_points:
-            raise ValueError(f"Insufficient training data (minimum {min_points} points required, got {self.length})")
-        
-        # Check for constant values
-        unique_values = set(self.values)
-        if len(unique_values) == 1:
-            raise ValueError("Constant values detected - cannot train model")
+        self.preflight(min_points).raise_for_errors()
     
     def get_statistics(self) -> dict:
         """Get basic statistics of the time series"""
-        values_array = self.get_values_array()
+        values_array = self._values
         return {
             "count": self.length,
             "mean": float(np.mean(values_array)),
             "std": float(np.std(values_array)),
             "min": float(np.min(values_array)),
             "max": float(np.max(values_array)),
-            "start_time": self.timestamps[0],
-            "end_time": self.timestamps[-1]
-        }
\ No newline at end of file
+            "start_time": int(self._timestamps[0]),
+            "end_time": int(self._timestamps[-1])
+        }
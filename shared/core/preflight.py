@@ -0,0 +1,242 @@
+"""
+Vectorized preflight validation of time series data before training.
+All checks run over NumPy arrays and are collected into one structured report.
+"""
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+import numpy as np
+
+# A series is near-constant when its std is below this fraction of its magnitude
+NEAR_CONSTANT_RTOL = 1e-9
+# Gaps longer than this multiple of the median gap are reported
+LARGE_GAP_FACTOR = 10.0
+
+class PreflightIssue(BaseModel):
+    """Single preflight finding"""
+    code: str = Field(..., description="Machine-readable issue code")
+    severity: str = Field(..., description="'error' blocks training, 'warning' is informational")
+    message: str = Field(..., description="Human-readable description")
+    count: Optional[int] = Field(None, description="Number of affected points or gaps")
+
+class PreflightReport(BaseModel):
+    """Result of preflight validation"""
+    count: int = Field(..., description="Number of data points checked")
+    min_points: int = Field(..., description="Minimum number of points required")
+    is_sorted: bool = Field(..., description="Whether timestamps are non-decreasing")
+    issues: List[PreflightIssue] = Field(default_factory=list)
+    gaps: Dict[str, float] = Field(default_factory=dict, description="Timestamp gap statistics in seconds")
+    
+    @property
+    def errors(self) -> List[PreflightIssue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+    
+    @property
+    def warnings(self) -> List[PreflightIssue]:
+        return [issue for issue in self.issues if issue.severity == "warning"]
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the data can be used for training"""
+        return not self.errors
+    
+    def raise_for_errors(self) -> None:
+        """Raise PreflightError if any blocking issue was found"""
+        if not self.ok:
+            raise PreflightError(self)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary for API responses and stored training stats"""
+        return {
+            "ok": self.ok,
+            "count": self.count,
+            "errors": [issue.model_dump(exclude_none=True) for issue in self.errors],
+            "warnings": [issue.model_dump(exclude_none=True) for issue in self.warnings],
+            "gaps": self.gaps
+        }
+
+class PreflightError(ValueError):
+    """Training data failed preflight validation - the message is the first error"""
+    
+    def __init__(self, report: PreflightReport):
+        self.report = report
+        super().__init__(report.errors[0].message)
+
+def run_preflight(timestamps: Any, values: Any, min_points: int = 2) -> PreflightReport:
+    """Check timestamps and values for training suitability.
+    
+    Covers length, NaN/inf values, timestamp ordering and duplicates,
+    constant or near-constant values and gap statistics.
+    """
+    timestamps = np.asarray(timestamps)
+    values = np.asarray(values, dtype=np.float64)
+    count = len(values)
+    issues: List[PreflightIssue] = []
+    
+    def error(code: str, message: str, issue_count: Optional[int] = None) -> None:
+        issues.append(PreflightIssue(code=code, severity="error", message=message, count=issue_count))
+    
+    def warning(code: str, message: str, issue_count: Optional[int] = None) -> None:
+        issues.append(PreflightIssue(code=code, severity="warning", message=message, count=issue_count))
+    
+    if len(timestamps) != count:
+        error("length_mismatch", "Timestamps and values must have the same length")
+        return PreflightReport(count=count, min_points=min_points, is_sorted=False, issues=issues)
+    
+    if count < min_points:
+        error("insufficient_points", f"Insufficient training data (minimum {min_points} points required, got {count})", count)
+    
+    # Timestamp ordering and gaps from one diff array
+    gaps: Dict[str, float] = {}
+    is_sorted = True
+    if count >= 2:
+        diffs = np.diff(timestamps)
+        backwards = int(np.count_nonzero(diffs < 0))
+        is_sorted = backwards == 0
+        if not is_sorted:
+            error("unsorted_timestamps", "DataPoints must be sorted by timestamp", backwards)
+        else:
+            duplicates = int(np.count_nonzero(diffs == 0))
+            if duplicates:
+                warning("duplicate_timestamps", f"{duplicates} duplicate timestamps detected", duplicates)
+            
+            median_gap = float(np.median(diffs))
+            gaps = {
+                "min": float(diffs.min()),
+                "median": median_gap,
+                "mean": float(diffs.mean()),
+                "max": float(diffs.max())
+            }
+            if median_gap > 0:
+                large_gaps = int(np.count_nonzero(diffs > LARGE_GAP_FACTOR * median_gap))
+                if large_gaps:
+                    warning("large_gaps", f"{large_gaps} gaps longer than {LARGE_GAP_FACTOR:g}x the median interval", large_gaps)
+    
+    # Value checks
+    finite = np.isfinite(values)
+    non_finite = count - int(np.count_nonzero(finite))
+    if non_finite:
+        error("non_finite_values", f"{non_finite} non-finite values (NaN or infinity) detected", non_finite)
+        values = values[finite]
+    
+    if len(values) >= 2:
+        if values.min() == values.max():
+            error("constant_values", "Constant values detected - cannot train model")
+        else:
+            std = float(values.std())
+            if std <= NEAR_CONSTANT_RTOL * max(abs(float(values.mean())), 1.0):
+                warning("near_constant_values", f"Values are near-constant (std={std:.3g}) - most points will be flagged as anomalies")
+    
+    return PreflightReport(count=count, min_points=min_points, is_sorted=is_sorted, issues=issues, gaps=gaps)
+
+class StreamingPreflight:
+    """Incremental preflight and sufficient statistics for a series arriving in chunks.
+    
+    Keeps O(1) state: count, running mean and sum of squared deviations
+    (merged per chunk with Chan's parallel update), extremes, ordering
+    counters and gap extremes. Gap medians need the full series, so the
+    large-gap check of run_preflight is not available here.
+    """
+    
+    def __init__(self, min_points: int = 2):
+        self.min_points = min_points
+        self.count = 0
+        self.finite_count = 0
+        self.non_finite = 0
+        self.backwards = 0
+        self.duplicates = 0
+        self.first_timestamp: Optional[int] = None
+        self.last_timestamp: Optional[int] = None
+        self.min_gap: Optional[int] = None
+        self.max_gap: Optional[int] = None
+        self.min_value = np.inf
+        self.max_value = -np.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+    
+    def update(self, timestamps: Any, values: Any) -> None:
+        """Account for the next chunk of the series"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if len(timestamps) != len(values):
+            raise ValueError("Timestamps and values must have the same length")
+        if not len(timestamps):
+            return
+        
+        # Ordering and gaps, including the boundary with the previous chunk
+        if self.last_timestamp is not None:
+            diffs = np.diff(timestamps, prepend=np.int64(self.last_timestamp))
+        else:
+            diffs = np.diff(timestamps)
+            self.first_timestamp = int(timestamps[0])
+        if diffs.size:
+            self.backwards += int(np.count_nonzero(diffs < 0))
+            self.duplicates += int(np.count_nonzero(diffs == 0))
+            chunk_min_gap, chunk_max_gap = int(diffs.min()), int(diffs.max())
+            self.min_gap = chunk_min_gap if self.min_gap is None else min(self.min_gap, chunk_min_gap)
+            self.max_gap = chunk_max_gap if self.max_gap is None else max(self.max_gap, chunk_max_gap)
+        self.last_timestamp = int(timestamps[-1])
+        self.count += len(timestamps)
+        
+        # Values: merge chunk mean/M2 into the running ones
+        finite_values = values[np.isfinite(values)]
+        self.non_finite += len(values) - len(finite_values)
+        chunk_count = len(finite_values)
+        if chunk_count:
+            chunk_mean = float(finite_values.mean())
+            chunk_m2 = float(np.square(finite_values - chunk_mean).sum())
+            total = self.finite_count + chunk_count
+            delta = chunk_mean - self._mean
+            self._mean += delta * chunk_count / total
+            self._m2 += chunk_m2 + delta * delta * self.finite_count * chunk_count / total
+            self.finite_count = total
+            self.min_value = min(self.min_value, float(finite_values.min()))
+            self.max_value = max(self.max_value, float(finite_values.max()))
+    
+    @property
+    def mean(self) -> float:
+        return self._mean
+    
+    @property
+    def std(self) -> float:
+        """Population standard deviation (same as np.std)"""
+        return float(np.sqrt(self._m2 / self.finite_count)) if self.finite_count else 0.0
+    
+    def report(self) -> PreflightReport:
+        """Preflight report of everything seen so far"""
+        issues: List[PreflightIssue] = []
+        
+        if self.count < self.min_points:
+            issues.append(PreflightIssue(code="insufficient_points", severity="error", message=f"Insufficient training data (minimum {self.min_points} points required, got {self.count})", count=self.count))
+        if self.backwards:
+            issues.append(PreflightIssue(code="unsorted_timestamps", severity="error", message="DataPoints must be sorted by timestamp", count=self.backwards))
+        elif self.duplicates:
+            issues.append(PreflightIssue(code="duplicate_timestamps", severity="warning", message=f"{self.duplicates} duplicate timestamps detected", count=self.duplicates))
+        if self.non_finite:
+            issues.append(PreflightIssue(code="non_finite_values", severity="error", message=f"{self.non_finite} non-finite values (NaN or infinity) detected", count=self.non_finite))
+        if self.finite_count >= 2:
+            if self.min_value == self.max_value:
+                issues.append(PreflightIssue(code="constant_values", severity="error", message="Constant values detected - cannot train model"))
+            elif self.std <= NEAR_CONSTANT_RTOL * max(abs(self.mean), 1.0):
+                issues.append(PreflightIssue(code="near_constant_values", severity="warning", message=f"Values are near-constant (std={self.std:.3g}) - most points will be flagged as anomalies"))
+        
+        gaps: Dict[str, float] = {}
+        if self.count >= 2 and not self.backwards:
+            gaps = {
+                "min": float(self.min_gap),
+                "mean": (self.last_timestamp - self.first_timestamp) / (self.count - 1),
+                "max": float(self.max_gap)
+            }
+        
+        return PreflightReport(count=self.count, min_points=self.min_points, is_sorted=not self.backwards, issues=issues, gaps=gaps)
+    
+    def get_statistics(self) -> dict:
+        """Training statistics in the same shape as TimeSeries.get_statistics"""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min_value,
+            "max": self.max_value,
+            "start_time": self.first_timestamp,
+            "end_time": self.last_timestamp
+        }
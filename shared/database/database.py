@@ -4,17 +4,57 @@ Centralized database connection and configuration
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from contextlib import contextmanager, asynccontextmanager
 import os
-from typing import Generator
+import time
+from typing import AsyncGenerator, Generator, Optional
+from ..metrics import Gauge, Histogram
 from .config import db_config
 
 # Get database configuration
 config = db_config.get_config()
 
+# Connection pool metrics (exposed on each service's /metrics)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent obtaining a connection from the pool (waiting or connecting)",
+    ("pool",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Pooled database connections by state",
+    ("pool", "state")
+)
+
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long each checkout took"""
+    pool_label = "sync"
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.pool_label).observe(time.perf_counter() - start)
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording how long each checkout took"""
+    pool_label = "async"
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.pool_label).observe(time.perf_counter() - start)
+
 # SQLAlchemy Setup
 engine = create_engine(
     config["url"],
+    poolclass=TimedQueuePool,
     pool_pre_ping=True,
     pool_size=config["pool_size"],
     max_overflow=config["max_overflow"],
@@ -23,9 +63,33 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine/session (SQLAlchemy asyncio + asyncpg), created lazily on first use
+# so services that only use the sync session don't need asyncpg installed
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
 # Base class for models
 Base = declarative_base()
 
+def _pool_state(pool_label: str, state: str) -> Optional[float]:
+    """Connection count of a pool in a given state, or None if the engine doesn't exist yet"""
+    pool_engine = engine if pool_label == "sync" else _async_engine
+    if pool_engine is None:
+        return None
+    pool = pool_engine.pool
+    if state == "checked_out":
+        return pool.checkedout()
+    if state == "idle":
+        return pool.checkedin()
+    # Negative while the pool is below pool_size
+    return max(pool.overflow(), 0)
+
+for _pool_label in ("sync", "async"):
+    for _state in ("checked_out", "idle", "overflow"):
+        POOL_CONNECTIONS.labels(_pool_label, _state).set_function(
+            lambda pool_label=_pool_label, state=_state: _pool_state(pool_label, state)
+        )
+
 # Dependency for FastAPI
 def get_db() -> Generator[Session, None, None]:
     """Database session dependency for FastAPI"""
@@ -48,6 +112,55 @@ def get_db_session() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def get_async_database_url(url: str) -> str:
+    """Convert a sync PostgreSQL URL to its asyncpg equivalent"""
+    for prefix in ("postgresql+psycopg2://", "postgresql+psycopg://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+def get_async_engine() -> AsyncEngine:
+    """Get (creating on first call) the shared async engine"""
+    global _async_engine, _AsyncSessionLocal
+    
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(config["url"]),
+            poolclass=TimedAsyncQueuePool,
+            pool_pre_ping=True,
+            pool_size=config["pool_size"],
+            max_overflow=config["max_overflow"],
+            echo=config["echo"]
+        )
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_engine
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Create a new async session bound to the shared async engine"""
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+# Async dependency for FastAPI
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async database session dependency for FastAPI"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@asynccontextmanager
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Async context manager for database sessions"""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
 def init_database():
     """Initialize database - create tables"""
     Base.metadata.create_all(bind=engine)
@@ -55,3 +168,12 @@ def init_database():
 def close_database():
     """Close database connections"""
     engine.dispose()
+
+async def close_async_database():
+    """Close async database connections"""
+    global _async_engine, _AsyncSessionLocal
+    
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
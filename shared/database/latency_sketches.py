@@ -0,0 +1,97 @@
+"""
+Periodic persistence of in-memory latency sketches, merged across instances on read
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Dict, Optional, Tuple
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from ..metrics import LatencySketch, WindowedLatencySketch
+from .database import get_db_session
+from .models import LatencySketchRecord
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SKETCH_PERSIST_ENABLED = os.getenv("LATENCY_SKETCH_PERSIST_ENABLED", "true").lower() == "true"
+LATENCY_SKETCH_PERSIST_INTERVAL_SECONDS = float(os.getenv("LATENCY_SKETCH_PERSIST_INTERVAL_SECONDS", 60))
+LATENCY_SKETCH_RETENTION_HOURS = int(os.getenv("LATENCY_SKETCH_RETENTION_HOURS", 48))
+
+# Identifies this process's rows, so replicas and workers never overwrite each other
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+def persist_latency_sketches(service: str, sketches: Dict[str, WindowedLatencySketch]) -> int:
+    """Upsert the sketch buckets changed since the last call and prune expired rows.
+    
+    Returns the number of rows written. If the write fails, the buckets are
+    reported as changed again so the next call retries them.
+    """
+    now = int(time.time())
+    drained = {metric: windowed.drain_updated() for metric, windowed in sketches.items()}
+    rows = [
+        {
+            "service": service,
+            "metric": metric,
+            "bucket_start": start,
+            "instance_id": INSTANCE_ID,
+            "bucket_seconds": sketches[metric].bucket_seconds,
+            "sketch": data,
+            "updated_at": now
+        }
+        for metric, updated in drained.items()
+        for start, data in sorted(updated.items())
+    ]
+    
+    try:
+        with get_db_session() as db:
+            if rows:
+                statement = pg_insert(LatencySketchRecord).values(rows)
+                db.execute(statement.on_conflict_do_update(
+                    index_elements=[
+                        LatencySketchRecord.service,
+                        LatencySketchRecord.metric,
+                        LatencySketchRecord.bucket_start,
+                        LatencySketchRecord.instance_id
+                    ],
+                    set_={"sketch": statement.excluded.sketch, "updated_at": statement.excluded.updated_at}
+                ))
+            db.execute(delete(LatencySketchRecord).where(
+                LatencySketchRecord.bucket_start < now - LATENCY_SKETCH_RETENTION_HOURS * 3600
+            ))
+    except Exception:
+        for metric, updated in drained.items():
+            sketches[metric].mark_updated(updated)
+        raise
+    return len(rows)
+
+async def persist_latency_sketches_periodically(service: str, sketches: Dict[str, WindowedLatencySketch]) -> None:
+    """Persist a service's sketches every LATENCY_SKETCH_PERSIST_INTERVAL_SECONDS until cancelled"""
+    while True:
+        await asyncio.sleep(LATENCY_SKETCH_PERSIST_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(persist_latency_sketches, service, sketches)
+        except Exception as e:
+            logger.error(f"Failed to persist {service} latency sketches: {e}")
+
+def load_latency_sketches(db: Session, since: int, service: Optional[str] = None) -> Dict[Tuple[str, str], LatencySketch]:
+    """Merge the persisted sketches overlapping [since, now] per (service, metric)"""
+    query = db.query(
+        LatencySketchRecord.service,
+        LatencySketchRecord.metric,
+        LatencySketchRecord.sketch
+    ).filter(LatencySketchRecord.bucket_start + LatencySketchRecord.bucket_seconds > since)
+    if service is not None:
+        query = query.filter(LatencySketchRecord.service == service)
+    
+    merged: Dict[Tuple[str, str], LatencySketch] = {}
+    for row_service, metric, data in query:
+        sketch = LatencySketch.from_dict(data)
+        key = (row_service, metric)
+        if key in merged:
+            merged[key].merge(sketch)
+        else:
+            merged[key] = sketch
+    return merged
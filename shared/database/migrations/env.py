@@ -9,7 +9,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from shared.database.database import Base
-from shared.database.models import TrainedModel, PredictionLog, TrainingData
+from shared.database.models import TrainedModel, PredictionLog, TrainingData, TrainingDataChunk, ModelVersionCounter, PredictionRollup, LatencySketchRecord
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
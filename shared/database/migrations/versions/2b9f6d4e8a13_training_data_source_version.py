@@ -0,0 +1,23 @@
+"""training_data_source_version
+
+Revision ID: 2b9f6d4e8a13
+Revises: f3c7e2a9b614
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '2b9f6d4e8a13'
+down_revision = 'f3c7e2a9b614'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('training_data', sa.Column('source_model_version', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('training_data', 'source_model_version')
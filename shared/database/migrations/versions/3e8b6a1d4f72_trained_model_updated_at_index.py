@@ -0,0 +1,24 @@
+"""trained_model_updated_at_index
+
+Revision ID: 3e8b6a1d4f72
+Revises: 9c4e7b2d5a16
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e8b6a1d4f72'
+down_revision = '9c4e7b2d5a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_trained_models_updated_at'), 'trained_models', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_trained_models_updated_at'), table_name='trained_models')
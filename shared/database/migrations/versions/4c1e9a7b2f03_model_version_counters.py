@@ -0,0 +1,38 @@
+"""model_version_counters
+
+Revision ID: 4c1e9a7b2f03
+Revises: d7804a52fcd4
+Create Date: 2026-10-16 20:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4c1e9a7b2f03'
+down_revision = 'd7804a52fcd4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('model_version_counters',
+    sa.Column('series_id', sa.String(), nullable=False),
+    sa.Column('last_version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('series_id')
+    )
+    # Seed counters with the highest existing "v{n}" version of each series
+    op.execute("""
+        INSERT INTO model_version_counters (series_id, last_version, updated_at)
+        SELECT series_id,
+               MAX(CAST(SUBSTRING(model_version FROM 2) AS INTEGER)),
+               CAST(EXTRACT(EPOCH FROM NOW()) AS INTEGER)
+        FROM trained_models
+        WHERE model_version ~ '^v[0-9]+$'
+        GROUP BY series_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('model_version_counters')
@@ -0,0 +1,24 @@
+"""trained_model_series_hash_index
+
+Revision ID: 6d2a9f4b8c31
+Revises: 3e8b6a1d4f72
+Create Date: 2026-10-17 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2a9f4b8c31'
+down_revision = '3e8b6a1d4f72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_trained_models_series_hash', 'trained_models', ['series_id', 'training_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_trained_models_series_hash', table_name='trained_models')
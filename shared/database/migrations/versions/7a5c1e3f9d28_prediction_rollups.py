@@ -0,0 +1,64 @@
+"""prediction_rollups
+
+Revision ID: 7a5c1e3f9d28
+Revises: 2b9f6d4e8a13
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7a5c1e3f9d28'
+down_revision = '2b9f6d4e8a13'
+branch_labels = None
+depends_on = None
+
+# Minute and hour buckets
+BUCKET_SIZES = (60, 3600)
+
+# Minute buckets are only backfilled for the default retention (older ones would be pruned)
+MINUTE_RETENTION_SECONDS = 26 * 3600
+
+
+def upgrade() -> None:
+    op.create_table('prediction_rollups',
+    sa.Column('bucket_seconds', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.Integer(), nullable=False),
+    sa.Column('series_id', sa.String(), nullable=False),
+    sa.Column('model_version', sa.String(), nullable=False),
+    sa.Column('prediction_count', sa.Integer(), nullable=False),
+    sa.Column('anomaly_count', sa.Integer(), nullable=False),
+    sa.Column('total_latency_ms_sum', sa.Float(), nullable=False),
+    sa.Column('last_prediction_at', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('bucket_seconds', 'bucket_start', 'series_id', 'model_version')
+    )
+    
+    # Backfill from the existing logs, one grouped pass per bucket size
+    for bucket_seconds in BUCKET_SIZES:
+        if bucket_seconds == 60:
+            since = f"CAST(EXTRACT(EPOCH FROM NOW()) AS INTEGER) - {MINUTE_RETENTION_SECONDS}"
+        else:
+            since = "0"
+        op.execute(sa.text(f"""
+            INSERT INTO prediction_rollups (
+                bucket_seconds, bucket_start, series_id, model_version,
+                prediction_count, anomaly_count, total_latency_ms_sum, last_prediction_at
+            )
+            SELECT
+                {bucket_seconds},
+                created_at - created_at % {bucket_seconds},
+                series_id,
+                model_version,
+                COUNT(*),
+                SUM(CASE WHEN prediction THEN 1 ELSE 0 END),
+                COALESCE(SUM(total_latency_ms), 0),
+                MAX(created_at)
+            FROM prediction_logs
+            WHERE created_at IS NOT NULL AND created_at >= {since}
+            GROUP BY created_at - created_at % {bucket_seconds}, series_id, model_version
+        """))
+
+
+def downgrade() -> None:
+    op.drop_table('prediction_rollups')
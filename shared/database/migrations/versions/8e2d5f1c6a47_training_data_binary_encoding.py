@@ -0,0 +1,83 @@
+"""training_data_binary_encoding
+
+Revision ID: 8e2d5f1c6a47
+Revises: 4c1e9a7b2f03
+Create Date: 2026-10-16 21:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from shared.database.series_codec import encode_series, decode_series
+
+# revision identifiers, used by Alembic.
+revision = '8e2d5f1c6a47'
+down_revision = '4c1e9a7b2f03'
+branch_labels = None
+depends_on = None
+
+# Rows converted per round trip
+BATCH_SIZE = 500
+# Existing JSON values are float64; the converted copies must stay exact whatever
+# TRAINING_DATA_VALUE_DTYPE the services are configured with
+VALUE_DTYPE = "float64"
+
+training_data = sa.table('training_data',
+    sa.column('id', sa.Integer()),
+    sa.column('timestamps', postgresql.JSON()),
+    sa.column('values', postgresql.JSON()),
+    sa.column('encoded_data', sa.LargeBinary())
+)
+
+
+def upgrade() -> None:
+    op.add_column('training_data', sa.Column('encoded_data', sa.LargeBinary(), nullable=True))
+    op.alter_column('training_data', 'timestamps', existing_type=postgresql.JSON(astext_type=sa.Text()), nullable=True)
+    op.alter_column('training_data', 'values', existing_type=postgresql.JSON(astext_type=sa.Text()), nullable=True)
+    
+    # Convert existing JSON arrays to the binary format, keyset-paginated by id
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(training_data.c.id, training_data.c.timestamps, training_data.c.values)
+            .where(training_data.c.id > last_id, training_data.c.encoded_data.is_(None))
+            .order_by(training_data.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            bind.execute(
+                training_data.update()
+                .where(training_data.c.id == row.id)
+                .values(encoded_data=encode_series(row.timestamps or [], row.values or [], value_dtype=VALUE_DTYPE), timestamps=None, values=None)
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    # Restore the JSON arrays before dropping the binary column
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(training_data.c.id, training_data.c.encoded_data)
+            .where(training_data.c.id > last_id, training_data.c.encoded_data.isnot(None))
+            .order_by(training_data.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            timestamps, values = decode_series(row.encoded_data)
+            bind.execute(
+                training_data.update()
+                .where(training_data.c.id == row.id)
+                .values(timestamps=timestamps.tolist(), values=values.tolist())
+            )
+        last_id = rows[-1].id
+    
+    op.alter_column('training_data', 'values', existing_type=postgresql.JSON(astext_type=sa.Text()), nullable=False)
+    op.alter_column('training_data', 'timestamps', existing_type=postgresql.JSON(astext_type=sa.Text()), nullable=False)
+    op.drop_column('training_data', 'encoded_data')
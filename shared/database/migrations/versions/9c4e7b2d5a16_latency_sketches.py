@@ -0,0 +1,33 @@
+"""latency_sketches
+
+Revision ID: 9c4e7b2d5a16
+Revises: 7a5c1e3f9d28
+Create Date: 2026-10-16 23:45:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '9c4e7b2d5a16'
+down_revision = '7a5c1e3f9d28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('latency_sketches',
+    sa.Column('service', sa.String(), nullable=False),
+    sa.Column('metric', sa.String(), nullable=False),
+    sa.Column('bucket_start', sa.Integer(), nullable=False),
+    sa.Column('instance_id', sa.String(), nullable=False),
+    sa.Column('bucket_seconds', sa.Integer(), nullable=False),
+    sa.Column('sketch', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('service', 'metric', 'bucket_start', 'instance_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('latency_sketches')
@@ -0,0 +1,24 @@
+"""prediction_log_model_lookup_latency
+
+Revision ID: a4f1c7e5b293
+Revises: 6d2a9f4b8c31
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f1c7e5b293'
+down_revision = '6d2a9f4b8c31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('prediction_logs', sa.Column('model_lookup_latency_ms', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('prediction_logs', 'model_lookup_latency_ms')
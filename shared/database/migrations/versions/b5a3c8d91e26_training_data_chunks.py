@@ -0,0 +1,37 @@
+"""training_data_chunks
+
+Revision ID: b5a3c8d91e26
+Revises: 8e2d5f1c6a47
+Create Date: 2026-10-16 21:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b5a3c8d91e26'
+down_revision = '8e2d5f1c6a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('training_data_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('series_id', sa.String(), nullable=False),
+    sa.Column('model_version', sa.String(), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('encoded_data', sa.LargeBinary(), nullable=False),
+    sa.Column('data_points_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('series_id', 'model_version', 'chunk_index', name='uq_series_version_chunk')
+    )
+    op.create_index(op.f('ix_training_data_chunks_id'), 'training_data_chunks', ['id'], unique=False)
+    op.create_index(op.f('ix_training_data_chunks_series_id'), 'training_data_chunks', ['series_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_training_data_chunks_series_id'), table_name='training_data_chunks')
+    op.drop_index(op.f('ix_training_data_chunks_id'), table_name='training_data_chunks')
+    op.drop_table('training_data_chunks')
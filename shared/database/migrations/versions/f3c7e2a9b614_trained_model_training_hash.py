@@ -0,0 +1,24 @@
+"""trained_model_training_hash
+
+Revision ID: f3c7e2a9b614
+Revises: b5a3c8d91e26
+Create Date: 2026-10-16 22:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f3c7e2a9b614'
+down_revision = 'b5a3c8d91e26'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing versions have no hash and are never matched as duplicates
+    op.add_column('trained_models', sa.Column('training_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('trained_models', 'training_hash')
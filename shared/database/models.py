@@ -1,7 +1,7 @@
 """
 Database models for persisting ML models and metadata
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, LargeBinary, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import JSON
 from datetime import datetime, timezone
 from .database import Base
@@ -23,13 +23,14 @@ class TrainedModel(Base):
     model_version = Column(String, default="v1")
     training_points = Column(Integer, nullable=False)
     training_data_stats = Column(JSON)  # Store training statistics
+    training_hash = Column(String(64), nullable=True)  # Content hash of training data and threshold
     
     # Performance metrics (in milliseconds)
     training_latency_ms = Column(Float, nullable=True)  # Time to train the model
     
     # Timestamps (Unix format)
     created_at = Column(Integer, default=lambda: int(datetime.now(timezone.utc).timestamp()))
-    updated_at = Column(Integer, default=lambda: int(datetime.now(timezone.utc).timestamp()))
+    updated_at = Column(Integer, default=lambda: int(datetime.now(timezone.utc).timestamp()), index=True)
     
     # Status
     is_active = Column(Boolean, default=True)
@@ -37,6 +38,8 @@ class TrainedModel(Base):
     # Table constraints
     __table_args__ = (
         UniqueConstraint('series_id', 'model_version', name='uq_series_version'),
+        # Deduplication looks up any version trained on the same data and threshold
+        Index('ix_trained_models_series_hash', 'series_id', 'training_hash'),
     )
 
 class PredictionLog(Base):
@@ -57,6 +60,7 @@ class PredictionLog(Base):
     # Performance metrics (in milliseconds)
     inference_latency_ms = Column(Float, nullable=True)  # Time for ML inference only
     database_latency_ms = Column(Float, nullable=True)   # Time for database operations
+    model_lookup_latency_ms = Column(Float, nullable=True)  # Time to get the model parameters (caches or database)
     total_latency_ms = Column(Float, nullable=True)      # Total request latency
     
     # Prediction metadata
@@ -70,9 +74,15 @@ class TrainingData(Base):
     series_id = Column(String, nullable=False, index=True)
     model_version = Column(String, nullable=False)
     
-    # Training data points (stored as JSON array)
-    timestamps = Column(JSON, nullable=False)  # Array of Unix timestamps
-    values = Column(JSON, nullable=False)      # Array of float values
+    # Training data points in the compact binary format (see series_codec)
+    encoded_data = Column(LargeBinary, nullable=True)
+    
+    # Legacy storage as JSON arrays, only set on rows written before encoded_data
+    timestamps = Column(JSON, nullable=True)  # Array of Unix timestamps
+    values = Column(JSON, nullable=True)      # Array of float values
+    
+    # Retrained versions store no points of their own and share those of this version
+    source_model_version = Column(String, nullable=True)
     
     # Metadata
     data_points_count = Column(Integer, nullable=False)
@@ -83,4 +93,73 @@ class TrainingData(Base):
         {"schema": None},  # Default schema
     )
 
+class TrainingDataChunk(Base):
+    """Table for training data uploaded in streamed chunks.
+    
+    A streamed upload stores its points here chunk by chunk (binary format,
+    see series_codec) and its TrainingData row keeps no data of its own.
+    """
+    __tablename__ = "training_data_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    series_id = Column(String, nullable=False, index=True)
+    model_version = Column(String, nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    
+    encoded_data = Column(LargeBinary, nullable=False)
+    data_points_count = Column(Integer, nullable=False)
+    created_at = Column(Integer, default=lambda: int(datetime.now(timezone.utc).timestamp()))
+    
+    __table_args__ = (
+        UniqueConstraint('series_id', 'model_version', 'chunk_index', name='uq_series_version_chunk'),
+    )
+
+class ModelVersionCounter(Base):
+    """Table holding the last allocated model version of each series"""
+    __tablename__ = "model_version_counters"
+    
+    series_id = Column(String, primary_key=True)
+    
+    # Incremented atomically (upsert) when a new model version is trained;
+    # the row lock serializes concurrent trainings of the same series
+    last_version = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(Integer, default=lambda: int(datetime.now(timezone.utc).timestamp()))
+
+class PredictionRollup(Base):
+    """Prediction counts per series, model version and time bucket.
+    
+    Kept for 1-minute and 1-hour buckets and incremented as prediction logs
+    are flushed, so monitoring queries don't scan prediction_logs.
+    """
+    __tablename__ = "prediction_rollups"
+    
+    bucket_seconds = Column(Integer, primary_key=True)  # 60 or 3600
+    bucket_start = Column(Integer, primary_key=True)    # Unix timestamp, a multiple of bucket_seconds
+    series_id = Column(String, primary_key=True)
+    model_version = Column(String, primary_key=True)
+    
+    # Aggregates of the bucket's predictions
+    prediction_count = Column(Integer, nullable=False, default=0)
+    anomaly_count = Column(Integer, nullable=False, default=0)
+    total_latency_ms_sum = Column(Float, nullable=False, default=0.0)
+    last_prediction_at = Column(Integer, nullable=True)
+
+class LatencySketchRecord(Base):
+    """Latency sketch of one service instance, metric and time bucket.
+    
+    Each instance periodically upserts the serialized sketches it keeps in
+    memory; monitoring merges the rows of a window into fleet-wide percentiles.
+    """
+    __tablename__ = "latency_sketches"
+    
+    service = Column(String, primary_key=True)       # training, inference
+    metric = Column(String, primary_key=True)        # e.g. total_latency_ms
+    bucket_start = Column(Integer, primary_key=True) # Unix timestamp, a multiple of bucket_seconds
+    instance_id = Column(String, primary_key=True)   # hostname:pid of the recording process
+    bucket_seconds = Column(Integer, nullable=False)
+    
+    sketch = Column(JSON, nullable=False)            # LatencySketch.to_dict()
+    updated_at = Column(Integer, nullable=False)
+
 # ServiceHealth table removida - monitoramento será feito externamente
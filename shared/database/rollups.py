@@ -0,0 +1,135 @@
+"""
+Incrementally maintained prediction rollups (per-minute and per-hour counts)
+"""
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from sqlalchemy import and_, delete, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from .models import PredictionRollup
+
+MINUTE_SECONDS = 60
+HOUR_SECONDS = 3600
+ROLLUP_BUCKET_SIZES = (MINUTE_SECONDS, HOUR_SECONDS)
+
+# Minute buckets are pruned after this long (hour buckets are kept); the default
+# keeps 24h windows accurate to the minute
+MINUTE_ROLLUP_RETENTION_SECONDS = int(os.getenv("PREDICTION_ROLLUP_MINUTE_RETENTION_HOURS", 26)) * HOUR_SECONDS
+MINUTE_ROLLUP_PRUNE_INTERVAL_SECONDS = 60
+_next_minute_prune_at = 0.0
+
+def bucket_start(timestamp: int, bucket_seconds: int) -> int:
+    """Start of the bucket containing a Unix timestamp"""
+    return timestamp - timestamp % bucket_seconds
+
+def minute_rollup_cutoff(now: Optional[int] = None) -> int:
+    """Oldest minute bucket kept by the retention"""
+    now = int(now if now is not None else time.time())
+    return bucket_start(now, MINUTE_SECONDS) - MINUTE_ROLLUP_RETENTION_SECONDS
+
+def rollup_window(since: int, now: Optional[int] = None):
+    """Filter selecting the prediction rollups that cover [since, now] exactly once.
+    
+    Minute buckets cover the time up to the first full hour, hour buckets the rest,
+    so long windows read few rows while staying accurate to the minute. Windows
+    starting before the minute retention use hour buckets only (accurate to the hour).
+    """
+    if since < minute_rollup_cutoff(now):
+        return and_(
+            PredictionRollup.bucket_seconds == HOUR_SECONDS,
+            PredictionRollup.bucket_start >= bucket_start(since, HOUR_SECONDS)
+        )
+    
+    first_full_hour = -(-since // HOUR_SECONDS) * HOUR_SECONDS
+    return or_(
+        and_(
+            PredictionRollup.bucket_seconds == HOUR_SECONDS,
+            PredictionRollup.bucket_start >= first_full_hour
+        ),
+        and_(
+            PredictionRollup.bucket_seconds == MINUTE_SECONDS,
+            PredictionRollup.bucket_start >= bucket_start(since, MINUTE_SECONDS),
+            PredictionRollup.bucket_start < first_full_hour
+        )
+    )
+
+def count_predictions_since(db: Session, since: int) -> int:
+    """Number of predictions logged since a Unix timestamp, read from the rollups"""
+    return int(db.query(
+        func.coalesce(func.sum(PredictionRollup.prediction_count), 0)
+    ).filter(rollup_window(since)).scalar())
+
+def aggregate_prediction_rollups(
+    rows: Iterable[Dict[str, Any]],
+    bucket_sizes: Sequence[int] = ROLLUP_BUCKET_SIZES
+) -> List[Dict[str, Any]]:
+    """Aggregate prediction log rows into rollup rows, one per bucket, series and version.
+    
+    Rows are returned sorted by key so concurrent upserts lock them in the same order.
+    """
+    rollups: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        created_at = row.get("created_at") or int(time.time())
+        for bucket_seconds in bucket_sizes:
+            key = (bucket_seconds, bucket_start(created_at, bucket_seconds), row["series_id"], row["model_version"])
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollup = rollups[key] = {
+                    "bucket_seconds": key[0],
+                    "bucket_start": key[1],
+                    "series_id": key[2],
+                    "model_version": key[3],
+                    "prediction_count": 0,
+                    "anomaly_count": 0,
+                    "total_latency_ms_sum": 0.0,
+                    "last_prediction_at": created_at
+                }
+            rollup["prediction_count"] += 1
+            rollup["anomaly_count"] += 1 if row.get("prediction") else 0
+            rollup["total_latency_ms_sum"] += row.get("total_latency_ms") or 0.0
+            rollup["last_prediction_at"] = max(rollup["last_prediction_at"], created_at)
+    
+    return [rollups[key] for key in sorted(rollups)]
+
+def prune_minute_rollups(db: Session, now: Optional[int] = None) -> int:
+    """Delete minute buckets older than the retention, returning how many were removed"""
+    result = db.execute(delete(PredictionRollup).where(
+        PredictionRollup.bucket_seconds == MINUTE_SECONDS,
+        PredictionRollup.bucket_start < minute_rollup_cutoff(now)
+    ))
+    return result.rowcount
+
+def upsert_prediction_rollups(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Add a batch of prediction log rows to the rollups with a single upsert.
+    
+    Expired minute buckets are pruned in the same transaction, at most once
+    per MINUTE_ROLLUP_PRUNE_INTERVAL_SECONDS.
+    """
+    global _next_minute_prune_at
+    
+    now = time.time()
+    if now >= _next_minute_prune_at:
+        prune_minute_rollups(db, int(now))
+        _next_minute_prune_at = now + MINUTE_ROLLUP_PRUNE_INTERVAL_SECONDS
+    
+    rollups = aggregate_prediction_rollups(rows)
+    if not rollups:
+        return
+    
+    statement = pg_insert(PredictionRollup).values(rollups)
+    excluded = statement.excluded
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[
+            PredictionRollup.bucket_seconds,
+            PredictionRollup.bucket_start,
+            PredictionRollup.series_id,
+            PredictionRollup.model_version
+        ],
+        set_={
+            "prediction_count": PredictionRollup.prediction_count + excluded.prediction_count,
+            "anomaly_count": PredictionRollup.anomaly_count + excluded.anomaly_count,
+            "total_latency_ms_sum": PredictionRollup.total_latency_ms_sum + excluded.total_latency_ms_sum,
+            "last_prediction_at": func.greatest(PredictionRollup.last_prediction_at, excluded.last_prediction_at)
+        }
+    ))
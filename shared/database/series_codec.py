@@ -0,0 +1,202 @@
+"""
+Compact binary encoding of training time series.
+
+Layout: a fixed header followed by a compressed payload holding the
+delta-encoded int64 timestamps and the float64 (or float32) values. Both
+arrays are byte-shuffled before compression so that the similar high-order
+bytes of neighbouring samples end up next to each other.
+"""
+import hashlib
+import os
+import struct
+import zlib
+from typing import Any, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import object_session
+from .models import TrainingData, TrainingDataChunk
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+MAGIC = b"TSB1"
+# magic, compression id, value dtype id, point count
+HEADER = struct.Struct("<4sBBQ")
+
+COMPRESSION_IDS = {"zlib": 1, "zstd": 2, "lz4": 3}
+VALUE_DTYPES = {"float64": (1, np.dtype("<f8")), "float32": (2, np.dtype("<f4"))}
+
+# "auto" picks zstd, then lz4, then zlib depending on what is installed
+TRAINING_DATA_COMPRESSION = os.getenv("TRAINING_DATA_COMPRESSION", "auto")
+TRAINING_DATA_VALUE_DTYPE = os.getenv("TRAINING_DATA_VALUE_DTYPE", "float64")
+
+def resolve_compression(compression: str) -> str:
+    """Map a configured compression name to an available codec"""
+    if compression == "auto":
+        if zstandard is not None:
+            return "zstd"
+        if lz4_frame is not None:
+            return "lz4"
+        return "zlib"
+    if compression not in COMPRESSION_IDS:
+        raise ValueError(f"Unknown compression '{compression}'")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package")
+    if compression == "lz4" and lz4_frame is None:
+        raise ValueError("lz4 compression requires the 'lz4' package")
+    return compression
+
+def _compress(payload: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    if compression == "lz4":
+        return lz4_frame.compress(payload)
+    return zlib.compress(payload, 6)
+
+def _decompress(payload: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("Decoding zstd training data requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if compression == "lz4":
+        if lz4_frame is None:
+            raise ValueError("Decoding lz4 training data requires the 'lz4' package")
+        return lz4_frame.decompress(payload)
+    return zlib.decompress(payload)
+
+def _shuffle(array: np.ndarray) -> bytes:
+    """Group the i-th byte of every element together"""
+    return array.view(np.uint8).reshape(len(array), array.itemsize).T.tobytes()
+
+def _unshuffle(buffer: bytes, dtype: np.dtype, count: int) -> np.ndarray:
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(dtype.itemsize, count).T.copy().view(dtype).ravel()
+
+def encode_series(
+    timestamps: Any,
+    values: Any,
+    compression: Optional[str] = None,
+    value_dtype: Optional[str] = None
+) -> bytes:
+    """Encode timestamps and values into the compact binary format"""
+    compression = resolve_compression(compression or TRAINING_DATA_COMPRESSION)
+    value_dtype = value_dtype or TRAINING_DATA_VALUE_DTYPE
+    if value_dtype not in VALUE_DTYPES:
+        raise ValueError(f"Unknown value dtype '{value_dtype}'")
+    dtype_id, dtype = VALUE_DTYPES[value_dtype]
+    
+    timestamps = np.asarray(timestamps, dtype="<i8")
+    values = np.asarray(values, dtype=dtype)
+    if len(timestamps) != len(values):
+        raise ValueError("Timestamps and values must have the same length")
+    
+    # First element is absolute, the rest are deltas (small and repetitive for regular series)
+    deltas = np.diff(timestamps, prepend=np.int64(0)) if len(timestamps) else timestamps
+    payload = _shuffle(np.ascontiguousarray(deltas)) + _shuffle(np.ascontiguousarray(values))
+    
+    header = HEADER.pack(MAGIC, COMPRESSION_IDS[compression], dtype_id, len(timestamps))
+    return header + _compress(payload, compression)
+
+def decode_series(blob: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode the binary format into int64 timestamps and float64 values"""
+    blob = bytes(blob)
+    if len(blob) < HEADER.size:
+        raise ValueError("Training data blob is truncated")
+    magic, compression_id, dtype_id, count = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Training data blob has an unknown format")
+    
+    compression = next((name for name, cid in COMPRESSION_IDS.items() if cid == compression_id), None)
+    dtype = next((dt for did, dt in VALUE_DTYPES.values() if did == dtype_id), None)
+    if compression is None or dtype is None:
+        raise ValueError("Training data blob has an unknown compression or value type")
+    
+    try:
+        payload = _decompress(blob[HEADER.size:], compression)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Training data blob is corrupted: {e}")
+    timestamp_bytes = count * 8
+    if len(payload) != timestamp_bytes + count * dtype.itemsize:
+        raise ValueError("Training data blob is corrupted")
+    
+    deltas = _unshuffle(payload[:timestamp_bytes], np.dtype("<i8"), count)
+    values = _unshuffle(payload[timestamp_bytes:], dtype, count)
+    return np.cumsum(deltas, dtype=np.int64), values.astype(np.float64, copy=False)
+
+class SeriesDigest:
+    """Content hash of a training series and its threshold.
+    
+    Points are hashed in their canonical int64/float64 form, so the digest
+    doesn't depend on the input encoding or on how the series was chunked.
+    """
+    
+    def __init__(self):
+        self._timestamps = hashlib.sha256()
+        self._values = hashlib.sha256()
+    
+    def update(self, timestamps, values) -> None:
+        """Add the next points of the series"""
+        self._timestamps.update(np.ascontiguousarray(timestamps, dtype="<i8").tobytes())
+        # Adding 0.0 folds -0.0 into 0.0
+        self._values.update((np.asarray(values, dtype="<f8") + 0.0).tobytes())
+    
+    def hexdigest(self, threshold: float) -> str:
+        """Digest of everything added so far combined with the threshold"""
+        digest = hashlib.sha256(self._timestamps.digest())
+        digest.update(self._values.digest())
+        digest.update(struct.pack("<d", float(threshold)))
+        return digest.hexdigest()
+
+def series_digest(timestamps, values, threshold: float) -> str:
+    """Content hash of a whole training series and its threshold"""
+    digest = SeriesDigest()
+    digest.update(timestamps, values)
+    return digest.hexdigest(threshold)
+
+def training_data_arrays(record) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the timestamps and values of a TrainingData row, whichever format it was stored in"""
+    # Retrained versions share the points stored for their source version
+    source_model_version = getattr(record, "source_model_version", None)
+    if source_model_version:
+        source = object_session(record).query(TrainingData).filter(
+            TrainingData.series_id == record.series_id,
+            TrainingData.model_version == source_model_version
+        ).first()
+        if source is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return training_data_arrays(source)
+    
+    if record.encoded_data is not None:
+        return decode_series(record.encoded_data)
+    
+    # Streamed uploads keep their points in training_data_chunks
+    if record.timestamps is None and record.values is None:
+        return read_training_data_chunks(object_session(record), record.series_id, record.model_version)
+    
+    # Legacy rows keep the series as JSON arrays
+    timestamps = record.timestamps if isinstance(record.timestamps, list) else []
+    values = record.values if isinstance(record.values, list) else []
+    return np.asarray(timestamps, dtype=np.int64), np.asarray(values, dtype=np.float64)
+
+def read_training_data_chunks(db, series_id: str, model_version: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode and concatenate the chunks of a streamed upload"""
+    chunks = db.query(TrainingDataChunk.encoded_data).filter(
+        TrainingDataChunk.series_id == series_id,
+        TrainingDataChunk.model_version == model_version
+    ).order_by(TrainingDataChunk.chunk_index).all()
+    
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    
+    decoded = [decode_series(chunk.encoded_data) for chunk in chunks]
+    return (
+        np.concatenate([timestamps for timestamps, _ in decoded]),
+        np.concatenate([values for _, values in decoded])
+    )
@@ -0,0 +1,175 @@
+"""
+Write-behind buffer that batches ORM rows and persists them with multi-row INSERTs
+"""
+import asyncio
+import logging
+from typing import Callable, Dict, Any, Iterable, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from .database import get_db_session
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the stream when the buffer is stopped
+_STOP = object()
+
+class WriteBehindBuffer:
+    """Asynchronous write-behind queue for append-only tables.
+    
+    Rows are queued as plain dicts and flushed by a background task with one
+    multi-row INSERT whenever `max_batch_size` rows are pending or
+    `flush_interval_seconds` elapsed since the first pending row. The queue is
+    bounded by `max_pending`: once full, `put` waits for the flusher to catch up
+    (backpressure) instead of growing without limit.
+    
+    `on_flush(db, batch)`, if given, runs in the same transaction as each
+    batch INSERT, e.g. to maintain aggregates of the rows incrementally.
+    
+    A failed flush is retried up to `max_retries` times with exponential
+    backoff from `retry_backoff_seconds` (the transaction is rolled back, so a
+    retry can't duplicate rows); only then is the batch dropped and counted
+    in `rows_failed`. Rows keep queueing behind the retries, so backpressure
+    applies while the database is unavailable.
+    """
+    
+    def __init__(
+        self,
+        model,
+        max_batch_size: int = 500,
+        flush_interval_seconds: float = 0.5,
+        max_pending: int = 20000,
+        on_flush: Optional[Callable[[Session, List[Dict[str, Any]]], None]] = None,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.5
+    ):
+        self.model = model
+        self.on_flush = on_flush
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        
+        # Running totals, only ever incremented
+        self.rows_enqueued = 0
+        self.rows_flushed = 0
+        self.rows_failed = 0
+        self.flushes = 0
+        self.flush_retries = 0
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting to be flushed"""
+        return self._queue.qsize() if self._queue is not None else 0
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher is active"""
+        return self._task is not None and not self._task.done()
+    
+    async def start(self) -> None:
+        """Start the background flusher (must be called from the serving event loop)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Flush everything still queued and stop the flusher"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+    
+    async def put(self, row: Dict[str, Any]) -> None:
+        """Queue a row for persistence, waiting if the buffer is full"""
+        if not self.running:
+            raise RuntimeError("Write-behind buffer is not running")
+        await self._queue.put(row)
+        self.rows_enqueued += 1
+    
+    async def put_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Queue several rows for persistence"""
+        for row in rows:
+            await self.put(row)
+    
+    def get_stats(self) -> dict:
+        """Get buffer counters"""
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rows_enqueued": self.rows_enqueued,
+            "rows_flushed": self.rows_flushed,
+            "rows_failed": self.rows_failed,
+            "flushes": self.flushes,
+            "flush_retries": self.flush_retries
+        }
+    
+    async def _run(self) -> None:
+        """Collect rows into batches and flush them until stopped"""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            
+            batch = [first]
+            deadline = loop.time() + self.flush_interval_seconds
+            
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    row = self._queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            
+            await self._flush(batch)
+        
+        # Drain anything queued after the stop marker
+        remaining = []
+        while not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not _STOP:
+                remaining.append(row)
+        for start in range(0, len(remaining), self.max_batch_size):
+            await self._flush(remaining[start:start + self.max_batch_size])
+    
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Persist a batch without blocking the event loop, retrying with backoff"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                await asyncio.to_thread(self._insert_rows, batch)
+                self.rows_flushed += len(batch)
+                self.flushes += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.rows_failed += len(batch)
+                    logger.error(f"Failed to flush {len(batch)} {self.model.__tablename__} rows after {attempt + 1} attempts: {e}")
+                    return
+                self.flush_retries += 1
+                delay = self.retry_backoff_seconds * 2 ** attempt
+                logger.warning(f"Flush of {len(batch)} {self.model.__tablename__} rows failed, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+    
+    def _insert_rows(self, batch: List[Dict[str, Any]]) -> None:
+        """Write a batch with a single multi-row INSERT"""
+        with get_db_session() as db:
+            db.execute(insert(self.model), batch)
+            if self.on_flush is not None:
+                self.on_flush(db, batch)
@@ -0,0 +1,11 @@
+"""
+Incremental parsing of uploaded time series.
+"""
+
+from .series_parser import SeriesChunkParser, SUPPORTED_FORMATS, parse_timestamps
+
+__all__ = [
+    "SeriesChunkParser",
+    "SUPPORTED_FORMATS",
+    "parse_timestamps"
+]
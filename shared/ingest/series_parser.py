@@ -0,0 +1,142 @@
+"""
+Chunked parser turning a byte stream of NDJSON or CSV lines into NumPy arrays
+"""
+import json
+import warnings
+from typing import List, Tuple
+import numpy as np
+
+SUPPORTED_FORMATS = ("ndjson", "csv")
+
+Chunk = Tuple[np.ndarray, np.ndarray]
+
+def parse_timestamps(column: np.ndarray) -> np.ndarray:
+    """Convert a text column of Unix seconds or ISO-8601 datetimes to int64 Unix seconds.
+    
+    Datetimes without an offset (e.g. `2011-07-01 00:00:01`) are taken as UTC.
+    The whole column is converted at once by NumPy, not row by row.
+    """
+    try:
+        return column.astype(np.int64)
+    except ValueError:
+        pass
+    
+    with warnings.catch_warnings():
+        # Explicit UTC offsets are applied; NumPy warns that it doesn't keep them
+        warnings.simplefilter("ignore", UserWarning)
+        return column.astype(np.str_).astype("datetime64[s]").astype(np.int64)
+
+class SeriesChunkParser:
+    """Parse an upload incrementally into (timestamps, values) chunks.
+    
+    Bytes are fed as they arrive; complete lines are buffered and converted
+    to int64/float64 arrays every `chunk_points` lines, so memory use depends
+    on the chunk size, not on the length of the upload.
+    
+    NDJSON lines are objects with `timestamp` and `value` keys or
+    `[timestamp, value]` pairs. CSV lines are `timestamp,value` with Unix
+    timestamps or datetimes (see parse_timestamps); a first line with
+    neither a valid timestamp nor a numeric value is taken as a header and skipped.
+    Errors report line numbers of the upload, counting headers and blank lines.
+    """
+    
+    def __init__(self, fmt: str, chunk_points: int = 100000):
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}' (expected one of {', '.join(SUPPORTED_FORMATS)})")
+        self.fmt = fmt
+        self.chunk_points = chunk_points
+        self.lines_parsed = 0
+        
+        self._partial = b""
+        self._lines: List[bytes] = []
+        self._line_numbers: List[int] = []
+        self._line_count = 0
+    
+    def feed(self, data: bytes) -> List[Chunk]:
+        """Consume more bytes, returning the chunks completed by them"""
+        *complete, self._partial = (self._partial + data).split(b"\n")
+        self._add_lines(complete)
+        
+        chunks = []
+        while len(self._lines) >= self.chunk_points:
+            chunks.append(self._parse(self._lines[:self.chunk_points], self._line_numbers[:self.chunk_points]))
+            self._lines = self._lines[self.chunk_points:]
+            self._line_numbers = self._line_numbers[self.chunk_points:]
+        return chunks
+    
+    def close(self) -> List[Chunk]:
+        """Flush the last (possibly partial) chunk at the end of the stream"""
+        self._add_lines([self._partial])
+        self._partial = b""
+        
+        chunks = []
+        if self._lines:
+            chunks.append(self._parse(self._lines, self._line_numbers))
+            self._lines = []
+            self._line_numbers = []
+        return chunks
+    
+    def _add_lines(self, lines: List[bytes]) -> None:
+        for line in lines:
+            self._line_count += 1
+            line = line.strip()
+            if not line:
+                continue
+            if self._line_count == 1 and self.fmt == "csv" and self._is_header(line):
+                continue
+            self._lines.append(line)
+            self._line_numbers.append(self._line_count)
+    
+    @staticmethod
+    def _is_header(line: bytes) -> bool:
+        """Whether a CSV line has neither a timestamp nor a numeric value (e.g. `timestamp,value`)"""
+        timestamp_field, _, value_field = line.partition(b",")
+        try:
+            parse_timestamps(np.array([timestamp_field.strip()]))
+            return False
+        except ValueError:
+            pass
+        try:
+            float(value_field)
+            return False
+        except ValueError:
+            return True
+    
+    def _parse(self, lines: List[bytes], line_numbers: List[int]) -> Chunk:
+        """Convert a block of lines into arrays"""
+        self.lines_parsed += len(lines)
+        if self.fmt == "ndjson":
+            return self._parse_ndjson(lines, line_numbers)
+        return self._parse_csv(lines, line_numbers)
+    
+    @staticmethod
+    def _parse_ndjson(lines: List[bytes], line_numbers: List[int]) -> Chunk:
+        timestamps = np.empty(len(lines), dtype=np.int64)
+        values = np.empty(len(lines), dtype=np.float64)
+        for i, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    timestamps[i], values[i] = record["timestamp"], record["value"]
+                else:
+                    timestamps[i], values[i] = record
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"Invalid NDJSON record on line {line_numbers[i]}: {e}")
+        return timestamps, values
+    
+    @staticmethod
+    def _parse_csv(lines: List[bytes], line_numbers: List[int]) -> Chunk:
+        # Every line must have exactly two fields - checking only the total would let
+        # rows with extra and missing fields cancel out and shift into the wrong columns
+        bad_lines = np.flatnonzero(np.char.count(np.array(lines, dtype=np.bytes_), b",") != 1)
+        if len(bad_lines):
+            raise ValueError(f"Expected 'timestamp,value' on line {line_numbers[bad_lines[0]]}")
+        
+        # Vectorized text -> number conversion of each column
+        columns = np.array(b",".join(lines).split(b","), dtype=np.bytes_).reshape(len(lines), 2)
+        try:
+            timestamps = parse_timestamps(np.char.strip(columns[:, 0]))
+            values = np.char.strip(columns[:, 1]).astype(np.float64)
+        except ValueError as e:
+            raise ValueError(f"Invalid CSV data between lines {line_numbers[0]} and {line_numbers[-1]}: {e}")
+        return timestamps, values
@@ -0,0 +1,11 @@
+"""
+Background job execution utilities shared by the services.
+"""
+
+from .job_queue import Job, JobQueue, JobQueueFullError
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "JobQueueFullError"
+]
@@ -0,0 +1,170 @@
+"""
+In-process job queue with a bounded worker pool and job status tracking
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+@dataclass
+class Job:
+    """A unit of work and its progress"""
+    job_id: str
+    func: Callable[..., Any] = field(repr=False)
+    args: tuple = field(default=(), repr=False)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    status: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Status view of the job"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            **self.metadata,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+class JobQueue:
+    """Asynchronous job queue served by a fixed number of workers.
+    
+    Jobs are plain (blocking) callables run on `executor` (the default thread
+    pool when None), at most `workers` at a time. At most `max_pending` jobs may
+    wait; further submissions raise JobQueueFullError instead of queueing
+    without bound. The status of the last `retention` finished jobs is kept.
+    """
+    
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 100,
+        retention: int = 1000,
+        executor: Optional[Executor] = None
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.executor = executor
+        
+        # Outcome counts since start - they only grow
+        self.submitted = 0
+        self.rejected = 0
+        self.succeeded = 0
+        self.failed = 0
+        
+        self._jobs: Dict[str, Job] = {}
+        self._finished: Deque[str] = deque()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+    
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+    
+    @property
+    def running(self) -> bool:
+        """Whether the workers are active"""
+        return any(not task.done() for task in self._tasks)
+    
+    async def start(self) -> None:
+        """Start the workers (must be called from the serving event loop)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def stop(self) -> None:
+        """Stop the workers; queued jobs are abandoned"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    def submit(self, func: Callable[..., Any], *args, metadata: Optional[Dict[str, Any]] = None) -> Job:
+        """Queue func(*args) and return its job right away"""
+        if not self.running:
+            raise RuntimeError("Job queue is not running")
+        
+        job = Job(job_id=uuid.uuid4().hex, func=func, args=args, metadata=metadata or {})
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise JobQueueFullError(f"Job queue is full ({self.max_pending} pending jobs)")
+        
+        self._jobs[job.job_id] = job
+        self.submitted += 1
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id (None if unknown or expired)"""
+        return self._jobs.get(job_id)
+    
+    def get_stats(self) -> dict:
+        """Get queue counters"""
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "in_progress": sum(1 for job in self._jobs.values() if job.status == RUNNING),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "succeeded": self.succeeded,
+            "failed": self.failed
+        }
+    
+    async def _worker(self) -> None:
+        """Run queued jobs one at a time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = RUNNING
+            job.started_at = time.time()
+            try:
+                job.result = await loop.run_in_executor(self.executor, job.func, *job.args)
+                job.status = SUCCEEDED
+                self.succeeded += 1
+            except Exception as e:
+                job.error = str(e)
+                job.status = FAILED
+                self.failed += 1
+                logger.warning(f"Job {job.job_id} failed: {e}")
+            finally:
+                job.finished_at = time.time()
+                # Release the job's input payload once it ran
+                job.args = ()
+                self._retire(job)
+    
+    def _retire(self, job: Job) -> None:
+        """Record a finished job, forgetting the oldest finished ones beyond retention"""
+        self._finished.append(job.job_id)
+        while len(self._finished) > self.retention:
+            self._jobs.pop(self._finished.popleft(), None)
@@ -0,0 +1,28 @@
+"""
+In-process metrics collection shared by the services.
+"""
+
+from .latency_sketch import LatencySketch, WindowedLatencySketch
+from .prometheus import (
+    CONTENT_TYPE_LATEST,
+    DEFAULT_BUCKETS,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry
+)
+from .http import RequestMetricsMiddleware
+
+__all__ = [
+    "LatencySketch",
+    "WindowedLatencySketch",
+    "CONTENT_TYPE_LATEST",
+    "DEFAULT_BUCKETS",
+    "REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "RequestMetricsMiddleware"
+]
@@ -0,0 +1,45 @@
+"""
+ASGI middleware recording request durations per route
+"""
+import time
+from .prometheus import Histogram
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests until the response is fully sent",
+    ("method", "route", "status")
+)
+
+class RequestMetricsMiddleware:
+    """Observe every HTTP request in `http_request_duration_seconds`.
+    
+    Requests are labelled with the route template (e.g. /predict/{series_id})
+    rather than the raw path, so label cardinality stays bounded.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start = time.perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,172 @@
+"""
+Mergeable latency quantile sketches with relative-error guarantees
+"""
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+class LatencySketch:
+    """Quantile sketch over log-spaced buckets (as in DDSketch).
+    
+    A value v lands in bucket ceil(log_gamma(v)) with gamma = (1 + a) / (1 - a),
+    so every reported quantile is within a relative error `a` of a true sample.
+    Memory grows with the logarithm of the value range, not with the number of
+    samples, and sketches with the same accuracy merge by adding bucket counts.
+    """
+    
+    # Values at or below this (in ms) are counted as zero
+    MIN_VALUE = 1e-6
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float, count: int = 1) -> None:
+        """Record `count` samples of a value"""
+        if count <= 0 or value is None or math.isnan(value):
+            return
+        value = float(value)
+        if value <= self.MIN_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        """Add another sketch's samples to this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, bin_count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + bin_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1), or None if the sketch is empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        
+        cumulative = self.zero_count
+        for index in sorted(self.bins):
+            cumulative += self.bins[index]
+            if cumulative > rank:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+    
+    def summary(self) -> dict:
+        """Count, average and p50/p95/p99/max rounded for reporting (values None when empty)"""
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 2) if value is not None else None
+        
+        return {
+            "count": self.count,
+            "avg": rounded(self.sum / self.count) if self.count else None,
+            "p50": rounded(self.quantile(0.50)),
+            "p95": rounded(self.quantile(0.95)),
+            "p99": rounded(self.quantile(0.99)),
+            "max": rounded(self.max) if self.count else None
+        }
+    
+    def to_dict(self) -> dict:
+        """Serialize for storage (JSON-compatible)"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(index): bin_count for index, bin_count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencySketch":
+        """Rebuild a sketch serialized with to_dict"""
+        sketch = cls(relative_accuracy=data["relative_accuracy"])
+        sketch.bins = {int(index): bin_count for index, bin_count in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if data["count"]:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+class WindowedLatencySketch:
+    """Latency sketches per time bucket, merged on demand over a trailing window.
+    
+    Samples go to the sketch of the current bucket; buckets older than
+    `retention_buckets` are dropped. Thread-safe, since training runs on
+    worker threads.
+    """
+    
+    def __init__(self, bucket_seconds: int = 60, retention_buckets: int = 60, relative_accuracy: float = 0.01):
+        self.bucket_seconds = bucket_seconds
+        self.retention_buckets = retention_buckets
+        self.relative_accuracy = relative_accuracy
+        self._buckets: Dict[int, LatencySketch] = {}
+        self._updated = set()
+        self._lock = threading.Lock()
+    
+    def _bucket_start(self, now: float) -> int:
+        timestamp = int(now)
+        return timestamp - timestamp % self.bucket_seconds
+    
+    def add(self, value: float, count: int = 1, now: Optional[float] = None) -> None:
+        """Record samples in the current bucket"""
+        start = self._bucket_start(now if now is not None else time.time())
+        with self._lock:
+            sketch = self._buckets.get(start)
+            if sketch is None:
+                sketch = self._buckets[start] = LatencySketch(self.relative_accuracy)
+                oldest = start - self.retention_buckets * self.bucket_seconds
+                for expired in [bucket for bucket in self._buckets if bucket <= oldest]:
+                    del self._buckets[expired]
+                    self._updated.discard(expired)
+            sketch.add(value, count)
+            self._updated.add(start)
+    
+    def merged(self, window_seconds: int, now: Optional[float] = None) -> LatencySketch:
+        """Merge the buckets overlapping the last `window_seconds`"""
+        since = (now if now is not None else time.time()) - window_seconds
+        result = LatencySketch(self.relative_accuracy)
+        with self._lock:
+            for start, sketch in self._buckets.items():
+                if start + self.bucket_seconds > since:
+                    result.merge(sketch)
+        return result
+    
+    def drain_updated(self) -> Dict[int, dict]:
+        """Serialized sketches of the buckets changed since the last call, by bucket start"""
+        with self._lock:
+            updated = {start: self._buckets[start].to_dict() for start in self._updated if start in self._buckets}
+            self._updated.clear()
+        return updated
+    
+    def mark_updated(self, bucket_starts) -> None:
+        """Report buckets as changed again, e.g. after persisting them failed"""
+        with self._lock:
+            self._updated.update(start for start in bucket_starts if start in self._buckets)
@@ -0,0 +1,275 @@
+"""
+Minimal in-process metrics registry rendered in the Prometheus text format (0.0.4)
+"""
+import bisect
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from sub-millisecond cache hits up to slow training requests
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_value(value: float) -> str:
+    """Format a sample value as Prometheus expects (integers without a fraction, +Inf/NaN spelled out)"""
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+def _escape_label_value(value: str) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+class MetricsRegistry:
+    """Collection of metrics rendered together by a /metrics endpoint"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, "Metric"] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: "Metric") -> None:
+        """Add a metric, rejecting duplicate names"""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+    
+    def unregister(self, metric: "Metric") -> None:
+        """Remove a metric"""
+        with self._lock:
+            self._metrics.pop(metric.name, None)
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Default registry served by each service's /metrics endpoint
+REGISTRY = MetricsRegistry()
+
+class _Value:
+    """Child of a counter or gauge: a float, or a callback read at scrape time"""
+    
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], Optional[float]]] = None
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+    
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+    
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """Read the value from `function` at scrape time (None omits the sample)"""
+        self._function = function
+    
+    def get(self) -> Optional[float]:
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+class _HistogramValue:
+    """Child of a histogram: per-bucket counts and the sum of observations"""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+    
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of a block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+    
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+class Metric:
+    """Base class of labelled metrics.
+    
+    Unlabelled metrics have a single child used directly through the metric;
+    labelled ones create a child per label value combination on first use.
+    """
+    
+    type_name = "untyped"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[MetricsRegistry] = REGISTRY
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        if registry is not None:
+            registry.register(self)
+    
+    def _new_child(self):
+        raise NotImplementedError
+    
+    def labels(self, *values, **labels):
+        """Get the child for a combination of label values (positional or by name)"""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+    
+    def _only_child(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} is labelled, use labels() first")
+        return self._children[()]
+    
+    def _samples(self) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        """Yield (name suffix, labels, value) of every sample"""
+        raise NotImplementedError
+    
+    def render(self) -> List[str]:
+        """Lines of this metric in the text exposition format"""
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.type_name}"
+        ]
+        try:
+            for suffix, labels, value in self._samples():
+                lines.append(f"{self.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        except Exception as e:
+            logger.warning(f"Failed to collect metric {self.name}: {e}")
+        return lines
+    
+    def _children_by_labels(self):
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in children:
+            yield tuple(zip(self.labelnames, key)), child
+
+class _ScalarMetric(Metric):
+    def _new_child(self):
+        return _Value()
+    
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """Read the (unlabelled) value from `function` at scrape time"""
+        self._only_child().set_function(function)
+    
+    def _samples(self):
+        for labels, child in self._children_by_labels():
+            value = child.get()
+            if value is not None:
+                yield "", labels, value
+
+class Counter(_ScalarMetric):
+    """Monotonically increasing value (name it with the conventional _total suffix)"""
+    
+    type_name = "counter"
+    
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """Read the (unlabelled) value from `function` at scrape time.
+        
+        The callback must return a running total that only resets with the
+        process, as Prometheus reads any decrease as a counter reset; values
+        that can go down belong in a Gauge.
+        """
+        super().set_function(function)
+    
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._only_child().inc(amount)
+
+class Gauge(_ScalarMetric):
+    """Value that can go up and down"""
+    
+    type_name = "gauge"
+    
+    def set(self, value: float) -> None:
+        self._only_child().set(value)
+    
+    def inc(self, amount: float = 1.0) -> None:
+        self._only_child().inc(amount)
+    
+    def dec(self, amount: float = 1.0) -> None:
+        self._only_child().inc(-amount)
+
+class Histogram(Metric):
+    """Distribution of observations over fixed cumulative buckets"""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional[MetricsRegistry] = REGISTRY
+    ):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+        super().__init__(name, documentation, labelnames, registry)
+    
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+    
+    def observe(self, value: float) -> None:
+        self._only_child().observe(value)
+    
+    def time(self):
+        """Observe the duration of a block in seconds"""
+        return self._only_child().time()
+    
+    def _samples(self):
+        for labels, child in self._children_by_labels():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", labels + (("le", _format_value(bound)),), cumulative
+            yield "_count", labels, cumulative
+            yield "_sum", labels, total
@@ -6,10 +6,34 @@ Anomaly detection specific models and ML implementation.
 from .ml_model import AnomalyDetectionModel
 
 # Training models
-from .train_models import AnomalyTrainRequest, AnomalyTrainResponse, TrainData, TrainResponse
+from .train_models import (
+    AnomalyTrainRequest,
+    AnomalyTrainResponse,
+    AnomalyRetrainRequest,
+    AnomalyRetrainResponse,
+    AnomalyBatchTrainItem,
+    AnomalyBatchTrainRequest,
+    AnomalyBatchTrainResult,
+    AnomalyBatchTrainResponse,
+    AnomalyTrainJobResponse,
+    AnomalyTrainJobStatus,
+    TrainData,
+    TrainResponse
+)
 
 # Prediction models  
-from .predict_models import AnomalyPredictRequest, AnomalyPredictResponse, PredictData, PredictResponse
+from .predict_models import (
+    AnomalyPredictRequest,
+    AnomalyPredictResponse,
+    AnomalyBatchPredictRequest,
+    AnomalyBatchPredictResponse,
+    AnomalyBulkPredictItem,
+    AnomalyBulkPredictRequest,
+    AnomalyBulkPredictResult,
+    AnomalyBulkPredictResponse,
+    PredictData,
+    PredictResponse
+)
 
 # Visualization models
 from .plot_models import PlotDataPoint, AnomalyPlotResponse, PlotResponse
@@ -21,12 +45,26 @@ __all__ = [
     # Training
     "AnomalyTrainRequest",
     "AnomalyTrainResponse", 
+    "AnomalyRetrainRequest",
+    "AnomalyRetrainResponse",
+    "AnomalyBatchTrainItem",
+    "AnomalyBatchTrainRequest",
+    "AnomalyBatchTrainResult",
+    "AnomalyBatchTrainResponse",
+    "AnomalyTrainJobResponse",
+    "AnomalyTrainJobStatus",
     "TrainData",
     "TrainResponse",
     
     # Prediction
     "AnomalyPredictRequest",
     "AnomalyPredictResponse",
+    "AnomalyBatchPredictRequest",
+    "AnomalyBatchPredictResponse",
+    "AnomalyBulkPredictItem",
+    "AnomalyBulkPredictRequest",
+    "AnomalyBulkPredictResult",
+    "AnomalyBulkPredictResponse",
     "PredictData", 
     "PredictResponse",
     
@@ -35,6 +35,18 @@ class AnomalyDetectionModel(TimeSeriesMLModel):
         self._mark_as_trained()
         return self
 
+    @classmethod
+    def from_statistics(cls, mean: float, std: float, threshold: float = 3.0) -> "AnomalyDetectionModel":
+        """Create a trained model from precomputed mean/std (no training data is kept)"""
+        if std <= 0:
+            raise ValueError("Standard deviation is zero - cannot detect anomalies")
+        
+        model = cls(threshold=threshold)
+        model.mean = float(mean)
+        model.std = float(std)
+        model._mark_as_trained()
+        return model
+    
     def predict(self, data_point: DataPoint) -> bool:
         """Predict if a data point is an anomaly using 3-sigma rule"""
         self.validate_model_trained()
@@ -62,6 +74,15 @@ class AnomalyDetectionModel(TimeSeriesMLModel):
             "threshold_used": self.threshold
         }
     
+    def predict_batch(self, values: np.ndarray) -> np.ndarray:
+        """Predict anomalies for an array of values in a single vectorized pass"""
+        self.validate_model_trained()
+        
+        values_array = np.asarray(values, dtype=np.float64)
+        
+        # Same 3-sigma rule as predict(), applied element-wise
+        return np.abs(values_array - self.mean) > self.threshold * self.std
+    
     def predict_time_series(self, data: TimeSeries) -> list[dict]:
         """Predict anomalies for an entire time series"""
         self.validate_model_trained()
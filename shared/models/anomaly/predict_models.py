@@ -1,5 +1,6 @@
 from pydantic import Field, ConfigDict
-from ...core.base_models import BaseMLRequestModel, BaseMLResponseModel
+from typing import List, Optional
+from ...core.base_models import BaseAPIModel, BaseMLRequestModel, BaseMLResponseModel, BaseResponseModel
 from ...core.data_models import DataPoint
 
 class AnomalyPredictRequest(BaseMLRequestModel):
@@ -48,6 +49,99 @@ class AnomalyPredictResponse(BaseMLResponseModel):
         }
     )
 
+class AnomalyBatchPredictRequest(BaseMLRequestModel):
+    """Batch prediction request for many data points of a single series"""
+    timestamps: List[int] = Field(..., description="Unix timestamps of the data points")
+    values: List[float] = Field(..., description="Values to check for anomalies")
+    
+    def validate_common_constraints(self) -> None:
+        """Validate batch prediction data constraints"""
+        super().validate_common_constraints()
+        
+        if len(self.timestamps) != len(self.values):
+            raise ValueError("Timestamps and values must have the same length")
+        
+        if not self.values:
+            raise ValueError("Batch must contain at least one data point")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "timestamps": [1694336580, 1694336640, 1694336700],
+                "values": [45.2, 44.8, 97.3]
+            }
+        }
+    )
+
+class AnomalyBatchPredictResponse(BaseMLResponseModel):
+    """Batch prediction response for anomaly detection"""
+    anomalies: List[bool] = Field(..., description="Anomaly flag per data point, in request order")
+    anomaly_count: int = Field(..., description="Number of data points flagged as anomalies")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "anomalies": [False, False, True],
+                "anomaly_count": 1,
+                "model_version": "v1",
+                "timestamp": 1704110400
+            }
+        }
+    )
+
+class AnomalyBulkPredictItem(BaseAPIModel):
+    """Single data point of a cross-series bulk prediction request"""
+    series_id: str = Field(..., description="Identifier of the series the data point belongs to")
+    timestamp: str = Field(..., description="Timestamp of the data point")
+    value: float = Field(..., description="Value to check for anomaly")
+
+class AnomalyBulkPredictRequest(BaseMLRequestModel):
+    """Bulk prediction request mixing data points of many series"""
+    items: List[AnomalyBulkPredictItem] = Field(..., description="Data points to score, possibly from different series")
+    
+    def validate_common_constraints(self) -> None:
+        """Validate bulk prediction data constraints"""
+        super().validate_common_constraints()
+        
+        if not self.items:
+            raise ValueError("Bulk request must contain at least one item")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {"series_id": "sensor_001", "timestamp": "1694336580", "value": 45.2},
+                    {"series_id": "sensor_002", "timestamp": "1694336580", "value": 12.7}
+                ]
+            }
+        }
+    )
+
+class AnomalyBulkPredictResult(BaseAPIModel):
+    """Per-item result of a bulk prediction"""
+    series_id: str = Field(..., description="Identifier of the series")
+    anomaly: Optional[bool] = Field(None, description="Whether the data point is an anomaly (null on error)")
+    model_version: Optional[str] = Field(None, description="Version of the model used (null on error)")
+    error: Optional[str] = Field(None, description="Error description if the item could not be scored")
+
+class AnomalyBulkPredictResponse(BaseResponseModel):
+    """Bulk prediction response - results are in the same order as the request items"""
+    results: List[AnomalyBulkPredictResult] = Field(..., description="Per-item results, in request order")
+    error_count: int = Field(..., description="Number of items that could not be scored")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "results": [
+                    {"series_id": "sensor_001", "anomaly": False, "model_version": "v3", "error": None},
+                    {"series_id": "sensor_002", "anomaly": None, "model_version": None, "error": "Model for series sensor_002 not found. Train model first."}
+                ],
+                "error_count": 1,
+                "timestamp": 1704110400
+            }
+        }
+    )
+
 # Backwards compatibility aliases
 PredictData = AnomalyPredictRequest
 PredictResponse = AnomalyPredictResponse
\ No newline at end of file
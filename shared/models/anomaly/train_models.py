@@ -1,6 +1,6 @@
 from pydantic import Field, ConfigDict
-from typing import List
-from ...core.base_models import BaseMLRequestModel, BaseMLResponseModel
+from typing import List, Optional
+from ...core.base_models import BaseAPIModel, BaseMLRequestModel, BaseMLResponseModel, BaseResponseModel
 from ...core.data_models import TimeSeries
 
 class AnomalyTrainRequest(BaseMLRequestModel):
@@ -48,6 +48,7 @@ class AnomalyTrainResponse(BaseMLResponseModel):
     series_id: str = Field(..., description="Identifier of the trained series")
     # model_version is inherited from BaseMLResponseModel
     points_used: int = Field(..., description="Number of data points used in training")
+    deduplicated: bool = Field(False, description="True if the data and threshold matched an existing version, which is (re-)activated and returned without training")
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -60,6 +61,118 @@ class AnomalyTrainResponse(BaseMLResponseModel):
         }
     )
 
+class AnomalyRetrainRequest(BaseMLRequestModel):
+    """Request to derive a new model version with another threshold from a stored version"""
+    threshold: float = Field(..., description="New anomaly detection threshold (sigma)")
+    model_version: Optional[str] = Field(None, description="Version to derive from (default: the active model)")
+    
+    def validate_common_constraints(self) -> None:
+        """Validate retraining constraints"""
+        super().validate_common_constraints()
+        
+        if self.threshold <= 0:
+            raise ValueError("Threshold must be positive")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "threshold": 2.5,
+                "model_version": "v3"
+            }
+        }
+    )
+
+class AnomalyRetrainResponse(AnomalyTrainResponse):
+    """Retraining response for anomaly detection"""
+    source_model_version: str = Field(..., description="Version whose statistics and training data were reused")
+
+class AnomalyBatchTrainItem(AnomalyTrainRequest):
+    """Training data of one series inside a batch training request"""
+    series_id: str = Field(..., description="Identifier of the series to train")
+
+class AnomalyBatchTrainRequest(BaseMLRequestModel):
+    """Batch training request covering many series"""
+    items: List[AnomalyBatchTrainItem] = Field(..., description="Series to train, each with its own data and threshold")
+    
+    def validate_common_constraints(self) -> None:
+        """Validate batch training constraints"""
+        super().validate_common_constraints()
+        
+        if not self.items:
+            raise ValueError("Batch request must contain at least one series")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {"series_id": "sensor_001", "timestamps": [1694336400, 1694336460, 1694336520], "values": [42.5, 43.1, 41.8]},
+                    {"series_id": "sensor_002", "timestamps": [1694336400, 1694336460, 1694336520], "values": [12.1, 12.9, 11.7], "threshold": 2.5}
+                ]
+            }
+        }
+    )
+
+class AnomalyBatchTrainResult(BaseAPIModel):
+    """Per-series result of a batch training request"""
+    series_id: str = Field(..., description="Identifier of the series")
+    model_version: Optional[str] = Field(None, description="Version of the trained model (null on error)")
+    points_used: Optional[int] = Field(None, description="Number of data points used in training (null on error)")
+    deduplicated: bool = Field(False, description="True if an existing version was (re-)activated instead of training")
+    error: Optional[str] = Field(None, description="Error description if the series could not be trained")
+
+class AnomalyBatchTrainResponse(BaseResponseModel):
+    """Batch training response - results are in the same order as the request items"""
+    results: List[AnomalyBatchTrainResult] = Field(..., description="Per-series results, in request order")
+    trained_count: int = Field(..., description="Number of series trained")
+    error_count: int = Field(..., description="Number of series that could not be trained")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "results": [
+                    {"series_id": "sensor_001", "model_version": "v4", "points_used": 3, "error": None},
+                    {"series_id": "sensor_002", "model_version": None, "points_used": None, "error": "Constant values detected - cannot train model"}
+                ],
+                "trained_count": 1,
+                "error_count": 1,
+                "timestamp": 1704110400
+            }
+        }
+    )
+
+class AnomalyTrainJobResponse(BaseResponseModel):
+    """Accepted asynchronous training job"""
+    job_id: str = Field(..., description="Identifier to poll with GET /jobs/{job_id}")
+    series_id: str = Field(..., description="Identifier of the series being trained")
+    status: str = Field(..., description="Job status: queued, running, succeeded or failed")
+
+class AnomalyTrainJobStatus(BaseResponseModel):
+    """Progress and outcome of an asynchronous training job"""
+    job_id: str = Field(..., description="Job identifier")
+    series_id: str = Field(..., description="Identifier of the series being trained")
+    status: str = Field(..., description="Job status: queued, running, succeeded or failed")
+    submitted_at: float = Field(..., description="Unix time the job was accepted")
+    started_at: Optional[float] = Field(None, description="Unix time a worker picked the job up")
+    finished_at: Optional[float] = Field(None, description="Unix time the job finished")
+    result: Optional[AnomalyTrainResponse] = Field(None, description="Training result once succeeded")
+    error: Optional[str] = Field(None, description="Error description if the job failed")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "job_id": "5f0c6a4f1e9b4b7f9d7f1f6f2b9e6c1a",
+                "series_id": "sensor_001",
+                "status": "succeeded",
+                "submitted_at": 1704110400.12,
+                "started_at": 1704110400.15,
+                "finished_at": 1704110401.02,
+                "result": {"series_id": "sensor_001", "model_version": "v2", "points_used": 100, "timestamp": 1704110401},
+                "error": None,
+                "timestamp": 1704110405
+            }
+        }
+    )
+
 # Backwards compatibility aliases
 TrainData = AnomalyTrainRequest
 TrainResponse = AnomalyTrainResponse
\ No newline at end of file
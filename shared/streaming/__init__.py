@@ -0,0 +1,10 @@
+"""
+Live event streaming utilities shared by the services.
+"""
+
+from .broadcaster import Broadcaster, format_sse
+
+__all__ = [
+    "Broadcaster",
+    "format_sse"
+]
@@ -0,0 +1,63 @@
+"""
+Fan-out of events from one producer to many subscriber queues
+"""
+import asyncio
+import json
+from typing import Any, Optional, Set
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Encode an event in the Server-Sent Events wire format"""
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+class Broadcaster:
+    """Publishes events to every subscriber's bounded queue.
+    
+    A single producer computes each event once however many clients listen.
+    A subscriber that falls behind loses its oldest queued events rather than
+    slowing the producer or the other subscribers. The last event is kept so
+    new subscribers start from the current state.
+    """
+    
+    def __init__(self, max_queue_size: int = 10):
+        self.max_queue_size = max_queue_size
+        self.latest: Any = None
+        # Only ever incremented
+        self.events_published = 0
+        self.events_dropped = 0
+        self._subscribers: Set[asyncio.Queue] = set()
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers"""
+        return len(self._subscribers)
+    
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber, pre-filled with the latest event if any"""
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self.latest is not None:
+            queue.put_nowait(self.latest)
+        self._subscribers.add(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber"""
+        self._subscribers.discard(queue)
+    
+    def publish(self, event: Any) -> None:
+        """Send an event to all subscribers without waiting"""
+        self.latest = event
+        self.events_published += 1
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.events_dropped += 1
+            queue.put_nowait(event)
+    
+    def get_stats(self) -> dict:
+        """Get broadcaster counters"""
+        return {
+            "subscribers": self.subscriber_count,
+            "events_published": self.events_published,
+            "events_dropped": self.events_dropped
+        }
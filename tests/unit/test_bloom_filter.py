@@ -0,0 +1,33 @@
+"""
+Unit tests for the known-series Bloom filter
+"""
+import pytest
+from shared.cache import BloomFilter
+
+class TestBloomFilter:
+    """Tests for BloomFilter"""
+    
+    def test_added_items_are_always_found(self):
+        """Test there are no false negatives"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        series_ids = [f"sensor_{i}" for i in range(1000)]
+        bloom.add_many(series_ids)
+        
+        assert all(series_id in bloom for series_id in series_ids)
+        assert bloom.count == 1000
+    
+    def test_false_positive_rate_is_bounded(self):
+        """Test unknown items are mostly rejected at the configured capacity"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        bloom.add_many(f"sensor_{i}" for i in range(1000))
+        
+        false_positives = sum(f"unknown_{i}" in bloom for i in range(10000))
+        
+        assert false_positives / 10000 < 0.03
+    
+    def test_invalid_parameters(self):
+        """Test sizing parameters are validated"""
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=10, error_rate=1.5)
@@ -0,0 +1,65 @@
+"""
+Unit tests for the event broadcaster
+"""
+import asyncio
+import json
+from shared.streaming import Broadcaster, format_sse
+
+class TestBroadcaster:
+    """Tests for Broadcaster"""
+    
+    def test_publish_reaches_every_subscriber(self):
+        """Test one published event is queued for all subscribers"""
+        async def scenario():
+            broadcaster = Broadcaster()
+            queues = [broadcaster.subscribe() for _ in range(3)]
+            broadcaster.publish({"value": 1})
+            return [queue.get_nowait() for queue in queues]
+        
+        assert asyncio.run(scenario()) == [{"value": 1}] * 3
+    
+    def test_new_subscriber_gets_latest_event(self):
+        """Test a late subscriber starts from the last published event"""
+        async def scenario():
+            broadcaster = Broadcaster()
+            broadcaster.publish({"value": 1})
+            broadcaster.publish({"value": 2})
+            return broadcaster.subscribe().get_nowait()
+        
+        assert asyncio.run(scenario()) == {"value": 2}
+    
+    def test_slow_subscriber_drops_oldest(self):
+        """Test a full queue drops its oldest event instead of blocking the publisher"""
+        async def scenario():
+            broadcaster = Broadcaster(max_queue_size=2)
+            queue = broadcaster.subscribe()
+            for value in range(4):
+                broadcaster.publish(value)
+            return [queue.get_nowait(), queue.get_nowait()], broadcaster
+        
+        events, broadcaster = asyncio.run(scenario())
+        
+        assert events == [2, 3]
+        assert broadcaster.events_dropped == 2
+    
+    def test_unsubscribe(self):
+        """Test unsubscribed queues stop receiving events"""
+        async def scenario():
+            broadcaster = Broadcaster()
+            queue = broadcaster.subscribe()
+            broadcaster.unsubscribe(queue)
+            broadcaster.publish("event")
+            return queue.empty(), broadcaster.subscriber_count
+        
+        assert asyncio.run(scenario()) == (True, 0)
+
+class TestFormatSse:
+    """Tests for format_sse"""
+    
+    def test_event_encoding(self):
+        """Test events are encoded as SSE messages"""
+        message = format_sse({"rps": 1.5}, event="metrics")
+        
+        assert message.startswith("event: metrics\ndata: ")
+        assert message.endswith("\n\n")
+        assert json.loads(message.split("data: ", 1)[1]) == {"rps": 1.5}
@@ -41,7 +41,7 @@ def inference_client(environment_variables):
 class TestInferenceService:
     """Inference Service unit tests"""
     
-
+    
     def test_predict_cache_miss(self, inference_client, sample_prediction_data):
         """Test prediction when model not in cache"""
         import uuid
@@ -51,19 +51,19 @@ class TestInferenceService:
         
         with patch('inference_main.redis_client') as mock_redis:
             mock_redis.get.return_value = None  # Cache miss
-
+            
             response = requests.post(
                 f"{inference_client}/predict/{unique_series_id}",
                 json=sample_prediction_data
             )
-
+            
             # Debug: print response details if error
             if response.status_code != 404:
                 print(f"Status: {response.status_code}")
                 print(f"Response: {response.text}")
-
+            
             assert response.status_code == 404  # Model not found
-
+    
     def test_predict_invalid_data(self, inference_client, sample_series_id):
         """Test prediction with invalid data"""
         invalid_data = {
@@ -77,12 +77,12 @@ class TestInferenceService:
         )
         
         assert response.status_code == 422
-
-
+    
+    
     def test_healthcheck(self, inference_client):
         """Test inference service health check"""
         response = requests.get(f"{inference_client}/healthcheck")
-            
+        
         assert response.status_code == 200
         data = response.json()
         
@@ -93,8 +93,8 @@ class TestInferenceService:
         assert "redis_connection" in data
         assert "database_connection" in data
         assert "metrics" in data
-
-
+    
+    
     def test_predict_anomaly_detection(self, inference_client):
         """Test anomaly detection logic - first train model, then predict"""
         from tests.config import TRAINING_SERVICE_URL
@@ -138,3 +138,127 @@ class TestInferenceService:
         data = response.json()
         assert "anomaly" in data
         assert data["anomaly"]  # Should be anomaly
+
+class TestModelInvalidation:
+    """Watermark poller that drops cached models of retrained series"""
+    
+    def _poll(self, rows):
+        import asyncio
+        from unittest.mock import AsyncMock
+        
+        with patch.object(inference_main, "read_models_updated_since", return_value=rows) as read, \
+                patch.object(inference_main, "redis_cache") as redis_cache:
+            redis_cache.delete_many = AsyncMock()
+            invalidated = asyncio.run(inference_main._invalidate_updated_models())
+        return invalidated, read.call_args[0][0], redis_cache.delete_many
+    
+    def test_late_commit_below_watermark_is_invalidated(self):
+        """A row committed after newer rows were seen is still picked up within the overlap window"""
+        overlap = inference_main.MODEL_INVALIDATION_OVERLAP_SECONDS
+        with patch.object(inference_main, "model_watermark", 1000), \
+                patch.object(inference_main, "invalidated_model_rows", {}):
+            invalidated, since, _ = self._poll([(11, "series_b", "v1", 1000)])
+            assert invalidated == 1
+            assert since == 1000 - overlap
+            
+            # Row 10 was written earlier but only became visible now
+            inference_main.local_model_cache.set("series_a", {"mean": 1.0})
+            invalidated, _, delete_many = self._poll([(10, "series_a", "v3", 990), (11, "series_b", "v1", 1000)])
+            assert invalidated == 1
+            assert inference_main.local_model_cache.get("series_a") is None
+            assert "model:series_a" in delete_many.call_args[0][0]
+            assert "model:series_b" not in delete_many.call_args[0][0]
+            assert inference_main.model_watermark == 1000
+    
+    def test_seen_rows_pruned_outside_overlap(self):
+        """Rows older than the overlap window are forgotten once they can't be read again"""
+        overlap = inference_main.MODEL_INVALIDATION_OVERLAP_SECONDS
+        with patch.object(inference_main, "model_watermark", 1000), \
+                patch.object(inference_main, "invalidated_model_rows", {(1, 1000 - overlap - 1): 1000 - overlap - 1}):
+            self._poll([(2, "series_c", "v1", 1000)])
+            assert list(inference_main.invalidated_model_rows) == [(2, 1000)]
+    
+    def test_missing_not_recorded_across_invalidation(self):
+        """A not-found result from before an invalidation poll isn't written to the negative cache"""
+        import asyncio
+        from unittest.mock import AsyncMock
+        
+        with patch.object(inference_main, "model_watermark", 1000), \
+                patch.object(inference_main, "invalidated_model_rows", {}), \
+                patch.object(inference_main, "model_invalidation_generation", 0):
+            generation = inference_main.model_invalidation_generation
+            # The series is trained and picked up by the poller while the lookup is in flight
+            self._poll([(12, "series_new", "v1", 1001)])
+            
+            with patch.object(inference_main, "redis_cache") as redis_cache:
+                redis_cache.set_many_ex = AsyncMock()
+                asyncio.run(inference_main.remember_missing(["series_new"], generation))
+                redis_cache.set_many_ex.assert_not_called()
+            assert inference_main.missing_model_cache.get(inference_main.local_cache_key("series_new")) is None
+            
+            # Lookups started after the poll are recorded as usual
+            with patch.object(inference_main, "redis_cache") as redis_cache:
+                redis_cache.set_many_ex = AsyncMock()
+                asyncio.run(inference_main.remember_missing(["series_gone"], inference_main.model_invalidation_generation))
+                redis_cache.set_many_ex.assert_called_once()
+    
+    def _racing_db(self, rows):
+        """Session whose query completes after an invalidation poll ran"""
+        from unittest.mock import AsyncMock
+        
+        async def execute(statement):
+            import asyncio
+            await asyncio.sleep(0.01)
+            inference_main.model_invalidation_generation += 1
+            result = MagicMock()
+            result.scalars.return_value.all.return_value = rows
+            result.scalars.return_value.first.return_value = rows[0] if rows else None
+            return result
+        
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=execute)
+        return db
+    
+    def test_models_not_cached_across_invalidation(self):
+        """Models read before an invalidation poll are returned but not written to either cache tier"""
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+        
+        row = SimpleNamespace(series_id="series_raced", mean=1.0, std=0.5, threshold=3.0, model_version="v1")
+        with patch.object(inference_main, "model_invalidation_generation", 0), \
+                patch.object(inference_main, "known_series_ready", False), \
+                patch.object(inference_main, "redis_cache") as redis_cache:
+            redis_cache.get_many = AsyncMock(return_value=[None])
+            redis_cache.set_many_ex = AsyncMock()
+            
+            params = asyncio.run(inference_main.load_many_model_params(["series_raced"], self._racing_db([row])))
+            
+            assert params["series_raced"]["model_version"] == "v1"
+            redis_cache.set_many_ex.assert_not_called()
+        assert inference_main.local_model_cache.get("series_raced") is None
+    
+    def test_coalesced_load_not_cached_across_invalidation(self):
+        """A coalesced load that raced an invalidation is shared with its waiters but not cached"""
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+        
+        row = SimpleNamespace(series_id="series_shared", mean=1.0, std=0.5, threshold=3.0, model_version="v1")
+        db = self._racing_db([row])
+        
+        async def scenario():
+            return await asyncio.gather(*(inference_main.load_model_params("series_shared", db) for _ in range(3)))
+        
+        with patch.object(inference_main, "model_invalidation_generation", 0), \
+                patch.object(inference_main, "known_series_ready", False), \
+                patch.object(inference_main, "redis_cache") as redis_cache:
+            redis_cache.get_many = AsyncMock(return_value=[None, None])
+            redis_cache.set_many_ex = AsyncMock()
+            
+            results = asyncio.run(scenario())
+            
+            assert [params["model_version"] for params in results] == ["v1"] * 3
+            assert db.execute.await_count == 1
+            redis_cache.set_many_ex.assert_not_called()
+        assert inference_main.local_model_cache.get(inference_main.local_cache_key("series_shared")) is None
@@ -0,0 +1,79 @@
+"""
+Unit tests for the in-process job queue
+"""
+import asyncio
+import threading
+import pytest
+from shared.jobs import JobQueue, JobQueueFullError
+
+async def wait_until_done(queue: JobQueue, job_id: str) -> None:
+    while not queue.get(job_id).done:
+        await asyncio.sleep(0.01)
+
+class TestJobQueue:
+    """Tests for JobQueue"""
+    
+    def test_job_result_and_failure(self):
+        """Test jobs report their result or error"""
+        def fail():
+            raise ValueError("bad data")
+        
+        async def scenario():
+            queue = JobQueue(workers=2)
+            await queue.start()
+            ok = queue.submit(lambda a, b: a + b, 2, 3, metadata={"series_id": "s1"})
+            bad = queue.submit(fail)
+            assert ok.status == "queued"
+            await wait_until_done(queue, ok.job_id)
+            await wait_until_done(queue, bad.job_id)
+            await queue.stop()
+            return queue, ok, bad
+        
+        queue, ok, bad = asyncio.run(scenario())
+        
+        assert ok.status == "succeeded"
+        assert ok.result == 5
+        assert ok.to_dict()["series_id"] == "s1"
+        assert ok.started_at is not None and ok.finished_at >= ok.started_at
+        assert bad.status == "failed"
+        assert bad.error == "bad data"
+        assert queue.get_stats()["succeeded"] == 1
+        assert queue.get_stats()["failed"] == 1
+    
+    def test_queue_is_bounded(self):
+        """Test submissions beyond max_pending are rejected"""
+        release = threading.Event()
+        
+        async def scenario():
+            queue = JobQueue(workers=1, max_pending=1)
+            await queue.start()
+            first = queue.submit(release.wait)
+            # Let the worker pick up the first job
+            while first.status != "running":
+                await asyncio.sleep(0.01)
+            queue.submit(release.wait)
+            with pytest.raises(JobQueueFullError):
+                queue.submit(release.wait)
+            release.set()
+            await wait_until_done(queue, first.job_id)
+            await queue.stop()
+            return queue
+        
+        queue = asyncio.run(scenario())
+        
+        assert queue.rejected == 1
+    
+    def test_finished_jobs_expire_after_retention(self):
+        """Test only the last `retention` finished jobs are kept"""
+        async def scenario():
+            queue = JobQueue(workers=1, retention=2)
+            await queue.start()
+            jobs = [queue.submit(lambda i=i: i) for i in range(3)]
+            await wait_until_done(queue, jobs[-1].job_id)
+            await queue.stop()
+            return queue, jobs
+        
+        queue, jobs = asyncio.run(scenario())
+        
+        assert queue.get(jobs[0].job_id) is None
+        assert queue.get(jobs[2].job_id).result == 2
@@ -0,0 +1,109 @@
+"""
+Unit tests for the mergeable latency sketches
+"""
+import numpy as np
+import pytest
+from shared.metrics import LatencySketch, WindowedLatencySketch
+
+class TestLatencySketch:
+    """Tests for LatencySketch"""
+    
+    def test_quantiles_within_relative_accuracy(self):
+        """Test p50/p95/p99 stay within the configured relative error of the exact values"""
+        values = np.random.default_rng(0).lognormal(mean=1.0, sigma=1.0, size=20000)
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(float(value))
+        
+        for q in (0.5, 0.95, 0.99):
+            exact = np.quantile(values, q)
+            assert abs(sketch.quantile(q) - exact) / exact <= 0.02
+        assert sketch.count == len(values)
+        assert sketch.sum == pytest.approx(values.sum())
+    
+    def test_merge_matches_single_sketch(self):
+        """Test merging sketches of two halves equals sketching all values"""
+        values = np.random.default_rng(1).exponential(scale=5.0, size=2000).tolist()
+        whole, first, second = LatencySketch(), LatencySketch(), LatencySketch()
+        for value in values:
+            whole.add(value)
+        for value in values[:1000]:
+            first.add(value)
+        for value in values[1000:]:
+            second.add(value)
+        
+        merged = first.merge(second)
+        assert merged.bins == whole.bins
+        assert merged.summary() == whole.summary()
+    
+    def test_merge_rejects_different_accuracy(self):
+        """Test sketches with different bucket widths are not merged"""
+        with pytest.raises(ValueError):
+            LatencySketch(0.01).merge(LatencySketch(0.02))
+    
+    def test_weighted_add_and_zero_values(self):
+        """Test counted samples and zero latencies"""
+        sketch = LatencySketch()
+        sketch.add(0.0, count=3)
+        sketch.add(10.0, count=7)
+        
+        assert sketch.count == 10
+        assert sketch.quantile(0.0) == 0.0
+        assert sketch.quantile(0.5) == pytest.approx(10.0, rel=0.01)
+        assert sketch.summary()["avg"] == 7.0
+    
+    def test_empty_summary(self):
+        """Test an empty sketch reports no percentiles"""
+        assert LatencySketch().summary() == {
+            "count": 0, "avg": None, "p50": None, "p95": None, "p99": None, "max": None
+        }
+    
+    def test_dict_round_trip(self):
+        """Test serialized sketches rebuild identically (including through JSON keys)"""
+        sketch = LatencySketch()
+        for value in (0.0, 0.5, 3.0, 250.0):
+            sketch.add(value)
+        
+        restored = LatencySketch.from_dict(sketch.to_dict())
+        assert restored.bins == sketch.bins
+        assert restored.summary() == sketch.summary()
+        assert LatencySketch.from_dict(LatencySketch().to_dict()).count == 0
+
+class TestWindowedLatencySketch:
+    """Tests for WindowedLatencySketch"""
+    
+    def test_merged_covers_window_only(self):
+        """Test only buckets overlapping the window are merged"""
+        windowed = WindowedLatencySketch(bucket_seconds=60, retention_buckets=60)
+        windowed.add(1.0, now=1000)
+        windowed.add(2.0, now=1100)
+        windowed.add(3.0, now=1190)
+        
+        assert windowed.merged(90, now=1200).count == 2
+        assert windowed.merged(3600, now=1200).count == 3
+    
+    def test_old_buckets_expire(self):
+        """Test buckets beyond the retention are dropped"""
+        windowed = WindowedLatencySketch(bucket_seconds=60, retention_buckets=2)
+        windowed.add(1.0, now=0)
+        windowed.add(1.0, now=60)
+        windowed.add(1.0, now=120)
+        
+        assert windowed.merged(10 ** 6, now=120).count == 2
+    
+    def test_drain_updated(self):
+        """Test only buckets changed since the last drain are returned"""
+        windowed = WindowedLatencySketch(bucket_seconds=60)
+        windowed.add(1.0, now=0)
+        windowed.add(2.0, now=60)
+        
+        assert sorted(windowed.drain_updated()) == [0, 60]
+        assert windowed.drain_updated() == {}
+        
+        windowed.add(3.0, now=70)
+        updated = windowed.drain_updated()
+        assert list(updated) == [60]
+        assert updated[60]["count"] == 2
+        
+        windowed.mark_updated([0, 60, 120])
+        assert sorted(windowed.drain_updated()) == [0, 60]
@@ -0,0 +1,66 @@
+"""
+Unit tests for the in-process LRU model cache
+"""
+import time
+from shared.cache import LRUCache
+
+class TestLRUCache:
+    """Tests for LRUCache"""
+    
+    def test_hit_and_miss_counters(self):
+        """Test lookups update hit/miss counters"""
+        cache = LRUCache(max_size=10, ttl_seconds=60)
+        cache.set("sensor_1", {"mean": 1.0})
+        
+        assert cache.get("sensor_1") == {"mean": 1.0}
+        assert cache.get("sensor_2") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_ratio == 0.5
+    
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = LRUCache(max_size=2, ttl_seconds=None)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats.evictions == 1
+    
+    def test_entries_expire_after_ttl(self):
+        """Test entries are dropped once their TTL has passed"""
+        cache = LRUCache(max_size=10, ttl_seconds=0.01)
+        cache.set("a", 1)
+        cache.set("pinned", 2, ttl_seconds=None)
+        time.sleep(0.02)
+        
+        assert cache.get("a") is None
+        assert cache.get("pinned") == 2
+        assert cache.stats.expirations == 1
+    
+    def test_invalidate_many(self):
+        """Test explicit invalidation removes only present entries"""
+        cache = LRUCache(max_size=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        
+        assert cache.invalidate_many(["a", "missing"]) == 1
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert len(cache) == 1
+    
+    def test_clear_keeps_counters(self):
+        """Test clearing entries keeps the counters monotonic (they back Prometheus counters)"""
+        cache = LRUCache(max_size=10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        cache.clear()
+        
+        assert len(cache) == 0
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
@@ -66,6 +66,27 @@ class TestAnomalyDetectionModel:
         assert prediction["anomaly"]
         assert abs(prediction["deviation"]) > 2.0
     
+    def test_batch_prediction_matches_single(self):
+        """Test vectorized batch prediction agrees with per-point prediction"""
+        timestamps = [int(time.time()) - 100 + i for i in range(20)]
+        values = [42.0 + i * 0.1 for i in range(20)]
+        
+        ts = TimeSeries(data=[{"timestamp": t, "value": v} for t, v in zip(timestamps, values)])
+        
+        model = AnomalyDetectionModel(threshold=2.0)
+        model.fit(ts)
+        
+        from shared.core.data_models import DataPoint
+        batch_values = [42.5, 100.0, 43.0, -10.0]
+        batch_predictions = model.predict_batch(np.array(batch_values))
+        single_predictions = [
+            model.predict_with_details(DataPoint(timestamp=0, value=v))["anomaly"]
+            for v in batch_values
+        ]
+        
+        assert batch_predictions.tolist() == single_predictions
+        assert batch_predictions.tolist() == [False, True, False, True]
+    
     def test_model_serialization(self):
         """Test model statistics retrieval"""
         timestamps = [int(time.time()) - 100 + i for i in range(10)]
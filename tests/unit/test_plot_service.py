@@ -181,3 +181,42 @@ class TestMonitoringService:
         data = response.json()
         assert data["model_version"] in ["v1", "v2", "1.0", "2.0"]  # Accept various formats for now
         assert len(data["data_points"]) >= 1  # Should have at least some data points
+
+class TestDashboardSnapshot:
+    """Tests for the cached dashboard snapshot"""
+    
+    def test_render_dashboard(self):
+        """Test a snapshot renders its metrics, tables and generation time"""
+        from datetime import datetime, timezone
+        data = {
+            "total_models": 3,
+            "total_predictions_today": 480,
+            "predictions_current_hour": 12,
+            "avg_predictions_per_hour": 20.0,
+            "current_rps_estimate": 20.0 / 3600,
+            "recent_models": [{"series_id": "sensor_1", "model_version": "v2", "threshold": 3.0, "created_at": 1700000000}],
+            "recent_predictions": [{"series_id": "sensor_1", "value": 42.5, "prediction": True, "model_version": "v2", "created_at": 1700000100}],
+            "most_used_models": [{"series_id": "sensor_1", "model_version": "v2", "usage_count": 480}]
+        }
+        health = [{"service": "Training", "status": "Healthy", "details": "ok"}]
+        
+        html = monitoring_main.render_dashboard(data, health, datetime(2024, 1, 1, tzinfo=timezone.utc))
+        
+        assert html.startswith(monitoring_main.DASHBOARD_HEAD)
+        assert "Last updated: 2024-01-01 00:00:00 UTC" in html
+        assert '<div class="metric-value">480</div>' in html
+        assert "ANOMALY" in html
+        assert "100.0%" in html
+    
+    def test_dashboard_serves_snapshot(self):
+        """Test the endpoint serves the stored snapshot with its age"""
+        import asyncio
+        import time
+        snapshot = {"html": b"<html>snapshot</html>", "generated_at": time.time() - 5}
+        
+        with patch.object(monitoring_main, "dashboard_snapshot", snapshot):
+            response = asyncio.run(monitoring_main.dashboard())
+        
+        assert response.body == b"<html>snapshot</html>"
+        assert response.headers["X-Dashboard-Generated-At"] == str(int(snapshot["generated_at"]))
+        assert float(response.headers["X-Dashboard-Age-Seconds"]) >= 5
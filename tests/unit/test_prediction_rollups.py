@@ -0,0 +1,127 @@
+"""
+Unit tests for the prediction rollup aggregation
+"""
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session
+from shared.database.models import PredictionRollup
+from shared.database.rollups import (
+    HOUR_SECONDS,
+    MINUTE_ROLLUP_RETENTION_SECONDS,
+    MINUTE_SECONDS,
+    aggregate_prediction_rollups,
+    bucket_start,
+    prune_minute_rollups,
+    rollup_window
+)
+
+def make_row(series_id: str, created_at: int, anomaly: bool = False, model_version: str = "v1") -> dict:
+    return {
+        "series_id": series_id,
+        "model_version": model_version,
+        "prediction": anomaly,
+        "total_latency_ms": 2.0,
+        "created_at": created_at
+    }
+
+class TestPredictionRollups:
+    """Tests for aggregate_prediction_rollups"""
+    
+    def test_bucket_start(self):
+        """Test timestamps are floored to their bucket"""
+        assert bucket_start(3725, 60) == 3720
+        assert bucket_start(3725, 3600) == 3600
+    
+    def test_counts_per_bucket_series_and_version(self):
+        """Test rows are counted per minute and hour bucket, series and model version"""
+        rows = [
+            make_row("a", 3600),
+            make_row("a", 3659, anomaly=True),
+            make_row("a", 3660),
+            make_row("a", 3700, model_version="v2"),
+            make_row("b", 7300)
+        ]
+        
+        rollups = {
+            (r["bucket_seconds"], r["bucket_start"], r["series_id"], r["model_version"]): r
+            for r in aggregate_prediction_rollups(rows)
+        }
+        
+        assert rollups[(60, 3600, "a", "v1")]["prediction_count"] == 2
+        assert rollups[(60, 3600, "a", "v1")]["anomaly_count"] == 1
+        assert rollups[(60, 3660, "a", "v1")]["prediction_count"] == 1
+        assert rollups[(3600, 3600, "a", "v1")]["prediction_count"] == 3
+        assert rollups[(3600, 3600, "a", "v1")]["total_latency_ms_sum"] == 6.0
+        assert rollups[(3600, 3600, "a", "v1")]["last_prediction_at"] == 3660
+        assert rollups[(3600, 3600, "a", "v2")]["prediction_count"] == 1
+        assert rollups[(3600, 7200, "b", "v1")]["prediction_count"] == 1
+        assert len(rollups) == 7
+    
+    def test_sorted_by_key(self):
+        """Test rollups come out in key order (consistent lock order for upserts)"""
+        rows = [make_row("b", 7300), make_row("a", 100), make_row("a", 3700)]
+        
+        keys = [
+            (r["bucket_seconds"], r["bucket_start"], r["series_id"], r["model_version"])
+            for r in aggregate_prediction_rollups(rows)
+        ]
+        
+        assert keys == sorted(keys)
+
+class TestRollupRetention:
+    """Tests for minute bucket retention (run against an in-memory SQLite table)"""
+    
+    NOW = 100 * HOUR_SECONDS + 30 * MINUTE_SECONDS
+    
+    def make_session(self) -> Session:
+        engine = create_engine("sqlite://")
+        PredictionRollup.__table__.create(engine)
+        return Session(engine)
+    
+    def add_bucket(self, db: Session, bucket_seconds: int, start: int, count: int) -> None:
+        db.add(PredictionRollup(
+            bucket_seconds=bucket_seconds,
+            bucket_start=start,
+            series_id="a",
+            model_version="v1",
+            prediction_count=count,
+            anomaly_count=0,
+            total_latency_ms_sum=0.0
+        ))
+    
+    def test_prune_deletes_only_expired_minute_buckets(self):
+        """Test minute buckets past the retention are removed and hour buckets kept"""
+        db = self.make_session()
+        cutoff = bucket_start(self.NOW, MINUTE_SECONDS) - MINUTE_ROLLUP_RETENTION_SECONDS
+        self.add_bucket(db, MINUTE_SECONDS, cutoff - MINUTE_SECONDS, 1)
+        self.add_bucket(db, MINUTE_SECONDS, cutoff, 2)
+        self.add_bucket(db, HOUR_SECONDS, bucket_start(cutoff, HOUR_SECONDS) - HOUR_SECONDS, 3)
+        db.commit()
+        
+        assert prune_minute_rollups(db, now=self.NOW) == 1
+        remaining = sorted((r.bucket_seconds, r.prediction_count) for r in db.query(PredictionRollup))
+        assert remaining == [(MINUTE_SECONDS, 2), (HOUR_SECONDS, 3)]
+    
+    def test_window_counts_each_prediction_once(self):
+        """Test a recent window combines minute and hour buckets without double counting"""
+        db = self.make_session()
+        since = self.NOW - 2 * HOUR_SECONDS  # 98h30m
+        self.add_bucket(db, MINUTE_SECONDS, 98 * HOUR_SECONDS + 45 * MINUTE_SECONDS, 1)
+        self.add_bucket(db, HOUR_SECONDS, 98 * HOUR_SECONDS, 1)
+        self.add_bucket(db, HOUR_SECONDS, 99 * HOUR_SECONDS, 4)
+        self.add_bucket(db, MINUTE_SECONDS, 99 * HOUR_SECONDS, 4)
+        db.commit()
+        
+        total = db.query(func.sum(PredictionRollup.prediction_count)).filter(rollup_window(since, now=self.NOW)).scalar()
+        assert total == 5
+    
+    def test_window_beyond_retention_uses_hour_buckets(self):
+        """Test windows reaching past the retention fall back to (kept) hour buckets"""
+        db = self.make_session()
+        since = self.NOW - MINUTE_ROLLUP_RETENTION_SECONDS - 2 * HOUR_SECONDS
+        self.add_bucket(db, HOUR_SECONDS, bucket_start(since, HOUR_SECONDS), 3)
+        self.add_bucket(db, HOUR_SECONDS, 99 * HOUR_SECONDS, 4)
+        self.add_bucket(db, MINUTE_SECONDS, 99 * HOUR_SECONDS, 4)
+        db.commit()
+        
+        total = db.query(func.sum(PredictionRollup.prediction_count)).filter(rollup_window(since, now=self.NOW)).scalar()
+        assert total == 7
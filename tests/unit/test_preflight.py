@@ -0,0 +1,81 @@
+"""
+Unit tests for vectorized preflight validation
+"""
+import pytest
+import numpy as np
+from shared.core.preflight import run_preflight, PreflightError, StreamingPreflight
+from shared.core.data_models import TimeSeries
+
+def issue_codes(report):
+    return {issue.code for issue in report.issues}
+
+class TestPreflight:
+    """Tests for run_preflight"""
+    
+    def test_clean_series(self):
+        """Test a regular series passes with gap statistics"""
+        report = run_preflight(np.arange(0, 600, 60), np.linspace(1.0, 2.0, 10))
+        
+        assert report.ok
+        assert report.issues == []
+        assert report.gaps == {"min": 60.0, "median": 60.0, "mean": 60.0, "max": 60.0}
+    
+    def test_blocking_errors(self):
+        """Test NaN/inf, unsorted and constant series are errors"""
+        assert "non_finite_values" in issue_codes(run_preflight([1, 2, 3], [1.0, np.nan, np.inf]))
+        assert "unsorted_timestamps" in issue_codes(run_preflight([1, 3, 2], [1.0, 2.0, 3.0]))
+        assert "constant_values" in issue_codes(run_preflight([1, 2, 3], [5.0, 5.0, 5.0]))
+        assert "insufficient_points" in issue_codes(run_preflight([1], [1.0]))
+        assert "length_mismatch" in issue_codes(run_preflight([1, 2], [1.0]))
+    
+    def test_warnings_do_not_block(self):
+        """Test duplicates, large gaps and near-constant values are reported as warnings"""
+        report = run_preflight([0, 10, 10, 20, 500], [1.0, 1.0 + 1e-12, 1.0, 1.0, 1.0])
+        
+        assert report.ok
+        assert issue_codes(report) == {"duplicate_timestamps", "large_gaps", "near_constant_values"}
+    
+    def test_all_issues_reported_together(self):
+        """Test one pass reports every issue and raises with the first error"""
+        report = run_preflight([3, 2, 1], [1.0, 1.0, 1.0])
+        
+        assert {issue.code for issue in report.errors} == {"unsorted_timestamps", "constant_values"}
+        with pytest.raises(PreflightError) as exc_info:
+            report.raise_for_errors()
+        assert str(exc_info.value) == "DataPoints must be sorted by timestamp"
+        assert exc_info.value.report.to_dict()["ok"] is False
+    
+    def test_time_series_reuses_report(self):
+        """Test TimeSeries validation reuses a report passed at construction"""
+        timestamps, values = np.arange(5), np.arange(5, dtype=np.float64)
+        report = run_preflight(timestamps, values)
+        ts = TimeSeries.from_arrays(timestamps, values, preflight=report)
+        
+        assert ts.preflight() is report
+        ts.validate_for_training()
+
+class TestStreamingPreflight:
+    """Tests for incremental preflight over chunks"""
+    
+    def test_matches_whole_series(self):
+        """Test chunked statistics equal the single-pass ones"""
+        timestamps = np.arange(10000) * 60
+        values = np.random.normal(42.0, 3.0, 10000)
+        streaming = StreamingPreflight()
+        for start in range(0, 10000, 777):
+            streaming.update(timestamps[start:start + 777], values[start:start + 777])
+        
+        assert streaming.count == 10000
+        assert streaming.mean == pytest.approx(values.mean(), rel=1e-12)
+        assert streaming.std == pytest.approx(values.std(), rel=1e-12)
+        assert streaming.report().ok
+        assert streaming.report().gaps["mean"] == 60.0
+        assert streaming.get_statistics()["end_time"] == int(timestamps[-1])
+    
+    def test_detects_issues_across_chunks(self):
+        """Test ordering is checked across chunk boundaries"""
+        streaming = StreamingPreflight()
+        streaming.update([1, 2, 3], [1.0, 2.0, 3.0])
+        streaming.update([2, 4], [1.0, np.nan])
+        
+        assert {issue.code for issue in streaming.report().errors} == {"unsorted_timestamps", "non_finite_values"}
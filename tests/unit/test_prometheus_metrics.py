@@ -0,0 +1,122 @@
+"""
+Unit tests for the in-process Prometheus metrics registry
+"""
+import asyncio
+import pytest
+from shared.metrics import Counter, Gauge, Histogram, MetricsRegistry, RequestMetricsMiddleware
+from shared.metrics.http import REQUEST_DURATION
+
+def sample_lines(registry: MetricsRegistry) -> list:
+    """Rendered lines without HELP/TYPE comments"""
+    return [line for line in registry.render().splitlines() if not line.startswith("#")]
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry and its metric types"""
+    
+    def test_counter_with_labels(self):
+        """Test labelled counters render one sample per label combination"""
+        registry = MetricsRegistry()
+        counter = Counter("lookups_total", "Lookups", ("tier", "result"), registry=registry)
+        counter.labels("redis", "hit").inc()
+        counter.labels(tier="redis", result="hit").inc(2)
+        counter.labels("redis", "miss").inc()
+        
+        assert sample_lines(registry) == [
+            'lookups_total{tier="redis",result="hit"} 3',
+            'lookups_total{tier="redis",result="miss"} 1'
+        ]
+        assert "# TYPE lookups_total counter" in registry.render()
+    
+    def test_counter_rejects_decrease(self):
+        """Test counters cannot go down"""
+        counter = Counter("requests_total", "Requests", registry=MetricsRegistry())
+        with pytest.raises(ValueError):
+            counter.inc(-1)
+    
+    def test_gauge_callback_read_at_scrape(self):
+        """Test callback gauges are evaluated on render and None omits the sample"""
+        registry = MetricsRegistry()
+        queue = []
+        depth = Gauge("queue_depth", "Queued items", registry=registry)
+        depth.set_function(lambda: len(queue))
+        missing = Gauge("not_started", "Missing value", registry=registry)
+        missing.set_function(lambda: None)
+        
+        queue.extend([1, 2])
+        assert sample_lines(registry) == ["queue_depth 2"]
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram buckets, count and sum"""
+        registry = MetricsRegistry()
+        histogram = Histogram("stage_seconds", "Stage duration", ("stage",), buckets=(0.01, 0.1), registry=registry)
+        for value in (0.005, 0.01, 0.05, 2.0):
+            histogram.labels("db_fetch").observe(value)
+        
+        assert sample_lines(registry) == [
+            'stage_seconds_bucket{stage="db_fetch",le="0.01"} 2',
+            'stage_seconds_bucket{stage="db_fetch",le="0.1"} 3',
+            'stage_seconds_bucket{stage="db_fetch",le="+Inf"} 4',
+            'stage_seconds_count{stage="db_fetch"} 4',
+            'stage_seconds_sum{stage="db_fetch"} 2.065'
+        ]
+    
+    def test_histogram_timer(self):
+        """Test time() observes the duration of a block"""
+        histogram = Histogram("block_seconds", "Block duration", registry=MetricsRegistry())
+        with histogram.time():
+            pass
+        
+        counts, total = histogram._only_child().snapshot()
+        assert sum(counts) == 1
+        assert total >= 0
+    
+    def test_label_values_are_escaped(self):
+        """Test quotes, backslashes and newlines in label values"""
+        registry = MetricsRegistry()
+        Counter("errors_total", "Errors", ("message",), registry=registry).labels('a "b"\\\n').inc()
+        
+        assert sample_lines(registry) == ['errors_total{message="a \\"b\\"\\\\\\n"} 1']
+    
+    def test_duplicate_and_label_errors(self):
+        """Test duplicate names and wrong label counts are rejected"""
+        registry = MetricsRegistry()
+        counter = Counter("events_total", "Events", ("kind",), registry=registry)
+        with pytest.raises(ValueError):
+            Counter("events_total", "Events", registry=registry)
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+        with pytest.raises(ValueError):
+            counter.inc()
+    
+    def test_failing_callback_does_not_break_render(self):
+        """Test a failing collector only loses its own samples"""
+        registry = MetricsRegistry()
+        Gauge("broken", "Broken", registry=registry).set_function(lambda: 1 / 0)
+        Gauge("working", "Working", registry=registry).set(1.5)
+        
+        assert sample_lines(registry) == ["working 1.5"]
+
+class TestRequestMetricsMiddleware:
+    """Tests for RequestMetricsMiddleware"""
+    
+    def test_observes_route_template_and_status(self):
+        """Test requests are labelled with the matched route template and response status"""
+        class Route:
+            path = "/predict/{series_id}"
+        
+        async def app(scope, receive, send):
+            scope["route"] = Route()
+            await send({"type": "http.response.start", "status": 201, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+        
+        async def receive():
+            return {"type": "http.request", "body": b""}
+        
+        async def send(message):
+            pass
+        
+        child = REQUEST_DURATION.labels("POST", "/predict/{series_id}", "201")
+        before = sum(child.snapshot()[0])
+        asyncio.run(RequestMetricsMiddleware(app)({"type": "http", "method": "POST", "path": "/predict/abc"}, receive, send))
+        
+        assert sum(child.snapshot()[0]) == before + 1
@@ -0,0 +1,44 @@
+"""
+Unit tests for the asyncio Redis cache wrapper
+"""
+import asyncio
+import redis
+from shared.cache import AsyncRedisCache
+
+class SlowRedis:
+    """Stub client whose reads never answer in time"""
+    
+    async def get(self, key):
+        await asyncio.sleep(1)
+    
+    async def mget(self, keys):
+        await asyncio.sleep(1)
+
+class BrokenRedis:
+    """Stub client that fails every call"""
+    
+    async def get(self, key):
+        raise redis.ConnectionError("connection refused")
+
+class TestAsyncRedisCache:
+    """Tests for AsyncRedisCache"""
+    
+    def test_slow_read_degrades_to_miss(self):
+        """Test a read exceeding the per-call timeout is treated as a miss"""
+        cache = AsyncRedisCache(SlowRedis(), op_timeout=0.01)
+        
+        async def scenario():
+            return await cache.get("model:a"), await cache.get_many(["model:a", "model:b"])
+        
+        single, many = asyncio.run(scenario())
+        
+        assert single is None
+        assert many == [None, None]
+        assert cache.errors == 2
+    
+    def test_connection_error_degrades_to_miss(self):
+        """Test Redis errors are counted and reported as a miss"""
+        cache = AsyncRedisCache(BrokenRedis(), op_timeout=0.1)
+        
+        assert asyncio.run(cache.get("model:a")) is None
+        assert cache.errors == 1
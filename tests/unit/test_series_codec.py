@@ -0,0 +1,81 @@
+"""
+Unit tests for the binary training data encoding
+"""
+import json
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from shared.database.series_codec import encode_series, decode_series, training_data_arrays, series_digest, SeriesDigest
+
+class TestSeriesCodec:
+    """Tests for encode_series/decode_series"""
+    
+    @pytest.mark.parametrize("compression", ["zlib", "auto"])
+    def test_round_trip(self, compression):
+        """Test timestamps and float64 values round-trip exactly"""
+        timestamps = [1700000000 + i * 60 for i in range(1000)]
+        values = np.random.normal(42.0, 2.0, 1000).tolist()
+        
+        decoded_timestamps, decoded_values = decode_series(encode_series(timestamps, values, compression=compression))
+        
+        assert decoded_timestamps.dtype == np.int64
+        assert decoded_timestamps.tolist() == timestamps
+        assert decoded_values.tolist() == values
+    
+    def test_float32_values(self):
+        """Test optional float32 storage keeps values to single precision"""
+        values = [42.123456789, -1.5, 1e6]
+        
+        _, decoded_values = decode_series(encode_series([1, 2, 3], values, value_dtype="float32"))
+        
+        assert decoded_values.dtype == np.float64
+        assert np.allclose(decoded_values, values, rtol=1e-6)
+    
+    def test_smaller_than_json(self):
+        """Test regular series encode much smaller than JSON arrays"""
+        timestamps = [1700000000 + i * 60 for i in range(10000)]
+        values = [round(42.0 + (i % 50) * 0.1, 1) for i in range(10000)]
+        
+        encoded = encode_series(timestamps, values)
+        
+        assert len(encoded) * 5 < len(json.dumps(timestamps)) + len(json.dumps(values))
+    
+    def test_invalid_blob_rejected(self):
+        """Test unknown or truncated blobs raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_series(b"not a series")
+        with pytest.raises(ValueError):
+            decode_series(encode_series([1, 2], [1.0, 2.0])[:-4])
+    
+    def test_reader_handles_legacy_rows(self):
+        """Test rows stored as JSON arrays are still readable"""
+        legacy = SimpleNamespace(encoded_data=None, timestamps=[1, 2], values=[1.5, 2.5])
+        encoded = SimpleNamespace(encoded_data=encode_series([1, 2], [1.5, 2.5]), timestamps=None, values=None)
+        
+        for record in (legacy, encoded):
+            timestamps, values = training_data_arrays(record)
+            assert timestamps.tolist() == [1, 2]
+            assert values.tolist() == [1.5, 2.5]
+
+class TestSeriesDigest:
+    """Tests for the training content hash"""
+    
+    def test_independent_of_chunking_and_input_type(self):
+        """Test lists, arrays and chunked updates of the same points hash the same"""
+        timestamps = [1700000000 + i * 60 for i in range(10)]
+        values = [42.0 + i * 0.5 for i in range(10)]
+        
+        chunked = SeriesDigest()
+        chunked.update(np.array(timestamps[:3]), np.array(values[:3]))
+        chunked.update(np.array(timestamps[3:]), np.array(values[3:]))
+        
+        assert chunked.hexdigest(3.0) == series_digest(timestamps, values, 3.0)
+        assert series_digest(np.array(timestamps), np.array(values, dtype=np.float32).astype(np.float64), 3.0) == series_digest(timestamps, values, 3.0)
+    
+    def test_sensitive_to_data_and_threshold(self):
+        """Test any change of a point or the threshold changes the hash"""
+        digest = series_digest([1, 2, 3], [1.0, 2.0, 3.0], 3.0)
+        
+        assert series_digest([1, 2, 3], [1.0, 2.0, 3.0], 2.5) != digest
+        assert series_digest([1, 2, 4], [1.0, 2.0, 3.0], 3.0) != digest
+        assert series_digest([1, 2, 3], [1.0, 2.0, 3.5], 3.0) != digest
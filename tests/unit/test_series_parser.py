@@ -0,0 +1,88 @@
+"""
+Unit tests for the chunked upload parser
+"""
+import pytest
+import numpy as np
+from shared.ingest import SeriesChunkParser, parse_timestamps
+
+def parse_all(parser: SeriesChunkParser, data: bytes, block_size: int = 7):
+    """Feed data in small blocks and collect every chunk"""
+    chunks = []
+    for start in range(0, len(data), block_size):
+        chunks.extend(parser.feed(data[start:start + block_size]))
+    chunks.extend(parser.close())
+    return chunks
+
+class TestSeriesChunkParser:
+    """Tests for SeriesChunkParser"""
+    
+    def test_csv_chunks(self):
+        """Test CSV is split into chunks of chunk_points rows, skipping the header"""
+        data = b"timestamp,value\n" + b"".join(f"{1000 + i},{i * 0.5}\n".encode() for i in range(5))
+        
+        chunks = parse_all(SeriesChunkParser("csv", chunk_points=2), data)
+        
+        assert [len(timestamps) for timestamps, _ in chunks] == [2, 2, 1]
+        assert chunks[0][0].tolist() == [1000, 1001]
+        assert chunks[2][1].tolist() == [2.0]
+    
+    def test_csv_datetime_timestamps(self):
+        """Test CSV datetimes are converted to Unix seconds (UTC) and the header is still skipped"""
+        data = b"timestamp,value\n2011-07-01 00:00:01,1.5\n2011-07-01T00:05:01,2.5\n"
+        
+        chunks = parse_all(SeriesChunkParser("csv"), data)
+        
+        assert chunks[0][0].tolist() == [1309478401, 1309478701]
+        assert chunks[0][1].tolist() == [1.5, 2.5]
+    
+    def test_csv_headerless_bad_first_row(self):
+        """Test a malformed first data row is reported, not skipped as a header"""
+        with pytest.raises(ValueError, match="between lines 1 and 2"):
+            parse_all(SeriesChunkParser("csv"), b"1309478401.0,2\n1309478402,3\n")
+        
+        chunks = parse_all(SeriesChunkParser("csv"), b"1309478401,2\n1309478402,3\n")
+        assert chunks[0][0].tolist() == [1309478401, 1309478402]
+    
+    def test_errors_report_upload_line_numbers(self):
+        """Test error line numbers count the header and blank lines"""
+        with pytest.raises(ValueError, match="on line 4"):
+            parse_all(SeriesChunkParser("csv"), b"timestamp,value\n1,2\n\n3\n")
+        with pytest.raises(ValueError, match="on line 3"):
+            parse_all(SeriesChunkParser("ndjson"), b'[1, 2]\n\n{"timestamp": 1}\n')
+    
+    def test_csv_field_count_checked_per_line(self):
+        """Test a row with an extra field and a row with a missing one don't cancel out"""
+        with pytest.raises(ValueError, match="on line 1"):
+            parse_all(SeriesChunkParser("csv"), b"1000,1.0,9\n2000\n3000,3.0\n")
+    
+    def test_ndjson_objects_and_pairs(self):
+        """Test NDJSON accepts objects and [timestamp, value] pairs, without a trailing newline"""
+        data = b'{"timestamp": 1, "value": 2.5}\n[2, 3.5]\n\n[3, 4]'
+        
+        chunks = parse_all(SeriesChunkParser("ndjson", chunk_points=10), data)
+        
+        assert len(chunks) == 1
+        assert chunks[0][0].tolist() == [1, 2, 3]
+        assert chunks[0][1].tolist() == [2.5, 3.5, 4.0]
+    
+    def test_invalid_input(self):
+        """Test malformed lines and unknown formats raise ValueError"""
+        with pytest.raises(ValueError):
+            parse_all(SeriesChunkParser("csv"), b"1,2\n3\n")
+        with pytest.raises(ValueError):
+            parse_all(SeriesChunkParser("ndjson"), b'{"timestamp": 1}\n')
+        with pytest.raises(ValueError):
+            SeriesChunkParser("xml")
+
+class TestParseTimestamps:
+    """Tests for parse_timestamps"""
+    
+    def test_unix_and_datetime_columns(self):
+        """Test Unix seconds pass through and datetimes are parsed as UTC"""
+        assert parse_timestamps(np.array([b"1700000000", b"1700000060"])).tolist() == [1700000000, 1700000060]
+        assert parse_timestamps(np.array(["1970-01-02 00:00:00"])).tolist() == [86400]
+    
+    def test_invalid_timestamp(self):
+        """Test unparseable timestamps raise ValueError"""
+        with pytest.raises(ValueError):
+            parse_timestamps(np.array([b"yesterday"]))
@@ -0,0 +1,65 @@
+"""
+Unit tests for single-flight request coalescing
+"""
+import asyncio
+from shared.cache import SingleFlight
+
+class TestSingleFlight:
+    """Tests for SingleFlight"""
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """Test concurrent callers for one key run the loader once"""
+        flight = SingleFlight()
+        calls = []
+        
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"mean": 1.0}
+        
+        async def scenario():
+            return await asyncio.gather(*[flight.do("model:a", loader) for _ in range(10)])
+        
+        results = asyncio.run(scenario())
+        
+        assert len(calls) == 1
+        assert all(result == {"mean": 1.0} for result in results)
+        assert flight.coalesced == 9
+        assert flight.inflight == 0
+    
+    def test_errors_are_shared_and_not_cached(self):
+        """Test waiters receive the leader's error and later calls retry"""
+        flight = SingleFlight()
+        attempts = []
+        
+        async def failing_loader():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            raise LookupError("model not found")
+        
+        async def scenario():
+            results = await asyncio.gather(
+                *[flight.do("model:a", failing_loader) for _ in range(3)],
+                return_exceptions=True
+            )
+            retry = await flight.do("model:a", lambda: asyncio.sleep(0, result="ok"))
+            return results, retry
+        
+        results, retry = asyncio.run(scenario())
+        
+        assert len(attempts) == 1
+        assert all(isinstance(result, LookupError) for result in results)
+        assert retry == "ok"
+    
+    def test_different_keys_run_independently(self):
+        """Test loaders for different keys are not coalesced"""
+        flight = SingleFlight()
+        
+        async def scenario():
+            return await asyncio.gather(
+                flight.do("model:a", lambda: asyncio.sleep(0.01, result="a")),
+                flight.do("model:b", lambda: asyncio.sleep(0.01, result="b"))
+            )
+        
+        assert asyncio.run(scenario()) == ["a", "b"]
+        assert flight.executions == 2
@@ -0,0 +1,69 @@
+"""
+Unit tests for the array-backed TimeSeries
+"""
+import pytest
+import numpy as np
+from shared.core.data_models import TimeSeries, DataPoint
+
+class TestTimeSeries:
+    """Tests for columnar TimeSeries storage"""
+    
+    def test_from_lists_stores_typed_arrays(self):
+        """Test timestamps and values are stored as int64/float64 arrays"""
+        ts = TimeSeries.from_lists([1700000000, 1700000060], [1, 2.5])
+        
+        assert ts.get_timestamps_array().dtype == np.int64
+        assert ts.get_values_array().dtype == np.float64
+        assert ts.timestamps == [1700000000, 1700000060]
+        assert ts.values == [1.0, 2.5]
+        assert ts.length == 2
+    
+    def test_arrays_are_read_only(self):
+        """Test the backing arrays cannot be mutated through accessors"""
+        ts = TimeSeries.from_arrays(np.array([1, 2, 3]), np.array([1.0, 2.0, 3.0]))
+        
+        with pytest.raises(ValueError):
+            ts.get_values_array()[0] = 10.0
+    
+    def test_data_view_matches_points(self):
+        """Test the lazy DataPoint view is compatible with the point-based constructor"""
+        points = [{"timestamp": 1700000000 + i * 60, "value": 42.0 + i} for i in range(5)]
+        ts_points = TimeSeries(data=points)
+        ts_lists = TimeSeries.from_lists([p["timestamp"] for p in points], [p["value"] for p in points])
+        
+        assert len(ts_lists.data) == 5
+        assert ts_lists.data[1] == DataPoint(timestamp=1700000060, value=43.0)
+        assert ts_lists.data[-1].value == 46.0
+        assert list(ts_lists.data) == list(ts_points.data)
+        assert ts_lists.data == ts_points.data
+    
+    def test_unsorted_timestamps_rejected(self):
+        """Test sortedness is enforced, while equal timestamps are allowed"""
+        with pytest.raises(ValueError):
+            TimeSeries.from_lists([3, 1, 2], [1.0, 2.0, 3.0])
+        
+        TimeSeries.from_lists([1, 1, 2], [1.0, 2.0, 3.0])
+    
+    def test_invalid_inputs_rejected(self):
+        """Test malformed inputs raise ValueError"""
+        with pytest.raises(ValueError):
+            TimeSeries.from_lists([1, 2], [1.0])
+        with pytest.raises(ValueError):
+            TimeSeries.from_lists([], [])
+        with pytest.raises(ValueError):
+            TimeSeries.from_lists([1.5, 2.0], [1.0, 2.0])
+        with pytest.raises(ValueError):
+            TimeSeries.from_lists([1, 2], [1.0, "abc"])
+    
+    def test_statistics(self):
+        """Test statistics are computed from the arrays"""
+        ts = TimeSeries.from_lists([10, 20, 30], [1.0, 2.0, 3.0])
+        stats = ts.get_statistics()
+        
+        assert stats["count"] == 3
+        assert stats["mean"] == 2.0
+        assert stats["min"] == 1.0
+        assert stats["max"] == 3.0
+        assert stats["start_time"] == 10
+        assert stats["end_time"] == 30
+        assert isinstance(stats["start_time"], int)
@@ -54,7 +54,51 @@ class TestTrainingService:
         assert data["series_id"] == sample_series_id
         assert data["points_used"] == 4
         assert "model_version" in data
-
+    
+    def test_fit_model_identical_data_deduplicated(self, training_client, sample_training_data, sample_series_id):
+        """Test re-submitting the active model's data and threshold returns its version"""
+        first = requests.post(f"{training_client}/fit/{sample_series_id}", json=sample_training_data).json()
+        second = requests.post(f"{training_client}/fit/{sample_series_id}", json=sample_training_data).json()
+        
+        assert second["model_version"] == first["model_version"]
+        assert second["deduplicated"] is True
+    
+    def test_fit_model_earlier_version_reactivated(self, training_client, sample_training_data):
+        """Test re-submitting an earlier version's data and threshold re-activates that version"""
+        import uuid
+        series_id = f"dedup_test_{uuid.uuid4().hex[:8]}"
+        other_data = dict(sample_training_data, values=[v + 1.5 for v in sample_training_data["values"]])
+        
+        first = requests.post(f"{training_client}/fit/{series_id}", json=sample_training_data).json()
+        requests.post(f"{training_client}/fit/{series_id}", json=other_data)
+        third = requests.post(f"{training_client}/fit/{series_id}", json=sample_training_data).json()
+        
+        assert third["model_version"] == first["model_version"]
+        assert third["deduplicated"] is True
+        # Switching back to the earlier threshold on the same data re-activates its version too
+        requests.post(f"{training_client}/retrain/{series_id}", json={"threshold": 2.0})
+        retrained = requests.post(f"{training_client}/retrain/{series_id}", json={"threshold": sample_training_data["threshold"]}).json()
+        assert retrained["model_version"] == first["model_version"]
+        assert retrained["deduplicated"] is True
+    
+    def test_retrain_with_new_threshold(self, training_client, sample_training_data, sample_series_id):
+        """Test retraining registers a new version from the stored statistics"""
+        trained = requests.post(f"{training_client}/fit/{sample_series_id}", json=sample_training_data).json()
+        
+        response = requests.post(f"{training_client}/retrain/{sample_series_id}", json={"threshold": 2.0})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["source_model_version"] == trained["model_version"]
+        assert data["model_version"] != trained["model_version"]
+        assert data["points_used"] == trained["points_used"]
+    
+    def test_retrain_unknown_series(self, training_client):
+        """Test retraining a series without models returns 404"""
+        response = requests.post(f"{training_client}/retrain/missing_series_for_retrain", json={"threshold": 2.0})
+        
+        assert response.status_code == 404
+    
     def test_fit_model_invalid_data(self, training_client, sample_series_id):
         """Test training with invalid data"""
         invalid_data = {
@@ -62,19 +106,19 @@ class TestTrainingService:
             "values": [42.1, 42.3],  # Mismatched lengths
             "threshold": 3.0
         }
-
+        
         response = requests.post(
             f"{training_client}/fit/{sample_series_id}",
             json=invalid_data
         )
-
+        
         # Debug: print response details if error
         if response.status_code != 422:
             print(f"Status: {response.status_code}")
             print(f"Response: {response.text}")
-
+        
         assert response.status_code == 422
-
+    
     def test_fit_model_insufficient_data(self, training_client, sample_series_id):
         """Test training with insufficient data points"""
         insufficient_data = {
@@ -89,7 +133,7 @@ class TestTrainingService:
         )
         
         assert response.status_code == 422
-
+    
     def test_fit_model_constant_values(self, training_client, sample_series_id):
         """Test training with constant values (should fail)"""
         constant_data = {
@@ -104,7 +148,46 @@ class TestTrainingService:
         )
         
         assert response.status_code == 422  # Expecting 422 due to ValueError from ML model (constant values)
-
+    
+    def test_fit_batch_per_series_results(self, training_client, sample_training_data):
+        """Test batch training returns a result per series, in request order"""
+        import uuid
+        series_ok = f"test_batch_{uuid.uuid4().hex[:8]}"
+        series_bad = f"test_batch_{uuid.uuid4().hex[:8]}"
+        
+        response = requests.post(
+            f"{training_client}/fit/batch",
+            json={"items": [
+                {"series_id": series_ok, **sample_training_data},
+                {"series_id": series_bad, "timestamps": [1700000000, 1700000060], "values": [42.0, 42.0]}
+            ]}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["trained_count"] == 1
+        assert data["error_count"] == 1
+        assert data["results"][0]["series_id"] == series_ok
+        assert data["results"][0]["model_version"] == "v1"
+        assert data["results"][1]["error"] is not None
+    
+    def test_fit_model_csv_upload(self, training_client, sample_series_id):
+        """Test training from a CSV upload with datetime timestamps"""
+        body = "timestamp,value\n" + "".join(
+            f"2011-07-01 00:{minute:02d}:00,{42.0 + minute * 0.1}\n" for minute in range(10)
+        )
+        
+        response = requests.post(
+            f"{training_client}/fit/{sample_series_id}/csv",
+            data=body,
+            headers={"Content-Type": "text/csv"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["series_id"] == sample_series_id
+        assert data["points_used"] == 10
+    
     def test_healthcheck(self, training_client):
         """Test training service health check"""
         response = requests.get(f"{training_client}/healthcheck")
@@ -118,7 +201,7 @@ class TestTrainingService:
         assert "timestamp" in data
         assert "database_connection" in data
         assert "metrics" in data
-
+    
     def test_fit_model_creates_database_records(self, training_client, sample_training_data, test_db):
         """Test that training creates proper database records"""
         import uuid
@@ -128,12 +211,12 @@ class TestTrainingService:
             f"{training_client}/fit/{unique_series_id}",
             json=sample_training_data
         )
-
+        
         # Debug: print response details if error
         if response.status_code != 200:
             print(f"Status: {response.status_code}")
             print(f"Response: {response.text}")
-
+        
         assert response.status_code == 200
         
         # Check model was saved
@@ -147,5 +230,8 @@ class TestTrainingService:
         # Check training data was saved
         training_data = test_db.query(TrainingData).filter(TrainingData.series_id == unique_series_id).first()
         assert training_data is not None
-        assert len(training_data.timestamps) == 4
-        assert len(training_data.values) == 4
+        
+        from shared.database.series_codec import training_data_arrays
+        timestamps, values = training_data_arrays(training_data)
+        assert timestamps.tolist() == sample_training_data["timestamps"]
+        assert values.tolist() == sample_training_data["values"]
@@ -0,0 +1,133 @@
+"""
+Unit tests for the write-behind prediction log buffer
+"""
+import asyncio
+from unittest.mock import patch
+from shared.database.models import PredictionLog
+from shared.database.write_behind import WriteBehindBuffer
+
+def make_buffer(flushed_batches, **kwargs) -> WriteBehindBuffer:
+    """Create a buffer that records batches instead of writing to the database"""
+    buffer = WriteBehindBuffer(PredictionLog, **kwargs)
+    buffer._insert_rows = lambda batch: flushed_batches.append(list(batch))
+    return buffer
+
+def make_row(i: int) -> dict:
+    return {"series_id": "sensor_1", "timestamp": i, "value": float(i), "prediction": False, "model_version": "v1"}
+
+class TestWriteBehindBuffer:
+    """Tests for WriteBehindBuffer"""
+    
+    def test_flushes_on_batch_size(self):
+        """Test rows are flushed in batches of at most max_batch_size"""
+        flushed = []
+        
+        async def scenario():
+            buffer = make_buffer(flushed, max_batch_size=3, flush_interval_seconds=60)
+            await buffer.start()
+            await buffer.put_many(make_row(i) for i in range(7))
+            await buffer.stop()
+            return buffer
+        
+        buffer = asyncio.run(scenario())
+        
+        assert [len(batch) for batch in flushed] == [3, 3, 1]
+        assert buffer.rows_flushed == 7
+        assert buffer.pending == 0
+    
+    def test_flushes_on_interval(self):
+        """Test a partial batch is flushed once the interval elapses"""
+        flushed = []
+        
+        async def scenario():
+            buffer = make_buffer(flushed, max_batch_size=100, flush_interval_seconds=0.01)
+            await buffer.start()
+            await buffer.put(make_row(1))
+            await asyncio.sleep(0.1)
+            flushed_before_stop = len(flushed)
+            await buffer.stop()
+            return flushed_before_stop
+        
+        assert asyncio.run(scenario()) == 1
+    
+    def test_failed_flush_is_counted(self):
+        """Test flush errors are counted without stopping the buffer"""
+        
+        def failing_insert(batch):
+            raise RuntimeError("database unavailable")
+        
+        async def scenario():
+            buffer = WriteBehindBuffer(
+                PredictionLog, max_batch_size=2, flush_interval_seconds=60, max_retries=2, retry_backoff_seconds=0
+            )
+            buffer._insert_rows = failing_insert
+            await buffer.start()
+            await buffer.put_many(make_row(i) for i in range(2))
+            await buffer.stop()
+            return buffer
+        
+        buffer = asyncio.run(scenario())
+        
+        assert buffer.rows_failed == 2
+        assert buffer.rows_flushed == 0
+        assert buffer.flush_retries == 2
+    
+    def test_failed_flush_is_retried(self):
+        """Test a batch is persisted once a transient flush error clears"""
+        flushed = []
+        attempts = []
+        
+        def flaky_insert(batch):
+            attempts.append(len(batch))
+            if len(attempts) < 3:
+                raise RuntimeError("connection reset")
+            flushed.append(list(batch))
+        
+        async def scenario():
+            buffer = WriteBehindBuffer(
+                PredictionLog, max_batch_size=2, flush_interval_seconds=60, max_retries=3, retry_backoff_seconds=0.001
+            )
+            buffer._insert_rows = flaky_insert
+            await buffer.start()
+            await buffer.put_many(make_row(i) for i in range(2))
+            await buffer.stop()
+            return buffer
+        
+        buffer = asyncio.run(scenario())
+        
+        assert attempts == [2, 2, 2]
+        assert [len(batch) for batch in flushed] == [2]
+        assert buffer.rows_flushed == 2
+        assert buffer.rows_failed == 0
+        assert buffer.flush_retries == 2
+    
+    def test_on_flush_runs_with_each_batch(self):
+        """Test the on_flush hook gets every flushed batch in the insert's session"""
+        hooked = []
+        
+        class FakeSession:
+            def execute(self, statement, rows):
+                pass
+        
+        class FakeSessionContext:
+            def __enter__(self):
+                return FakeSession()
+            
+            def __exit__(self, *exc_info):
+                return False
+        
+        async def scenario():
+            buffer = WriteBehindBuffer(
+                PredictionLog,
+                max_batch_size=2,
+                flush_interval_seconds=60,
+                on_flush=lambda db, batch: hooked.append((type(db).__name__, len(batch)))
+            )
+            await buffer.start()
+            await buffer.put_many(make_row(i) for i in range(3))
+            await buffer.stop()
+        
+        with patch("shared.database.write_behind.get_db_session", FakeSessionContext):
+            asyncio.run(scenario())
+        
+        assert hooked == [("FakeSession", 2), ("FakeSession", 1)]
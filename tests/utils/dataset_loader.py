@@ -2,10 +2,11 @@
 Dataset loader utility for loading and converting real dataset files to the format expected by our API
 """
 import pandas as pd
+import numpy as np
 import os
-from datetime import datetime
 from typing import List, Tuple, Dict, Any
 from pathlib import Path
+from shared.ingest import parse_timestamps
 
 class DatasetLoader:
     """Utility class for loading and converting dataset files"""
@@ -30,18 +31,16 @@ class DatasetLoader:
         - 2011-07-01T00:00:01
         - ISO format variations
         """
-        try:
-            # Try parsing with space separator first
-            dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            try:
-                # Try with T separator
-                dt = datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S")
-            except ValueError:
-                # Try pandas for more flexible parsing
-                dt = pd.to_datetime(timestamp_str)
-        
-        return int(dt.timestamp())
+        return int(DatasetLoader.convert_timestamps_to_unix(pd.Series([timestamp_str]))[0])
+    
+    @staticmethod
+    def convert_timestamps_to_unix(timestamps: pd.Series) -> np.ndarray:
+        """Convert a whole timestamp column to Unix timestamps at once
+        
+        Uses the same vectorized conversion as the training service's CSV
+        endpoint, so datetimes are interpreted as UTC.
+        """
+        return parse_timestamps(timestamps.astype(str).to_numpy())
     
     def load_csv_dataset(self, filename: str, limit: int = None) -> Dict[str, Any]:
         """Load CSV dataset and convert to API format
@@ -66,10 +65,7 @@ class DatasetLoader:
             df = df.head(limit)
         
         # Convert timestamps to Unix format
-        unix_timestamps = []
-        for ts in df['timestamp']:
-            unix_ts = self.convert_timestamp_to_unix(str(ts))
-            unix_timestamps.append(unix_ts)
+        unix_timestamps = self.convert_timestamps_to_unix(df['timestamp']).tolist()
         
         # Extract values
         values = df['value'].tolist()
@@ -93,6 +89,26 @@ class DatasetLoader:
             }
         }
     
+    def load_csv_body(self, filename: str, limit: int = None) -> bytes:
+        """Load a CSV dataset as a raw upload body for POST /fit/{series_id}/csv
+        
+        Args:
+            filename: Name of CSV file in dataset directory
+            limit: Optional limit on number of records to include
+            
+        Returns:
+            CSV bytes (header plus up to `limit` rows)
+        """
+        file_path = self.dataset_dir / filename
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"Dataset file not found: {file_path}")
+        
+        with open(file_path, "rb") as f:
+            if not limit:
+                return f.read()
+            return b"".join(line for _, line in zip(range(limit + 1), f))
+    
     def get_available_datasets(self) -> List[str]:
         """Get list of available CSV files in dataset directory"""
         csv_files = []
@@ -129,15 +145,12 @@ class DatasetLoader:
         # Get prediction samples
         prediction_data = df.iloc[start_idx:start_idx + count]
         
-        samples = []
-        for _, row in prediction_data.iterrows():
-            unix_ts = self.convert_timestamp_to_unix(str(row['timestamp']))
-            samples.append({
-                "timestamp": str(unix_ts),
-                "value": float(row['value'])
-            })
+        unix_timestamps = self.convert_timestamps_to_unix(prediction_data['timestamp'])
         
-        return samples
+        return [
+            {"timestamp": str(unix_ts), "value": float(value)}
+            for unix_ts, value in zip(unix_timestamps.tolist(), prediction_data['value'].tolist())
+        ]
 
 
 # Pre-configured dataset configurations